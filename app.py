@@ -3,11 +3,13 @@ import sys
 
 sys.path.insert(0, str(pathlib.Path(__file__).parent / "src"))
 
+import json
+
 import pandas as pd
 import streamlit as st
 
-from scripts.data import import_data
-from scripts.processing import process_data
+from scripts import perf
+from scripts.shared_data import load_data
 
 st.set_page_config(
     page_title="Tracking Counties",
@@ -15,17 +17,6 @@ st.set_page_config(
 )
 
 
-@st.cache_data
-def load_data():
-    df, counties, states = import_data()
-    counties, states = process_data(
-        df_visited=df,
-        gdf_county=counties,
-        gdf_state=states,
-    )
-    return df, counties, states
-
-
 def build_state_progress(df: pd.DataFrame) -> pd.DataFrame:
     """Build a per-state visited/total/pct summary, sorted by completion."""
     df_progress = (
@@ -40,6 +31,24 @@ def build_state_progress(df: pd.DataFrame) -> pd.DataFrame:
     return df_progress.sort_values("pct", ascending=False).reset_index(drop=True)
 
 
+def build_perf_summary(stage_records: list) -> pd.DataFrame:
+    """Total calls, wall time and CPU time, and the largest peak memory per stage."""
+    df_perf = pd.DataFrame(
+        stage_records, columns=["name", "wall_s", "cpu_s", "peak_mb"]
+    )
+    df_summary = (
+        df_perf.groupby("name")
+        .agg(
+            calls=("wall_s", "count"),
+            wall_s=("wall_s", "sum"),
+            cpu_s=("cpu_s", "sum"),
+            peak_mb=("peak_mb", "max"),
+        )
+        .reset_index()
+    )
+    return df_summary.sort_values("wall_s", ascending=False).reset_index(drop=True)
+
+
 df, counties, states = load_data()
 
 visited_counties = int(df["visited"].sum())
@@ -83,7 +92,7 @@ st.dataframe(
         ),
     },
     hide_index=True,
-    use_container_width=True,
+    width="stretch",
 )
 
 # -------------------------------------------------------------------------------- #
@@ -92,3 +101,32 @@ st.dataframe(
 st.sidebar.header("Visit Stats")
 st.sidebar.metric("Counties", f"{visited_counties:,} / {total_counties:,}")
 st.sidebar.metric("States", f"{visited_states:,}")
+
+# Stage timings are only recorded when the app is started with
+# TRACKINGCOUNTIES_PERF=1. Data is cached per process, so most stages show up
+# on the first load and after the visit table changes.
+if perf.is_enabled():
+    with st.sidebar.expander("Performance"):
+        stage_records = perf.records()
+
+        st.dataframe(
+            build_perf_summary(stage_records),
+            column_config={
+                "name": st.column_config.TextColumn("Stage"),
+                "calls": st.column_config.NumberColumn("Calls"),
+                "wall_s": st.column_config.NumberColumn("Wall (s)", format="%.3f"),
+                "cpu_s": st.column_config.NumberColumn("CPU (s)", format="%.3f"),
+                "peak_mb": st.column_config.NumberColumn("Peak (MB)", format="%.1f"),
+            },
+            hide_index=True,
+        )
+        st.download_button(
+            label="⬇ Download trace",
+            data=json.dumps(perf.trace_events(stage_records)),
+            file_name="trace.json",
+            mime="application/json",
+            on_click="ignore",
+        )
+        if st.button("Clear"):
+            perf.clear()
+            st.rerun()
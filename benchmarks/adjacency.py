@@ -0,0 +1,124 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+
+from config import ADJACENCY_CRS
+from scripts.adjacency import EARTH_RADIUS_KM, SHARED_BORDER, CountyGraph
+from scripts.shared_data import load_data
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def best_of(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def neighbours_bruteforce(gdf, geoid):
+    """Counties sharing a stretch of boundary, by testing every county."""
+    geometry = gdf.loc[geoid, "geometry"]
+    shared = gdf.geometry.relate_pattern(geometry, SHARED_BORDER)
+
+    return np.sort(gdf.index[shared & (gdf.index != geoid)].to_numpy())
+
+
+def frontier_bruteforce(gdf, visited):
+    """Unvisited counties bordering a visited one, by a spatial join."""
+    gdf_visited = gdf[gdf.index.isin(visited)].reset_index()
+    gdf_other = gdf[~gdf.index.isin(visited)].reset_index()
+
+    pairs = gdf_other.sjoin(gdf_visited, predicate="intersects")
+    shared = pairs.geometry.relate_pattern(
+        gdf_visited.geometry.iloc[pairs["index_right"]].set_axis(pairs.index),
+        SHARED_BORDER,
+    )
+
+    return np.sort(pairs["geoid_left"][shared].unique())
+
+
+def nearest_bruteforce(gdf, lon, lat, k, exclude):
+    """Closest county centroids to a point, recomputing every centroid."""
+    centroids = (
+        gdf[~gdf.index.isin(exclude)]
+        .to_crs(ADJACENCY_CRS)
+        .geometry.centroid.to_crs("EPSG:4326")
+    )
+    lon, lat = np.radians(lon), np.radians(lat)
+    c_lon, c_lat = np.radians(centroids.x), np.radians(centroids.y)
+
+    haversine = (
+        np.sin((c_lat - lat) / 2) ** 2
+        + np.cos(lat) * np.cos(c_lat) * np.sin((c_lon - lon) / 2) ** 2
+    )
+    distance = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(haversine))
+
+    return distance.sort_values().head(k)
+
+
+def main(repeat=5, k=10, point=(-78.64, 35.78)):
+    _, counties, _ = load_data()
+    gdf = counties[["geoid", "geometry"]].set_index("geoid").sort_index()
+    visited = counties["geoid"][counties["visited"] == 1].to_numpy()
+
+    start = time.perf_counter()
+    graph = CountyGraph.build(counties)
+    t_build = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "graph.npz"
+        graph.save(path)
+        t_load = best_of(CountyGraph.load, repeat, path)
+        graph = CountyGraph.load(path)
+
+    # The graph gives the same answers as the brute-force geometry checks
+    sample = gdf.index[:: len(gdf) // 20]
+    for geoid in sample:
+        assert np.array_equal(
+            np.sort(graph.neighbours(geoid)), neighbours_bruteforce(gdf, geoid)
+        )
+    assert np.array_equal(graph.frontier(visited), frontier_bruteforce(gdf, visited))
+
+    expected = nearest_bruteforce(gdf, *point, k, visited)
+    actual = graph.nearest(*point, k=k, exclude=visited)
+    assert list(actual["geoid"]) == list(expected.index)
+    np.testing.assert_allclose(actual["distance_km"], expected.to_numpy())
+
+    timings = pd.DataFrame(
+        {
+            "brute force": [
+                best_of(neighbours_bruteforce, repeat, gdf, sample[0]),
+                best_of(frontier_bruteforce, repeat, gdf, visited),
+                best_of(nearest_bruteforce, repeat, gdf, *point, k, visited),
+            ],
+            "graph": [
+                best_of(graph.neighbours, repeat, sample[0]),
+                best_of(graph.frontier, repeat, visited),
+                best_of(graph.nearest, repeat, *point, k, visited),
+            ],
+        },
+        index=["neighbours of one county", "frontier", f"{k} nearest unvisited"],
+    )
+
+    print(
+        f"{len(graph)} counties, {len(visited)} visited, all equal. "
+        f"Build {t_build:.2f} s once per boundary vintage, load {t_load * 1000:.1f} ms"
+    )
+    print((timings * 1000).round(3).to_string(float_format="{:.3f} ms".format))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import itertools
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+
+from config import NA_DATE
+from scripts.shared_data import load_data
+from scripts.table_index import VisitTableIndex
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def display_table_rowwise(df, selected_states, visited_filter, year_range):
+    """Copy of the Data Table page's previous filter, sort and format steps."""
+    display_df = df.copy()
+
+    if selected_states:
+        display_df = display_df[display_df["state_name"].isin(selected_states)]
+
+    if visited_filter == "Visited":
+        display_df = display_df[display_df["visited"] == 1]
+    elif visited_filter == "Not visited":
+        display_df = display_df[display_df["visited"] == 0]
+
+    if visited_filter == "Visited":
+        year = display_df["date"].apply(lambda d: d.year)
+        display_df = display_df[year.between(int(year_range[0]), int(year_range[1]))]
+
+    display_df = display_df.sort_values(
+        ["visited", "date"], ascending=[False, False]
+    ).reset_index(drop=True)
+
+    display_df = display_df[
+        ["state_name", "county_name", "geoid", "date", "notes"]
+    ].copy()
+    display_df["date"] = display_df["date"].apply(
+        lambda d: d.strftime("%B %d, %Y") if d != NA_DATE else ""
+    )
+    display_df.columns = ["State", "County", "FIPS", "Date Visited", "Notes"]
+
+    return display_df
+
+
+def display_table_indexed(index, selected_states, visited_filter, year_range):
+    """Every page of the indexed lookup, concatenated."""
+    rows = index.rows(selected_states, visited_filter, year_range)
+    return index.page(rows, 1, max(len(rows), 1))
+
+
+def filter_cases(index):
+    """Filter combinations covering each status, state selections and years."""
+    years = index.years
+    state_choices = [[], index.states[:1], index.states[::7]]
+    year_choices = [(years[0], years[-1]), (years[len(years) // 2], years[-1])]
+
+    return list(
+        itertools.product(
+            state_choices, ["All", "Visited", "Not visited"], year_choices
+        )
+    )
+
+
+def best_of(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main(page_size=100, repeat=20):
+    df, _, _ = load_data()
+
+    start = time.perf_counter()
+    index = VisitTableIndex(df)
+    t_build = time.perf_counter() - start
+
+    cases = filter_cases(index)
+    for case in cases:
+        expected = display_table_rowwise(df, *case)
+        actual = display_table_indexed(index, *case)
+        actual["State"] = actual["State"].astype(object)
+
+        # The rowwise version leaves an empty date column as datetime
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=len(expected) > 0)
+
+    def rerun_indexed(case):
+        rows = index.rows(*case)
+        index.count_visited(rows)
+        index.page(rows, 1, page_size)
+
+    # Per rerun, averaged over the filter combinations
+    t_rowwise = sum(
+        best_of(display_table_rowwise, repeat, df, *case) for case in cases
+    ) / len(cases)
+    t_indexed = sum(best_of(rerun_indexed, repeat, case) for case in cases) / len(cases)
+
+    print(f"{len(df)} rows, {len(cases)} filter combinations, all equal")
+    print(f"  index build, once per visit table  {t_build * 1000:8.2f} ms")
+    print(f"  rowwise, per rerun                 {t_rowwise * 1000:8.2f} ms")
+    print(f"  indexed + one page, per rerun      {t_indexed * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
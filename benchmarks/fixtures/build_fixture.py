@@ -0,0 +1,120 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import math
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+from config import BOUNDARY_YEAR
+from scripts.data import VISIT_TABLE_PATH, write_boundary_store
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+FIXTURE_DIR = Path(__file__).parent
+
+# Rough extent (xmin, ymin, xmax, ymax) of each fixture state, kept apart so
+# the states never overlap. Enough for every plot region and projection:
+# North Carolina and its neighbours, Alaska across the 180 deg meridian and
+# Hawaii. Puerto Rico is only needed in the inset reference.
+STATE_EXTENTS = {
+    "13": (-85.6, 30.4, -83.4, 34.0),
+    "37": (-84.3, 34.0, -75.5, 36.5),
+    "45": (-83.4, 32.0, -78.5, 34.0),
+    "47": (-90.3, 35.0, -84.3, 36.5),
+    "51": (-83.7, 36.5, -75.2, 39.5),
+    "02": (172.0, 51.2, 230.0, 71.4),
+    "15": (-160.3, 18.9, -154.8, 22.3),
+}
+REFERENCE_EXTENTS = {**STATE_EXTENTS, "72": (-67.3, 17.9, -65.2, 18.5)}
+
+
+def wrap(geom):
+    """Move the parts of a geometry east of 180 deg to the western hemisphere."""
+    west = shapely.clip_by_rect(geom, -180, -90, 180, 90)
+    east = shapely.clip_by_rect(geom, 180, -90, 540, 90)
+    if east.is_empty:
+        return west
+
+    east = shapely.transform(east, lambda coords: coords - (360, 0))
+    if west.is_empty:
+        return east
+
+    return shapely.MultiPolygon([*shapely.get_parts(west), *shapely.get_parts(east)])
+
+
+def state_counties(extent, n):
+    """Split a state's extent into a grid of `n` box counties."""
+    xmin, ymin, xmax, ymax = extent
+    cols = math.ceil(math.sqrt(n * (xmax - xmin) / (ymax - ymin)))
+    rows = math.ceil(n / cols)
+    width, height = (xmax - xmin) / cols, (ymax - ymin) / rows
+
+    return [
+        wrap(
+            shapely.box(
+                xmin + (i % cols) * width,
+                ymin + (i // cols) * height,
+                xmin + (i % cols + 1) * width,
+                ymin + (i // cols + 1) * height,
+            )
+        )
+        for i in range(n)
+    ]
+
+
+def fixture_layers():
+    """
+    Synthetic county, state and inset reference layers for the fixture states.
+
+    Counties are the ones in the visit table, with their real geoids and
+    names, drawn as a grid of boxes over their state's extent.
+    """
+    df = pd.read_csv(VISIT_TABLE_PATH, dtype=str, keep_default_na=False)
+    df["statefp"] = df["state_code"].str.zfill(2)
+    df["geoid"] = df["statefp"] + df["county_code"].str.zfill(3)
+    df = df[df["statefp"].isin(list(STATE_EXTENTS))].sort_values("geoid")
+
+    gdf_county = gpd.GeoDataFrame(
+        {
+            "geoid": df["geoid"].to_numpy(),
+            "statefp": df["statefp"].to_numpy(),
+            "name": df["county_name"].to_numpy(),
+            "state_name": df["state_name"].to_numpy(),
+        },
+        geometry=[
+            geom
+            for statefp, df_state in df.groupby("statefp", sort=False)
+            for geom in state_counties(STATE_EXTENTS[statefp], len(df_state))
+        ],
+        crs="EPSG:4269",
+    )
+
+    names = df.drop_duplicates("statefp").set_index("statefp")["state_name"]
+    gdf_state = gdf_county.dissolve(by="statefp", as_index=False)
+    gdf_state = gdf_state.assign(
+        geoid=gdf_state["statefp"], name=gdf_state["statefp"].map(names)
+    )[["geoid", "statefp", "name", "geometry"]]
+
+    gdf_reference = gpd.GeoDataFrame(
+        {"geoid": list(REFERENCE_EXTENTS)},
+        geometry=[wrap(shapely.box(*extent)) for extent in REFERENCE_EXTENTS.values()],
+        crs="EPSG:4269",
+    )
+
+    return gdf_county, gdf_state, gdf_reference
+
+
+def main(year=BOUNDARY_YEAR):
+    store_dir = FIXTURE_DIR / f"cb_{year}"
+    write_boundary_store(store_dir, *fixture_layers(), year)
+    print(f"Boundary fixture written to {store_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+
+from scripts.data import VISIT_TABLE_PATH
+from scripts.history import VisitHistory
+from scripts.visit_log import EVENT_COLUMNS, apply_events
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+START = pd.Timestamp("2024-01-01", tz="UTC")
+
+
+def best_of(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def random_log(df, n_versions, per_version=10, seed=0):
+    """A log of `n_versions` writes a day apart, each setting a few counties."""
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, len(df), n_versions * per_version)
+    dates = rng.choice(["", "3/1/24", "7/4/24", "12/25/24"], len(rows))
+
+    return pd.DataFrame(
+        {
+            "recorded_at": np.repeat(
+                [
+                    (START + pd.Timedelta(days=day)).isoformat()
+                    for day in range(1, n_versions + 1)
+                ],
+                per_version,
+            ),
+            "action": np.where(dates == "", "remove", "correct"),
+            "state_code": df["state_code"].to_numpy()[rows],
+            "county_code": df["county_code"].to_numpy()[rows],
+            "date": dates,
+            "notes": np.where(dates == "", "", "note"),
+        },
+        columns=EVENT_COLUMNS,
+    )
+
+
+def replay_as_of(df, df_log, when):
+    """Rebuild the table at `when` by replaying the log onto the base table."""
+    return apply_events(df, df_log[pd.to_datetime(df_log["recorded_at"]) <= when])
+
+
+def build(df, df_log):
+    history = VisitHistory()
+    history.add_snapshot(df, START, source="base")
+    history.add_events(df_log)
+
+    return history
+
+
+def extend_saved(cache_dir, df_new):
+    """Read a saved history back and add the events logged since."""
+    history, _ = VisitHistory.load(cache_dir)
+    history.add_events(df_new)
+
+    return history
+
+
+def check_saved(df, repeat=3, sizes=(100, 1000, 3000), n_new=10):
+    """
+    A saved history extended with the newest events matches one built from the
+    whole log, as load_visit_history does when only the log has grown.
+    """
+    print(f"\nrebuild vs. saved history + {n_new} new versions:")
+    for n_versions in sizes:
+        df_log = random_log(df, n_versions)
+        n_old = len(df_log) - n_new * 10
+        df_old, df_new = df_log.iloc[:n_old], df_log.iloc[n_old:]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache_dir = Path(tmp)
+            build(df, df_old).save(cache_dir, {})
+
+            history = extend_saved(cache_dir, df_new)
+            rebuilt = build(df, df_log)
+            pd.testing.assert_frame_equal(history.versions, rebuilt.versions)
+            for when in [START, START + pd.Timedelta(days=n_versions)]:
+                pd.testing.assert_frame_equal(history.as_of(when), rebuilt.as_of(when))
+
+            t_build = best_of(build, repeat, df, df_log)
+            t_extend = best_of(extend_saved, repeat, cache_dir, df_new)
+
+        print(
+            f"  {n_versions:>5} versions, rebuild {t_build * 1000:7.1f} ms, "
+            f"saved + new {t_extend * 1000:6.1f} ms"
+        )
+
+
+def main(repeat=10, sizes=(10, 100, 1000, 3000)):
+    df = pd.read_csv(VISIT_TABLE_PATH, dtype=str, keep_default_na=False)
+
+    print(f"visit table: {len(df)} rows")
+    for n_versions in sizes:
+        df_log = random_log(df, n_versions)
+
+        start = time.perf_counter()
+        history = VisitHistory()
+        history.add_snapshot(df, START, source="base")
+        history.add_events(df_log)
+        history.as_of(START)
+        t_build = time.perf_counter() - start
+
+        # Every queried version matches a replay of the log, and the diff
+        # matches a row comparison of the two replayed tables
+        checked = [START + pd.Timedelta(days=day) for day in (0, 1, n_versions // 2)]
+        checked.append(START + pd.Timedelta(days=n_versions))
+        for when in checked:
+            pd.testing.assert_frame_equal(
+                history.as_of(when), replay_as_of(df, df_log, when)
+            )
+
+        first, last = checked[1], checked[-1]
+        before, after = replay_as_of(df, df_log, first), replay_as_of(df, df_log, last)
+        n_changed = int(((before != after).any(axis=1)).sum())
+        assert len(history.diff(first, last)) == n_changed
+
+        middle = checked[2]
+        t_as_of = best_of(history.as_of, repeat, middle)
+        t_diff = best_of(history.diff, repeat, first, last)
+        t_replay = best_of(replay_as_of, repeat, df, df_log, middle)
+
+        print(
+            f"  {n_versions:>5} versions, {sum(history.versions['changes']):>6} delta "
+            f"rows ({n_versions * len(df):>9,} as full copies), build "
+            f"{t_build * 1000:7.1f} ms"
+        )
+        print(
+            f"        as_of {t_as_of * 1000:6.2f} ms, diff {t_diff * 1000:6.2f} ms, "
+            f"replay log {t_replay * 1000:6.2f} ms"
+        )
+
+    check_saved(df)
+
+
+if __name__ == "__main__":
+    main()
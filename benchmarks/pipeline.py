@@ -0,0 +1,371 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import argparse
+import datetime as dt
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from importlib.metadata import version
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# Run against the committed boundary fixture unless another store is given,
+# before paths reads the variable
+FIXTURE_DIR = Path(__file__).parent / "fixtures"
+os.environ.setdefault("TRACKINGCOUNTIES_SHAPEFILE_DIR", str(FIXTURE_DIR))
+
+import folium
+import numpy as np
+import pandas as pd
+
+from config import (
+    ALASKA_CENTERLINE,
+    BOUNDARY_YEAR,
+    FIPS_ALASKA,
+    MAP_DETAIL_LEVELS,
+    PLOT_BACKEND,
+    PLOT_BACKENDS,
+    PLOT_PARAMS,
+    PLOT_PREVIEW_DPI,
+    PLOT_REGIONS,
+)
+from paths import PROJECT_ROOT
+from scripts.data import (
+    boundary_store_dir,
+    boundary_store_is_current,
+    import_data,
+    import_data_visit,
+    import_map_layers,
+    import_shapefiles,
+)
+from scripts.map_layers import build_map_payload
+from scripts.mapping import shift_meridian
+from scripts.plotting import Plot, generate_plot_data
+from scripts.processing import process_data
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+REPORT_DIR = Path(__file__).parent / "reports"
+
+# Report layout version, bumped if the fields below change
+REPORT_VERSION = 1
+
+SCALES = [1, 10, 100, 1000]
+
+# Boundaries stay at their real size at every scale, so rendering the same
+# polygons again tells little; the plot and map stages stop at this scale
+# unless --max-render-scale says otherwise
+MAX_RENDER_SCALE = 10
+
+PACKAGES = ["pandas", "geopandas", "shapely", "pyogrio", "plotnine", "matplotlib"]
+
+
+def git_revision():
+    """Return the short commit hash, with "-dirty" if the tree has changes."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        status = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=PROJECT_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+    return f"{commit}-dirty" if status else commit
+
+
+def measure(func, setup, repeat):
+    """
+    Time a stage and record its peak Python heap use.
+
+    `setup` builds fresh arguments before every call and is not timed, so
+    stages that modify their inputs always start from the same state. Memory
+    is measured in one extra call under tracemalloc, kept apart from the
+    timed calls because tracing slows allocation down.
+
+    Returns
+    -------
+    dict
+        `seconds`: fastest call; `seconds_all`: every call; `peak_mb`: peak
+        memory allocated during the traced call. Allocations made by GEOS and
+        other C libraries outside numpy are not traced.
+    """
+    timings = []
+    for _ in range(repeat):
+        args = setup()
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    args = setup()
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": min(timings),
+        "seconds_all": timings,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def synthetic_visits(df, scale, seed=0):
+    """
+    Build a visit table `scale` times the size of the real one.
+
+    The first copy keeps the real counties. The others get a suffixed county
+    code, so they are processed like real rows but match no boundary, and the
+    joined layers keep the real number of polygons at every scale. Each row is
+    marked visited with the real table's visit rate, on a date drawn from the
+    real dates.
+    """
+    if scale == 1:
+        return df.copy()
+
+    rng = np.random.default_rng(seed)
+
+    df_scaled = pd.concat(
+        [df]
+        + [
+            df.assign(county_code=df["county_code"].str.zfill(3) + f"{copy:04d}")
+            for copy in range(1, scale)
+        ],
+        ignore_index=True,
+    )
+
+    dates = df["date"].dropna().to_numpy()
+    visited = rng.random(len(df_scaled)) < len(dates) / len(df)
+    df_scaled["date"] = np.where(visited, rng.choice(dates, size=len(df_scaled)), None)
+
+    return df_scaled
+
+
+def build_folium_map(payload):
+    """Build the Interactive Map page's map from a payload and render its HTML."""
+    m = folium.Map(location=[39.8283, -98.5795], zoom_start=5, tiles="OpenStreetMap")
+
+    folium.GeoJson(payload["state"]).add_to(m)
+    folium.GeoJson(
+        payload["county"],
+        tooltip=folium.GeoJsonTooltip(
+            fields=["state_name", "name", "geoid", "date_str"],
+            aliases=["State:", "County:", "FIPS:", "Date Visited:"],
+        ),
+    ).add_to(m)
+
+    return m.get_root().render()
+
+
+def run_scale(scale, repeat, max_render_scale, backend, dpi, work_dir):
+    """Yield (stage, result) for every stage of the pipeline at one scale."""
+    gdf_county, gdf_state = import_shapefiles()
+
+    df_visit = synthetic_visits(import_data_visit(), scale)
+
+    # Reading the real CSV and boundary store together, and the stages that
+    # only see the boundaries, are the same at every scale
+    if scale == 1:
+        yield "import_data", measure(import_data, lambda: (), repeat)
+
+        gdf_alaska = gdf_county[gdf_county["statefp"] == FIPS_ALASKA]
+        yield (
+            "shift_meridian",
+            measure(shift_meridian, lambda: (gdf_alaska, ALASKA_CENTERLINE), repeat),
+        )
+
+    csv_path = work_dir / f"visits__x{scale}.csv"
+    df_visit.to_csv(csv_path, index=False)
+    yield "import_data_visit", measure(import_data_visit, lambda: (csv_path,), repeat)
+
+    yield (
+        "process_data",
+        measure(process_data, lambda: (df_visit.copy(), gdf_county, gdf_state), repeat),
+    )
+
+    counties, states = process_data(df_visit.copy(), gdf_county, gdf_state)
+
+    # Always rebuild the projected geometry rather than reading the cache.
+    # Regions are built on first access, so every one is looked up.
+    def build_all_regions(*args):
+        dct_plot = generate_plot_data(*args, use_cache=False)
+        return [dct_plot.region(plot_label) for plot_label in PLOT_REGIONS]
+
+    yield (
+        "generate_plot_data",
+        measure(build_all_regions, lambda: (counties, states), repeat),
+    )
+
+    if scale > max_render_scale:
+        return
+
+    dct_plot = generate_plot_data(counties, states, use_cache=False)
+
+    def new_plotter():
+        # A fresh plotter per call, so per-layer data is not reused across runs
+        plotter = Plot(
+            plot_tables=dct_plot, plot_params=PLOT_PARAMS, dpi=dpi, backend=backend
+        )
+        plotter.plot_dir = work_dir
+        return plotter
+
+    for plot_label in dct_plot["county"]:
+        yield (
+            f"plot__{plot_label}",
+            measure(
+                lambda plotter, label=plot_label: plotter.save(label),
+                lambda: (new_plotter(),),
+                repeat,
+            ),
+        )
+
+    for level in MAP_DETAIL_LEVELS:
+        gdf_county_geom, gdf_state_geom = import_map_layers(level)
+
+        def build_map(*layers, level=level):
+            return build_folium_map(build_map_payload(level, *layers))
+
+        def map_inputs(county_geom=gdf_county_geom, state_geom=gdf_state_geom):
+            return counties, states, county_geom, state_geom
+
+        yield (
+            f"map__{level}",
+            measure(
+                build_map,
+                map_inputs,
+                repeat,
+            ),
+        )
+
+
+def compare_reports(report, baseline):
+    """Print the change in time and memory of each stage against a baseline."""
+    base = {(r["stage"], r["scale"]): r for r in baseline["results"]}
+
+    print(f"\nCompared with {baseline['meta']['commit']}:")
+    for result in report["results"]:
+        previous = base.get((result["stage"], result["scale"]))
+        if previous is None:
+            continue
+
+        print(
+            f"  {result['stage']:<42} x{result['scale']:<5} "
+            f"time {result['seconds'] / previous['seconds']:6.2f}x  "
+            f"memory {result['peak_mb'] / max(previous['peak_mb'], 1e-9):6.2f}x"
+        )
+
+
+def main(scales, repeat, max_render_scale, backend, dpi, output, baseline):
+    # The suite runs offline, so it never builds the store itself
+    if not boundary_store_is_current():
+        sys.exit(
+            f"No current boundary store in {boundary_store_dir()}. Rebuild the "
+            "fixture with `python benchmarks/fixtures/build_fixture.py`, or point "
+            "TRACKINGCOUNTIES_SHAPEFILE_DIR at a directory holding a store."
+        )
+
+    commit = git_revision()
+    report = {
+        "meta": {
+            "version": REPORT_VERSION,
+            "commit": commit,
+            "created": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "packages": {package: version(package) for package in PACKAGES},
+            "boundary_store": str(boundary_store_dir()),
+            "boundary_year": BOUNDARY_YEAR,
+            "visit_rows": len(import_data_visit()),
+            "backend": backend,
+            "dpi": dpi,
+            "repeat": repeat,
+        },
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scale in scales:
+            for stage, result in run_scale(
+                scale, repeat, max_render_scale, backend, dpi, Path(work_dir)
+            ):
+                report["results"].append({"stage": stage, "scale": scale, **result})
+                print(
+                    f"{stage:<42} x{scale:<5} {result['seconds']:9.3f} s  "
+                    f"{result['peak_mb']:9.1f} MB"
+                )
+
+    if output is None:
+        output = REPORT_DIR / f"{dt.date.today():%Y-%m-%d}__{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=4)
+        f.write("\n")
+    print(f"\nWrote {output}")
+
+    if baseline is not None:
+        with open(baseline, "r") as f:
+            compare_reports(report, json.load(f))
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Time and memory-profile the import, process and plot pipeline."
+    )
+    parser.add_argument(
+        "--scales",
+        type=int,
+        nargs="+",
+        default=SCALES,
+        help="Visit table sizes as multiples of the real table (1 = real CSV).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Timed calls per stage (best is kept)."
+    )
+    parser.add_argument(
+        "--max-render-scale",
+        type=int,
+        default=MAX_RENDER_SCALE,
+        help="Largest scale at which plots and map layers are rendered.",
+    )
+    parser.add_argument("--backend", choices=PLOT_BACKENDS, default=PLOT_BACKEND)
+    parser.add_argument(
+        "--dpi",
+        type=int,
+        default=PLOT_PREVIEW_DPI,
+        help="Resolution plots are saved at (PLOT_DPI for the full export).",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="Report path (JSON).")
+    parser.add_argument(
+        "--compare", type=Path, default=None, help="Earlier report to compare with."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(
+        scales=args.scales,
+        repeat=args.repeat,
+        max_render_scale=args.max_render_scale,
+        backend=args.backend,
+        dpi=args.dpi,
+        output=args.output,
+        baseline=args.compare,
+    )
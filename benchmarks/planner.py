@@ -0,0 +1,178 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import datetime as dt
+import itertools
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+
+from scripts.adjacency import CountyGraph, _csr
+from scripts.data import import_data_visit_text
+from scripts.planner import TripPlanner, format_trip_file
+from scripts.shared_data import load_county_graph, load_data
+from scripts.trips import build_name_index, parse_trip_file, resolve_county
+from scripts.visit_log import county_keys
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def lattice_graph(side, spacing=0.35, visited_share=0.3, seed=0):
+    """
+    A side x side grid of square counties around Kansas, and a random visited set.
+
+    Gives a search area of `side ** 2` counties whatever the boundary data at hand.
+    """
+    rows, cols = np.divmod(np.arange(side * side), side)
+    geoids = np.array([f"{i:05d}" for i in range(side * side)], dtype=object)
+
+    right = np.flatnonzero(cols < side - 1)
+    below = np.flatnonzero(rows < side - 1)
+    graph = CountyGraph(
+        geoids,
+        -98 + cols * spacing,
+        38 + rows * spacing,
+        {
+            "border": _csr(
+                np.concatenate([right, below]),
+                np.concatenate([right + 1, below + side]),
+                side * side,
+            ),
+            "nearby": _csr(np.array([], int), np.array([], int), side * side),
+        },
+    )
+
+    rng = np.random.default_rng(seed)
+    visited = geoids[rng.random(len(geoids)) < visited_share]
+
+    return graph, visited
+
+
+def plan_lattice(side=45, days=(3, 10, 30), visited_share=0.3):
+    """Time greedy and improved plans from the middle of a large lattice."""
+    graph, visited = lattice_graph(side, visited_share=visited_share)
+    start = graph.geoids[len(graph) // 2]
+
+    records = []
+    for n_days in days:
+        greedy, improved = TripPlanner(graph, rounds=0), TripPlanner(graph)
+
+        t0 = time.perf_counter()
+        df_greedy = greedy.plan(start, visited, n_days)
+        t1 = time.perf_counter()
+        df_route = improved.plan(start, visited, n_days)
+        t2 = time.perf_counter()
+
+        check_route(graph, improved, df_route, start, n_days)
+        records.append(
+            {
+                "days": n_days,
+                "greedy new": int(df_greedy["new"].sum()),
+                "improved new": int(df_route["new"].sum()),
+                "km": round(df_route["total_km"].iloc[-1]),
+                "greedy s": t1 - t0,
+                "improved s": t2 - t1,
+            }
+        )
+
+    print(f"\n{len(graph)}-county lattice, {len(visited)} visited:")
+    print(pd.DataFrame(records).round(3).to_string(index=False))
+
+
+def check_route(graph, planner, df_route, start, days):
+    """The route is a walk of bordering counties from the start, within budget."""
+    geoids = df_route["geoid"].to_numpy()
+    assert geoids[0] == start
+
+    for u, v in itertools.pairwise(geoids):
+        assert v in graph.neighbours(u), (u, v)
+
+    total = df_route["total_km"].iloc[-1]
+    assert total <= days * planner.km_per_day + 1e-6
+    assert df_route["day"].between(0, days - 1).all()
+    assert df_route["day"].is_monotonic_increasing
+
+
+def check_trip_file(df, df_route, text):
+    """Every county in the trip file resolves back to a county on the route."""
+    index = build_name_index(df)
+    keys = county_keys(df)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "2026-01-01__planned.md"
+        path.write_text(text, encoding="utf-8")
+        trip = parse_trip_file(path)
+
+    assert not trip["errors"]
+    resolved = {
+        keys[resolve_county(index, name, state)] for _, name, state in trip["visits"]
+    }
+    assert resolved == set(df_route["geoid"]) & set(keys)
+
+
+def main(days=(2, 5, 10), n_starts=5, seed=0):
+    df = import_data_visit_text()
+    _, counties, _ = load_data()
+    visited = counties["geoid"][counties["visited"] == 1].to_numpy()
+    graph = load_county_graph()
+
+    rng = np.random.default_rng(seed)
+    starts = rng.choice(graph.geoids[np.isin(graph.geoids, county_keys(df))], n_starts)
+
+    records = []
+    for n_days in days:
+        greedy = TripPlanner(graph, rounds=0)
+        improved = TripPlanner(graph)
+
+        for start in starts:
+            area = int(
+                np.sum(
+                    improved._search_area(
+                        list(graph.geoids).index(start),
+                        n_days * improved.km_per_day,
+                    )
+                )
+            )
+
+            t0 = time.perf_counter()
+            df_greedy = greedy.plan(start, visited, n_days)
+            t1 = time.perf_counter()
+            df_route = improved.plan(start, visited, n_days)
+            t2 = time.perf_counter()
+
+            check_route(graph, improved, df_route, start, n_days)
+            text = format_trip_file(df_route, df, dt.date(2026, 1, 1), ["Planned trip"])
+            check_trip_file(df, df_route, text)
+
+            records.append(
+                {
+                    "days": n_days,
+                    "start": start,
+                    "area": area,
+                    "greedy new": int(df_greedy["new"].sum()),
+                    "improved new": int(df_route["new"].sum()),
+                    "km": round(df_route["total_km"].iloc[-1]),
+                    "greedy s": t1 - t0,
+                    "improved s": t2 - t1,
+                }
+            )
+
+    df_results = pd.DataFrame(records)
+    print(
+        f"{len(graph)} counties, {len(visited)} visited. Routes and trip files valid."
+    )
+    print(df_results.round(3).to_string(index=False))
+
+    # With more counties visited, the greedy pass leaves more to improve on
+    for visited_share in (0.3, 0.6):
+        plan_lattice(visited_share=visited_share)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+from PIL import Image
+
+from config import PLOT_PARAMS, PLOT_PREVIEW_DPI
+from scripts.plotting import Plot
+from scripts.shared_data import load_plot_data
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Plots at PLOT_DPI are ~100 megapixels, above Pillow's decompression bomb limit
+Image.MAX_IMAGE_PIXELS = None
+
+BACKENDS = ["plotnine", "matplotlib"]
+
+
+def draw_seconds(plotter, plot_label, dpi):
+    """Render a region to raw RGBA, i.e. without PNG encoding, in seconds."""
+    start = time.perf_counter()
+    plotter.render(plot_label, filename=io.BytesIO(), dpi=dpi, format="rgba")
+
+    return time.perf_counter() - start
+
+
+def render_png(plotter, plot_label, dpi):
+    """Render a region to PNG in memory and return (pixels, seconds)."""
+    buf = io.BytesIO()
+
+    start = time.perf_counter()
+    plotter.render(plot_label, filename=buf, dpi=dpi, format="png")
+    elapsed = time.perf_counter() - start
+
+    pixels = np.asarray(Image.open(io.BytesIO(buf.getvalue())).convert("RGBA"))
+
+    return pixels, elapsed
+
+
+def main(dpi=PLOT_PREVIEW_DPI):
+    dct_plot = load_plot_data()
+
+    plotters = {
+        backend: Plot(plot_tables=dct_plot, plot_params=PLOT_PARAMS, backend=backend)
+        for backend in BACKENDS
+    }
+
+    print(f"dpi={dpi}  draw = build + rasterize, save = draw + PNG encode")
+
+    totals = {
+        (backend, stage): 0.0 for backend in BACKENDS for stage in ("draw", "save")
+    }
+    for plot_label in dct_plot["county"]:
+        dct_draw = {
+            backend: draw_seconds(plotter, plot_label, dpi)
+            for backend, plotter in plotters.items()
+        }
+
+        expected, t_save_p9 = render_png(plotters["plotnine"], plot_label, dpi)
+        actual, t_save_mpl = render_png(plotters["matplotlib"], plot_label, dpi)
+
+        assert expected.shape == actual.shape
+        differing = (expected != actual).any(axis=2).mean()
+        del expected, actual
+
+        for backend, t_save in (("plotnine", t_save_p9), ("matplotlib", t_save_mpl)):
+            totals[(backend, "draw")] += dct_draw[backend]
+            totals[(backend, "save")] += t_save
+
+        print(
+            f"{plot_label:<34} draw {dct_draw['plotnine']:6.2f} -> "
+            f"{dct_draw['matplotlib']:6.2f} s  "
+            f"save {t_save_p9:6.2f} -> {t_save_mpl:6.2f} s  "
+            f"pixels differing={differing:.4%}"
+        )
+
+    for stage in ("draw", "save"):
+        t_p9, t_mpl = totals[("plotnine", stage)], totals[("matplotlib", stage)]
+        print(
+            f"total {stage}: plotnine={t_p9:6.2f} s  matplotlib={t_mpl:6.2f} s  "
+            f"speedup={t_p9 / t_mpl:4.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main(dpi=int(sys.argv[1]) if len(sys.argv) > 1 else PLOT_PREVIEW_DPI)
@@ -0,0 +1,93 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+
+from config import PLOT_REGIONS, TERRITORY_CODES
+from scripts.plotting import (
+    VISIT_COLUMNS,
+    generate_plot_data,
+    generate_plot_geometry,
+)
+from scripts.shared_data import load_data
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def best_of(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def state_regions(gdf_state):
+    """The declared regions plus one region per state, as the registry grows."""
+    states = gdf_state[~gdf_state["geoid"].isin(TERRITORY_CODES)]
+
+    return {
+        **PLOT_REGIONS,
+        **{
+            f"state_{geoid}": {
+                "title": name,
+                "states": [geoid],
+                "width": 8,
+                "height": 6,
+            }
+            for geoid, name in zip(states["geoid"], states["name"])
+        },
+    }
+
+
+def build_eager(gdf_county, gdf_state, regions):
+    """Every region up front, as generate_plot_data did before the registry."""
+    return generate_plot_geometry(
+        gdf_county.drop(columns=VISIT_COLUMNS),
+        gdf_state.drop(columns=VISIT_COLUMNS),
+        regions,
+    )
+
+
+def lookup(gdf_county, gdf_state, regions, plot_label):
+    """A single region, the way the Static Plots page or a CLI asks for one."""
+    return generate_plot_data(gdf_county, gdf_state, regions, use_cache=False)[
+        "county"
+    ][plot_label]
+
+
+def main(repeat=3):
+    _, counties, states = load_data()
+
+    # Lazily built regions have the same geometry as the eager build
+    dct_eager = build_eager(counties, states, PLOT_REGIONS)
+    plot_tables = generate_plot_data(counties, states, use_cache=False)
+    for layer, dct_layer in dct_eager.items():
+        for plot_label, gdf in dct_layer.items():
+            pd.testing.assert_frame_equal(
+                plot_tables[layer][plot_label].drop(columns=VISIT_COLUMNS),
+                gdf.reset_index(drop=True),
+            )
+
+    for name, regions in [
+        ("declared regions", PLOT_REGIONS),
+        ("declared + one per state", state_regions(states)),
+    ]:
+        t_eager = best_of(build_eager, repeat, counties, states, regions)
+        print(f"{name}: {len(regions)} regions, all built up front {t_eager:.3f} s")
+
+        for plot_label in ["north_carolina", "alaska", "us_inset"]:
+            t_lookup = best_of(lookup, repeat, counties, states, regions, plot_label)
+            print(f"  only {plot_label:<16} {t_lookup:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
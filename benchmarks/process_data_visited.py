@@ -0,0 +1,76 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import datetime as dt
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+
+from config import DATE_FORMAT, NA_DATE
+from scripts.data import import_data_visit
+from scripts.processing import process_data_visited
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def process_data_visited_rowwise(df):
+    """Original row-by-row implementation, kept as the reference for comparison."""
+
+    def parse_date(date):
+        if isinstance(date, str):
+            try:
+                return dt.datetime.strptime(date, DATE_FORMAT)
+            except ValueError:
+                return NA_DATE
+        return NA_DATE
+
+    df.loc[:, "date"] = df["date"].apply(parse_date)
+    df.loc[:, "state_code"] = df["state_code"].apply(lambda x: x.zfill(2))
+    df.loc[:, "county_code"] = df["county_code"].apply(lambda x: x.zfill(3))
+    df.loc[:, "geoid"] = df["state_code"] + df["county_code"]
+    df.loc[:, "visited"] = df["date"].apply(lambda x: 0 if x == NA_DATE else 1)
+
+    return df
+
+
+def best_of(func, repeat, df):
+    """Return the fastest wall time in seconds over `repeat` calls on fresh copies."""
+    timings = []
+    for _ in range(repeat):
+        df_copy = df.copy()
+        start = time.perf_counter()
+        func(df_copy)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main(scales=(1, 10, 100), repeat=3):
+    df = import_data_visit()
+
+    # Same values. The rowwise version stores dates as Timestamp objects in an
+    # object column; the vectorized one keeps them as datetime64.
+    expected = process_data_visited_rowwise(df.copy())
+    expected["date"] = expected["date"].astype("datetime64[ns]")
+    actual = process_data_visited(df.copy())
+    pd.testing.assert_frame_equal(actual, expected)
+
+    for scale in scales:
+        df_scaled = pd.concat([df] * scale, ignore_index=True)
+
+        t_rowwise = best_of(process_data_visited_rowwise, repeat, df_scaled)
+        t_vector = best_of(process_data_visited, repeat, df_scaled)
+
+        print(
+            f"rows={len(df_scaled):<8} rowwise={t_rowwise * 1000:8.1f} ms  "
+            f"vectorized={t_vector * 1000:8.1f} ms  "
+            f"speedup={t_rowwise / t_vector:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+import siuba as s
+
+from config import NA_DATE, NON_CONTIGUOUS_CODES
+from scripts.data import import_data
+from scripts.plotting import generate_plot_geometry
+from scripts.processing import (
+    create_state_visited,
+    join_visits,
+    process_data,
+    process_data_visited,
+)
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def create_state_visited_siuba(df_county):
+    """Original siuba implementation, kept as the reference for comparison."""
+    df_state = (
+        df_county
+        >> s.group_by(s._.state_code)
+        >> s.mutate(visited=s._.visited.max())
+        >> s.ungroup()
+        >> s.distinct(s._.state, s._.state_code, s._.visited)
+    )
+
+    df_state_date = (
+        df_county
+        >> s.filter(s._.visited == 1)
+        >> s.group_by(s._.state_code)
+        >> s.summarize(date=s._.date.min())
+    )
+
+    df_state = (
+        df_state
+        >> s.left_join(s._, df_state_date, by="state_code")
+        >> s.rename(geoid=s._.state_code)
+    )
+    df_state.loc[:, "date"] = df_state["date"].fillna(NA_DATE)
+
+    return df_state
+
+
+def join_visits_siuba(gdf, df_visits):
+    """Original siuba join, kept as the reference for comparison."""
+    return gdf >> s.left_join(s._, df_visits, by="geoid")
+
+
+def best_of(func, repeat, *args):
+    """Return the fastest wall time in seconds over `repeat` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def report(label, t_siuba, t_native):
+    print(
+        f"{label:<22} siuba={t_siuba * 1000:8.1f} ms  "
+        f"native={t_native * 1000:8.1f} ms  "
+        f"speedup={t_siuba / t_native:5.1f}x"
+    )
+
+
+def main(repeat=5):
+    df_visit_county, gdf_county, gdf_state = import_data()
+    df_county = process_data_visited(df_visit_county.copy())
+    select_cols = ["geoid", "visited", "date"]
+
+    # State aggregation
+    expected = create_state_visited_siuba(df_county)
+    actual = create_state_visited(df_county)
+    pd.testing.assert_frame_equal(actual, expected)
+    report(
+        "create_state_visited",
+        best_of(create_state_visited_siuba, repeat, df_county),
+        best_of(create_state_visited, repeat, df_county),
+    )
+
+    # Joins onto the boundary layers
+    for layer, gdf, df_visits in (
+        ("join county", gdf_county, df_county[select_cols]),
+        ("join state", gdf_state, actual[select_cols]),
+    ):
+        pd.testing.assert_frame_equal(
+            join_visits(gdf, df_visits), join_visits_siuba(gdf, df_visits)
+        )
+        report(
+            layer,
+            best_of(join_visits_siuba, repeat, gdf, df_visits),
+            best_of(join_visits, repeat, gdf, df_visits),
+        )
+
+    # Region filters select the same rows as the siuba filters did
+    gdf_county, gdf_state = process_data(df_visit_county, gdf_county, gdf_state)
+    dct_geom = generate_plot_geometry(gdf_county, gdf_state)
+    expected_rows = {
+        "north_carolina_w_adjacent_states": gdf_county
+        >> s.filter(s._.statefp.isin(["13", "37", "45", "47", "51"])),
+        "contiguous": gdf_county >> s.filter(~s._.statefp.isin(NON_CONTIGUOUS_CODES)),
+    }
+    for plot_label, gdf_expected in expected_rows.items():
+        assert (
+            dct_geom["county"][plot_label]["geoid"].tolist()
+            == gdf_expected["geoid"].tolist()
+        )
+
+
+if __name__ == "__main__":
+    main()
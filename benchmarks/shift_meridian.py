@@ -0,0 +1,142 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely.affinity import translate
+from shapely.geometry import LineString, MultiPolygon, box
+from shapely.ops import split, unary_union
+
+from config import FIPS_ALASKA
+from scripts.data import boundary_store_is_current, import_shapefiles
+from scripts.mapping import shift_meridian
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def shift_meridian_rowwise(geo_df, new_centerline):
+    """Original row-by-row implementation, kept as the reference for comparison."""
+    central_meridian = LineString([(new_centerline, 90), (new_centerline, -90)])
+
+    gframes = []
+    for _, row in geo_df.iterrows():
+        split_geoms = split(row["geometry"], central_meridian)
+
+        shifted_parts = []
+        for part in split_geoms.geoms:
+            adjust_factor = -1 if part.bounds[0] >= new_centerline else 1
+            x_off = (180 * adjust_factor) - new_centerline
+            shifted_parts.append(translate(part, xoff=x_off))
+
+        unified_geom = gpd.GeoSeries(unary_union(shifted_parts))
+        gframes.append(gpd.GeoDataFrame({"geometry": unified_geom}))
+
+    gdf_unify = pd.concat(gframes)
+    gdf_unify.index = geo_df.index
+
+    return pd.concat([geo_df.drop(columns=["geometry"]), gdf_unify], axis=1)
+
+
+def best_of(func, repeat, *args):
+    """Return the fastest wall time in seconds over `repeat` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def synthetic_alaska(n_counties=30, seed=0):
+    """
+    Alaska-like state and county layers, with counties crossing the antimeridian.
+
+    As in the census files, the Aleutians west of 180 deg are stored at
+    positive longitudes, so every third county is a multipolygon with a part
+    on each side. Lets the check run without the boundary store.
+    """
+    rng = np.random.default_rng(seed)
+
+    geometries = []
+    for i in range(n_counties):
+        lat = 52 + (i % 10) * 1.5
+        if i % 3 == 0:
+            west = rng.uniform(172, 178)
+            east = rng.uniform(-178, -172)
+            geometries.append(
+                MultiPolygon(
+                    [box(west, lat, 180, lat + 1), box(-180, lat, east, lat + 1)]
+                )
+            )
+        else:
+            lon = rng.uniform(-168, -142)
+            geometries.append(box(lon, lat, lon + 2, lat + 1))
+
+    gdf_county = gpd.GeoDataFrame(
+        {
+            "geoid": [f"{FIPS_ALASKA}{i:03d}" for i in range(n_counties)],
+            "statefp": FIPS_ALASKA,
+            "name": [f"County {i}" for i in range(n_counties)],
+        },
+        geometry=geometries,
+        crs="EPSG:4269",
+    )
+    gdf_state = gpd.GeoDataFrame(
+        {"geoid": [FIPS_ALASKA], "name": ["Alaska"]},
+        geometry=[unary_union(geometries)],
+        crs="EPSG:4269",
+    )
+
+    return gdf_county, gdf_state
+
+
+def compare(source, layer, gdf, new_centerline, repeat):
+    """Check the vectorized shift against the rowwise one and print timings."""
+    expected = shift_meridian_rowwise(gdf, new_centerline)
+    actual = shift_meridian(gdf, new_centerline)
+
+    # Same rows, attributes and (topologically) the same geometry. The
+    # rowwise version drops the CRS, so compare against the input CRS.
+    pd.testing.assert_frame_equal(
+        pd.DataFrame(actual.drop(columns="geometry")),
+        pd.DataFrame(expected.drop(columns="geometry")),
+    )
+    expected_geom = gpd.GeoSeries(expected["geometry"], crs=gdf.crs)
+    assert actual.geometry.geom_equals(expected_geom).all()
+
+    t_rowwise = best_of(shift_meridian_rowwise, repeat, gdf, new_centerline)
+    t_vector = best_of(shift_meridian, repeat, gdf, new_centerline)
+
+    print(
+        f"{source:<9} {layer:<6} rows={len(gdf):<4} "
+        f"rowwise={t_rowwise * 1000:8.1f} ms  "
+        f"vectorized={t_vector * 1000:8.1f} ms  "
+        f"speedup={t_rowwise / t_vector:5.1f}x"
+    )
+
+
+def main(new_centerline=90, repeat=5):
+    layers = {"synthetic": synthetic_alaska()}
+
+    # The real Alaska layers too, when the boundary store has been built
+    if boundary_store_is_current():
+        layers["store"] = import_shapefiles()
+    else:
+        print("Boundary store not built (make boundaries), synthetic layer only")
+
+    for source, (gdf_county, gdf_state) in layers.items():
+        for layer, gdf in (("state", gdf_state), ("county", gdf_county)):
+            col = "geoid" if layer == "state" else "statefp"
+            compare(source, layer, gdf[gdf[col] == FIPS_ALASKA], new_centerline, repeat)
+
+
+if __name__ == "__main__":
+    main()
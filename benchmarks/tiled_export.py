@@ -0,0 +1,90 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
+
+from config import PLOT_BACKENDS, PLOT_DPI, PLOT_PARAMS
+from scripts.export import save_png_tiled
+from scripts.plotting import Plot
+from scripts.shared_data import load_plot_data
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Plots at PLOT_DPI are ~100 megapixels, above Pillow's decompression bomb limit
+Image.MAX_IMAGE_PIXELS = None
+
+
+def peak_rss_mb():
+    # VmHWM rather than ru_maxrss, which a spawned worker inherits from the
+    # parent's high-water mark across exec (Linux only)
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmHWM:"):
+            return int(line.split()[1]) / 1024
+
+
+def save_once(plot_label, backend, mode, dpi, path):
+    """Save one plot in a fresh process and return (seconds, peak MB added)."""
+    plotter = Plot(
+        plot_tables=load_plot_data(), plot_params=PLOT_PARAMS, backend=backend
+    )
+    fig = plotter.figure(plot_label, dpi=dpi)
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    if mode == "tiled":
+        save_png_tiled(fig, path, dpi=dpi)
+    else:
+        fig.savefig(path, dpi=dpi)
+    elapsed = time.perf_counter() - start
+    plt.close(fig)
+
+    return elapsed, peak_rss_mb() - baseline
+
+
+def compare(plot_label, backend, dpi, out_dir):
+    context = multiprocessing.get_context("spawn")
+
+    paths = {}
+    for mode in ("single", "tiled"):
+        paths[mode] = out_dir / f"{plot_label}__{backend}__{mode}.png"
+
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            elapsed, added_mb = executor.submit(
+                save_once, plot_label, backend, mode, dpi, paths[mode]
+            ).result()
+
+        size_mb = paths[mode].stat().st_size / 1e6
+        print(
+            f"{plot_label} @ {dpi} dpi  {backend:<10}  {mode:<6}  {elapsed:6.2f} s  "
+            f"peak +{added_mb:6.1f} MB  file {size_mb:5.1f} MB"
+        )
+
+    expected = np.asarray(Image.open(paths["single"]).convert("RGBA"))
+    actual = np.asarray(Image.open(paths["tiled"]))
+    assert expected.shape == actual.shape
+
+    differing = (expected != actual).any(axis=2)
+    near = (np.abs(expected.astype(np.int16) - actual) <= 2).all(axis=2)
+    print(
+        f"  pixels differing={differing.mean():.4%}  "
+        f"differing by more than 2 levels={(~near).mean():.4%}"
+    )
+
+
+def main(plot_label="us_inset", dpi=PLOT_DPI, out_dir=Path("/tmp")):
+    for backend in PLOT_BACKENDS:
+        compare(plot_label, backend, dpi, out_dir)
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
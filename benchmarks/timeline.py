@@ -0,0 +1,93 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import io
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+
+from config import PLOT_PARAMS, TIMELINE_DPI
+from scripts.plotting import Plot
+from scripts.shared_data import load_plot_data
+from scripts.timeline import Timeline
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+BACKENDS = ["plotnine", "matplotlib"]
+
+
+def tables_as_of(dct_plot, plot_label, date):
+    """Region tables with `visited` cleared for visits after `date`."""
+    return {
+        layer: {
+            plot_label: gdf.assign(
+                visited=((gdf["visited"].astype(int) == 1) & (gdf["date"] <= date))
+                .astype(int)
+                .astype("category")
+            )
+        }
+        for layer, dct_layer in dct_plot.items()
+        for gdf in [dct_layer[plot_label]]
+    }
+
+
+def rebuild_frame(dct_plot, plot_label, date, backend, dpi):
+    """Render one frame the old way, with a full plot build. Returns RGBA."""
+    plotter = Plot(
+        plot_tables=tables_as_of(dct_plot, plot_label, date),
+        plot_params=PLOT_PARAMS,
+        backend=backend,
+    )
+    buf = io.BytesIO()
+    plotter.render(plot_label, filename=buf, dpi=dpi, format="rgba")
+
+    return buf.getvalue()
+
+
+def main(plot_label="us_inset", n_frames=10, dpi=TIMELINE_DPI):
+    dct_plot = load_plot_data()
+
+    start = time.perf_counter()
+    timeline = Timeline(dct_plot, PLOT_PARAMS, plot_label, dpi=dpi)
+    t_setup = time.perf_counter() - start
+
+    # The date label is not part of the static plots
+    timeline.label.set_visible(False)
+
+    dates = timeline.dates[np.linspace(0, len(timeline) - 1, n_frames).astype(int)]
+
+    t_frame = []
+    t_rebuild = {backend: [] for backend in BACKENDS}
+    for date in dates:
+        start = time.perf_counter()
+        frame = timeline.draw(date).copy()
+        t_frame.append(time.perf_counter() - start)
+
+        for backend in BACKENDS:
+            start = time.perf_counter()
+            expected = rebuild_frame(dct_plot, plot_label, date, backend, dpi)
+            t_rebuild[backend].append(time.perf_counter() - start)
+
+            # Recoloring must give the same image as a matplotlib rebuild
+            if backend == "matplotlib":
+                expected = np.frombuffer(expected, dtype=np.uint8).reshape(frame.shape)
+                np.testing.assert_array_equal(frame, expected)
+
+    timeline.close()
+
+    print(
+        f"{plot_label}  dpi={dpi}  {len(timeline)} frames in the full timeline, "
+        f"{n_frames} timed"
+    )
+    print(f"  timeline setup (draws geometry once)  {t_setup:6.2f} s")
+    print(f"  timeline frame (recolor + draw)       {np.mean(t_frame):6.3f} s")
+    for backend in BACKENDS:
+        print(f"  rebuild frame, {backend:<22} {np.mean(t_rebuild[backend]):6.3f} s")
+
+
+if __name__ == "__main__":
+    main()
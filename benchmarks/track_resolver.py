@@ -0,0 +1,106 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from config import NON_CONTIGUOUS_CODES
+from scripts.data import import_shapefiles
+from scripts.tracks import CountyLocator, first_county_times
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def locate_naive(gdf_county, lon, lat):
+    """Per-point containment check against every county, kept for comparison."""
+    geoids = []
+    for x, y in zip(lon, lat):
+        point = shapely.Point(x, y)
+        match = None
+        for geoid, geom in zip(gdf_county["geoid"], gdf_county.geometry):
+            if geom.intersects(point):
+                match = geoid
+                break
+        geoids.append(match)
+
+    return np.array(geoids, dtype=object)
+
+
+def random_track(gdf_county, n_points, seed=0):
+    """Random walk over the contiguous US, one point per second."""
+    rng = np.random.default_rng(seed)
+    xmin, ymin, xmax, ymax = gdf_county.total_bounds
+
+    steps = rng.normal(scale=0.01, size=(n_points, 2))
+    start = [rng.uniform(xmin, xmax), rng.uniform(ymin, ymax)]
+    coords = start + np.cumsum(steps, axis=0)
+    lon = np.clip(coords[:, 0], xmin, xmax)
+    lat = np.clip(coords[:, 1], ymin, ymax)
+    times = pd.date_range("2026-04-21 12:00", periods=n_points, freq="s", tz="UTC")
+
+    return lon, lat, times
+
+
+def write_gpx(path, lon, lat, times):
+    """Write a single-segment GPX track."""
+    with open(path, "w") as f:
+        f.write('<?xml version="1.0"?>\n')
+        f.write('<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">\n')
+        f.write("<trk><trkseg>\n")
+        stamps = times.strftime("%Y-%m-%dT%H:%M:%SZ")
+        f.writelines(
+            f'<trkpt lat="{y:.6f}" lon="{x:.6f}"><time>{t}</time></trkpt>\n'
+            for x, y, t in zip(lon, lat, stamps)
+        )
+        f.write("</trkseg></trk>\n</gpx>\n")
+
+
+def main(n_points=1_000_000, n_naive=2_000):
+    gdf_county, _ = import_shapefiles()
+    gdf_county = gdf_county[~gdf_county["statefp"].isin(NON_CONTIGUOUS_CODES)]
+    gdf_county = gdf_county.to_crs("EPSG:4326")
+
+    lon, lat, times = random_track(gdf_county, n_points)
+
+    start = time.perf_counter()
+    locator = CountyLocator(gdf_county)
+    t_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = locator(lon, lat)
+    t_tree = time.perf_counter() - start
+
+    # The naive version is only run on a sample and scaled up
+    start = time.perf_counter()
+    expected = locate_naive(gdf_county, lon[:n_naive], lat[:n_naive])
+    t_naive = (time.perf_counter() - start) * n_points / n_naive
+
+    assert (actual[:n_naive] == expected).all()
+
+    print(f"points={n_points:,}  counties={len(gdf_county):,}")
+    print(f"naive      {t_naive:8.2f} s  (extrapolated from {n_naive:,} points)")
+    print(f"strtree    {t_tree:8.2f} s  (+{t_build:.2f} s index build)")
+    print(f"speedup    {t_naive / t_tree:8.1f}x")
+
+    # End to end: stream a GPX file and reduce to first entry per county
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "track.gpx"
+        write_gpx(path, lon, lat, times)
+
+        start = time.perf_counter()
+        df_first = first_county_times(path, locator)
+        t_gpx = time.perf_counter() - start
+
+    print(f"gpx stream {t_gpx:8.2f} s  ({len(df_first)} counties)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import datetime as dt
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import pandas as pd
+
+from scripts.data import import_data_visit_text
+from scripts.planner import format_trip_file
+from scripts.trips import build_name_index, resolve_county
+from scripts.visit_log import county_keys
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Trip file entries and the county code they must resolve to. Names with "City"
+# in them are the ones a trailing "city" can be misread on.
+EXPECTED = [
+    ("Charles City County", "VA", 36),
+    ("Charles City", "VA", 36),
+    ("James City County", "VA", 95),
+    ("James City", "VA", 95),
+    ("Carson City", "NV", 510),
+    ("Richmond", "VA", 159),
+    ("Richmond County", "VA", 159),
+    ("Richmond city", "VA", 760),
+    ("Baltimore County", "MD", 5),
+    ("Baltimore city", "MD", 510),
+    ("Franklin County", "VA", 67),
+    ("Franklin city", "VA", 620),
+    ("St. Louis city", "MO", 510),
+    ("Juneau City and Borough", "AK", 110),
+]
+
+
+def check_expected(df, index):
+    for county_name, state, county_code in EXPECTED:
+        row = resolve_county(index, county_name, state)
+        assert row is not None, (county_name, state)
+        assert int(df.at[row, "county_code"]) == county_code, (county_name, state)
+
+
+def check_written_names(df, index):
+    """Every county, as format_trip_file writes it, resolves to its own row."""
+    keys = pd.Series(df.index, index=county_keys(df))
+    df_route = pd.DataFrame({"geoid": keys.index, "day": 0})
+    text = format_trip_file(df_route, df, dt.date(2026, 1, 1), ["Check"])
+
+    entries = [
+        line[2:].rpartition(", ")[::2]
+        for line in text.splitlines()
+        if line.startswith("* ")
+    ]
+    assert len(entries) == len(df)
+    for (county_name, state), row in zip(entries, keys):
+        assert resolve_county(index, county_name, state) == row, county_name
+
+    written = {county_name for county_name, _ in entries}
+    assert "Charles City city" not in written
+    assert "Richmond city" in written
+
+    return entries
+
+
+def main(repeat=3):
+    df = import_data_visit_text()
+    index = build_name_index(df)
+
+    check_expected(df, index)
+    entries = check_written_names(df, index)
+    print(f"{len(EXPECTED)} trip file names and {len(entries)} written names valid.")
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for county_name, state in entries:
+            resolve_county(index, county_name, state)
+        timings.append(time.perf_counter() - start)
+    print(f"resolve {len(entries)} names  {min(timings) * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
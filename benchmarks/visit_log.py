@@ -0,0 +1,107 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+
+from scripts.data import VISIT_TABLE_PATH
+from scripts.visit_log import append_events, apply_events, make_events, read_events
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def best_of(func, repeat, *args):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def random_events(df, n_events, seed=0):
+    """Adds to unvisited counties, then corrections and removals of visited ones."""
+    rng = np.random.default_rng(seed)
+    unvisited = df.index[df["date"] == ""]
+    visited = df.index[df["date"] != ""]
+
+    n_add = n_events // 2
+    n_correct = n_events // 4
+    n_remove = n_events - n_add - n_correct
+
+    added = rng.choice(unvisited, n_add, replace=False)
+    changed = rng.choice(visited, n_correct + n_remove, replace=False)
+
+    return pd.concat(
+        [
+            make_events(df, added, "add", dates="6/1/25", notes="added"),
+            make_events(df, changed[:n_correct], "correct", dates="6/2/25"),
+            make_events(df, changed[n_correct:], "remove"),
+        ],
+        ignore_index=True,
+    )
+
+
+def rewrite_table(df, df_events, path):
+    """The previous write path: apply the change and rewrite the whole CSV."""
+    apply_events(df, df_events).to_csv(path, index=False)
+
+
+def main(repeat=20, pending=(0, 10, 100, 200)):
+    df = pd.read_csv(VISIT_TABLE_PATH, dtype=str, keep_default_na=False)
+    df_events = random_events(df, max(pending))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        log_path = tmp / "visit_events.csv"
+
+        # Replaying the log gives the same table as applying each change in turn
+        expected = df.copy()
+        for _, event in df_events.iterrows():
+            expected = apply_events(expected, event.to_frame().T)
+        append_events(df_events, log_path)
+        pd.testing.assert_frame_equal(
+            apply_events(df, read_events(0, log_path)[0]), expected
+        )
+
+        print(f"visit table: {len(df)} rows, {VISIT_TABLE_PATH.stat().st_size:,} bytes")
+        for n_changed in (1, 10):
+            df_change = df_events.head(n_changed)
+            t_rewrite = best_of(rewrite_table, repeat, df, df_change, tmp / "t.csv")
+            t_append = best_of(append_events, repeat, df_change, tmp / "a.csv")
+            print(
+                f"  write {n_changed:>2} changed rows: rewrite CSV "
+                f"{t_rewrite * 1000:6.2f} ms, append events {t_append * 1000:6.2f} ms"
+            )
+
+        # The log holds a long compacted history. Reads skip it by offset and
+        # only parse the pending tail.
+        history_path = tmp / "history.csv"
+        for _ in range(50):
+            append_events(df_events, history_path)
+
+        for n_pending in pending:
+            offset = history_path.stat().st_size
+            append_events(df_events.head(n_pending), history_path)
+
+            def read_with_replay(offset=offset):
+                table = pd.read_csv(VISIT_TABLE_PATH, dtype=str, keep_default_na=False)
+                return apply_events(table, read_events(offset, history_path)[0])
+
+            print(
+                f"  read + replay {n_pending:>3} pending events      "
+                f"{best_of(read_with_replay, repeat) * 1000:6.2f} ms"
+            )
+            history_path.write_bytes(history_path.read_bytes()[:offset])
+
+
+if __name__ == "__main__":
+    main()
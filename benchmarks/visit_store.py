@@ -0,0 +1,174 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import numpy as np
+import pandas as pd
+
+from scripts.data import import_data_visit
+from scripts.processing import process_data_visited
+from scripts.visit_store import VisitStore
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def build_state_progress(df):
+    """Copy of app.py's per-state summary, the reference for state_progress."""
+    df_progress = (
+        df.groupby("state_name")
+        .agg(
+            visited=("visited", "sum"),
+            total=("visited", "count"),
+        )
+        .reset_index()
+    )
+    df_progress["pct"] = (df_progress["visited"] / df_progress["total"]) * 100
+    return df_progress.sort_values("pct", ascending=False).reset_index(drop=True)
+
+
+def synthetic_visits(counties, n_travelers, mean_visits=300, seed=0):
+    """
+    Long (traveler, geoid) table with a skewed number of visits per traveler.
+
+    Counties are drawn with Zipf-like weights so a few are visited by nearly
+    everyone, which keeps group intersections non-empty.
+    """
+    rng = np.random.default_rng(seed)
+
+    n_visits = np.clip(
+        rng.lognormal(np.log(mean_visits), 0.8, n_travelers).astype(int),
+        1,
+        len(counties),
+    )
+    weights = 1 / np.arange(1, len(counties) + 1) ** 0.8
+    weights = rng.permutation(weights / weights.sum())
+
+    positions = rng.choice(len(counties), size=n_visits.sum(), p=weights)
+
+    return pd.DataFrame(
+        {
+            "traveler": np.repeat(
+                [f"traveler_{i:05d}" for i in range(n_travelers)], n_visits
+            ),
+            "geoid": counties["geoid"].to_numpy()[positions],
+        }
+    )
+
+
+def reference_queries(df_visits, counties, travelers):
+    """The same queries answered with pandas on the long visit table."""
+    df = df_visits.drop_duplicates().merge(counties[["geoid", "state"]], on="geoid")
+
+    counts = df.groupby("traveler").size().rename("visited")
+    ranked = (
+        counts.rename_axis("traveler")
+        .reset_index()
+        .sort_values(["visited", "traveler"], ascending=[False, True])
+    )
+    group = df[df["traveler"].isin(travelers)]
+
+    return {
+        "counts_by_traveler": counts,
+        "counts_by_state": df.groupby(["traveler", "state"])
+        .size()
+        .unstack(fill_value=0),
+        "union": np.sort(group["geoid"].unique()),
+        "intersection": np.sort(
+            group.groupby("geoid")["traveler"]
+            .nunique()
+            .loc[lambda s: s == len(travelers)]
+            .index.to_numpy()
+        ),
+        "leaderboard": ranked.head(10)["traveler"].to_numpy(),
+    }
+
+
+def store_queries(store, travelers):
+    return {
+        "counts_by_traveler": store.counts_by_traveler(),
+        "counts_by_state": store.counts_by_state(),
+        "union": store.union(travelers),
+        "intersection": store.intersection(travelers),
+        "leaderboard": store.leaderboard(10)["traveler"].to_numpy(),
+    }
+
+
+def best_of(func, repeat, *args):
+    """Return the fastest wall time in seconds over `repeat` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def check_equivalence(store, df_visits, counties, travelers):
+    expected = reference_queries(df_visits, counties, travelers)
+    actual = store_queries(store, travelers)
+
+    pd.testing.assert_series_equal(
+        actual["counts_by_traveler"].sort_index(),
+        expected["counts_by_traveler"],
+        check_names=False,
+        check_index_type=False,
+    )
+
+    df_expected = expected["counts_by_state"]
+    df_actual = actual["counts_by_state"].loc[df_expected.index, df_expected.columns]
+    np.testing.assert_array_equal(df_actual.to_numpy(), df_expected.to_numpy())
+    assert (actual["counts_by_state"].drop(columns=df_expected.columns) == 0).all(None)
+
+    for query in ("union", "intersection", "leaderboard"):
+        np.testing.assert_array_equal(actual[query], expected[query])
+
+
+def main(n_travelers=10_000, repeat=5):
+    df = process_data_visited(import_data_visit())
+    counties = df[["geoid", "state", "state_name"]]
+
+    # A single traveler's store reproduces the app's per-state progress table
+    pd.testing.assert_frame_equal(
+        VisitStore.from_visit_table(df, "me").state_progress(),
+        build_state_progress(df),
+    )
+
+    df_visits = synthetic_visits(counties, n_travelers)
+
+    start = time.perf_counter()
+    store = VisitStore.from_frame(df_visits, counties)
+    t_build = time.perf_counter() - start
+
+    group = list(store.travelers[:: n_travelers // 25])
+    check_equivalence(store, df_visits, counties, group)
+
+    print(
+        f"travelers={len(store)}  visits={len(df_visits)}  "
+        f"bitsets={store._bits.nbytes / 2**20:.1f} MB  build={t_build:.2f} s"
+    )
+
+    queries = {
+        "counts_by_traveler": store.counts_by_traveler,
+        "counts_by_state": store.counts_by_state,
+        "union (25 travelers)": lambda: store.union(group),
+        "intersection (25 travelers)": lambda: store.intersection(group),
+        "union (everyone)": store.union,
+        "leaderboard": lambda: store.leaderboard(10),
+        "leaderboard (NC)": lambda: store.leaderboard(10, state="NC"),
+        "state_progress (everyone)": store.state_progress,
+    }
+    for name, query in queries.items():
+        print(f"  {name:<30} {best_of(query, repeat) * 1000:8.1f} ms")
+
+    t_pandas = best_of(reference_queries, 1, df_visits, counties, group)
+    print(f"  {'pandas, first five queries':<30} {t_pandas * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,50 +7,40 @@ import json
 
 import folium
 import folium.plugins as plugins
-import geopandas as gpd
 import streamlit as st
 import streamlit_folium as stf
+from folium.utilities import JsCode
 
+from config import MAP_DETAIL_LEVELS
 from paths import PROJECT_ROOT
-from scripts.data import import_data
-from scripts.processing import process_data
+from scripts import perf
+from scripts.shared_data import load_frontier, load_frontier_payload, load_map_payload
 
 st.set_page_config(page_title="Interactive Map", layout="wide")
 
-
-@st.cache_data
-def load_data():
-    df, counties, states = import_data()
-    counties, states = process_data(
-        df_visited=df,
-        gdf_county=counties,
-        gdf_state=states,
-    )
-    return df, counties, states
+MAP_CENTER = [39.8283, -98.5795]
+MAP_ZOOM_START = 5
 
 
-def format_date(date, print_fmt: str = "%B %d, %Y") -> str:
-    """Format a datetime as a human-readable string."""
-    return date.strftime(print_fmt)
+def detail_level(zoom: int) -> str:
+    """Return the coarsest detail level that is still sharp at this zoom."""
+    for level, detail in MAP_DETAIL_LEVELS.items():
+        if zoom <= detail["max_zoom"]:
+            return level
+    return level
 
 
-def _prepare_states(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    """Subset state GeoDataFrame to columns needed by folium."""
-    out = gdf[["geometry", "visited"]].copy()
-    out["visited"] = out["visited"].astype(int)
-    return out
+def style_table(styles: dict) -> JsCode:
+    """Leaflet style function looking a feature's style up by its visited flag."""
+    table = json.dumps({1: styles["visited"], 0: styles["not_visited"]})
+    return JsCode(
+        f"function(feature) {{ return {table}[feature.properties.visited]; }}"
+    )
 
 
-def _prepare_counties(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    """Subset county GeoDataFrame and pre-format dates for folium tooltips."""
-    cols = ["geometry", "visited", "state_name", "name", "geoid", "date"]
-    out = gdf[cols].copy()
-    out["visited"] = out["visited"].astype(int)
-    out["date_str"] = out.apply(
-        lambda row: format_date(row["date"]) if row["visited"] == 1 else "",
-        axis=1,
-    )
-    return out.drop(columns=["date"])
+def fixed_style(style: dict) -> JsCode:
+    """Leaflet style function giving every feature the same style."""
+    return JsCode(f"function(feature) {{ return {json.dumps(style)}; }}")
 
 
 config_path = PROJECT_ROOT / "config.json"
@@ -59,43 +49,73 @@ with open(config_path, "r") as f:
 
 st.header("Interactive Map")
 
+show_frontier = st.toggle(
+    "Show frontier",
+    help="Highlight the unvisited counties that share a border with a visited one.",
+)
+if show_frontier:
+    st.caption(f"{len(load_frontier()):,} unvisited counties border a visited county.")
+
+# Pick the level of detail for the current zoom. Borders are simplified as a
+# coverage, so neighbouring counties still line up at every level.
+level = detail_level(st.session_state.get("map_zoom", MAP_ZOOM_START))
+
+# Layers are serialized once per detail level and visit data into the on-disk
+# cache, then read and parsed once per process and shared by every rerun.
 with st.spinner("Loading data..."):
-    df, counties, states = load_data()
+    payload = load_map_payload(level)
+
+with st.spinner("Building map..."), perf.stage("folium_map", level=level):
+    m = folium.Map(
+        location=MAP_CENTER, zoom_start=MAP_ZOOM_START, tiles="OpenStreetMap"
+    )
+    plugins.Fullscreen(position="topleft").add_to(m)
 
-with st.spinner("Building map..."):
-    m = folium.Map(location=[39.8283, -98.5795], zoom_start=5, tiles="OpenStreetMap")
+    # Boundary layers are sent as a feature group, so switching detail level
+    # swaps the layers without re-creating the map or losing the view.
+    fg = folium.FeatureGroup(name="Boundaries")
 
     state_styles = CONFIG["style"]["state"]
     county_styles = CONFIG["style"]["county"]
 
+    # Styles are resolved in the browser from a two-entry table keyed on the
+    # visited flag, instead of a per-feature style map built in Python.
     folium.GeoJson(
-        _prepare_states(states),
-        style_function=lambda f: (
-            state_styles["visited"]
-            if f["properties"]["visited"] == 1
-            else state_styles["not_visited"]
-        ),
-    ).add_to(m)
+        payload["state"],
+        style=style_table(state_styles),
+    ).add_to(fg)
 
     folium.GeoJson(
-        _prepare_counties(counties),
-        style_function=lambda f: (
-            county_styles["visited"]
-            if f["properties"]["visited"] == 1
-            else county_styles["not_visited"]
-        ),
+        payload["county"],
+        style=style_table(county_styles),
         tooltip=folium.GeoJsonTooltip(
             fields=["state_name", "name", "geoid", "date_str"],
             aliases=["State:", "County:", "FIPS:", "Date Visited:"],
         ),
-    ).add_to(m)
-
-    plugins.Fullscreen(position="topleft").add_to(m)
+    ).add_to(fg)
+
+    # Frontier counties are drawn on top, from the precomputed county graph
+    if show_frontier:
+        folium.GeoJson(
+            load_frontier_payload(level),
+            style=fixed_style(CONFIG["style"]["frontier"]),
+            tooltip=folium.GeoJsonTooltip(
+                fields=["state_name", "name"], aliases=["State:", "County:"]
+            ),
+        ).add_to(fg)
 
 with st.spinner("Rendering map..."):
-    stf.st_folium(
+    map_state = stf.st_folium(
         m,
+        key="interactive_map",
+        feature_group_to_add=fg,
         width=CONFIG["interactive_map"]["width"],
         height=CONFIG["interactive_map"]["height"],
-        returned_objects=[],
+        returned_objects=["zoom"],
     )
+
+# Only rerun with new layers when the zoom crosses into another detail level
+zoom = (map_state or {}).get("zoom")
+if zoom is not None and detail_level(zoom) != level:
+    st.session_state["map_zoom"] = zoom
+    st.rerun()
@@ -3,27 +3,21 @@ import sys
 
 sys.path.insert(0, str(pathlib.Path(__file__).parent.parent / "src"))
 
+import math
+
 import streamlit as st
 
-from config import NA_DATE
-from scripts.data import import_data
-from scripts.processing import process_data
+from scripts.shared_data import load_table_index
 
 st.set_page_config(page_title="Data Table", layout="wide")
 
-
-@st.cache_data
-def load_data():
-    df, counties, states = import_data()
-    counties, states = process_data(
-        df_visited=df,
-        gdf_county=counties,
-        gdf_state=states,
-    )
-    return df, counties, states
+PAGE_SIZES = [50, 100, 250, 500]
+DEFAULT_PAGE_SIZE = 100
 
 
-df, counties, states = load_data()
+# Sorted, formatted and indexed once per visit table and shared by every
+# session, so a filter change only looks up rows.
+index = load_table_index()
 
 st.header("Data Table")
 
@@ -31,8 +25,7 @@ st.header("Data Table")
 col_state, col_visited, col_year = st.columns(3)
 
 with col_state:
-    all_states = sorted(df["state_name"].unique())
-    selected_states = st.multiselect("Filter by state", all_states, default=[])
+    selected_states = st.multiselect("Filter by state", index.states, default=[])
 
 with col_visited:
     visited_filter = st.radio(
@@ -42,46 +35,47 @@ with col_visited:
     )
 
 with col_year:
-    visit_years = sorted(df[df["visited"] == 1]["date"].apply(lambda d: d.year).unique())
     year_range = st.slider(
         "Year visited",
-        min_value=visit_years[0],
-        max_value=visit_years[-1],
-        value=(visit_years[0], visit_years[-1]),
+        min_value=index.years[0],
+        max_value=index.years[-1],
+        value=(index.years[0], index.years[-1]),
         disabled=(visited_filter == "Not visited"),
     )
 
 # --- Apply filters ---
-display_df = df.copy()
+# Rows come back in display order: visited first, then most recent → oldest;
+# unvisited fall to the bottom
+rows = index.rows(
+    states=selected_states,
+    status=visited_filter,
+    years=(int(year_range[0]), int(year_range[1])),
+)
+n_visited = index.count_visited(rows)
 
-if selected_states:
-    display_df = display_df[display_df["state_name"].isin(selected_states)]
+# --- Metrics ---
+m1, m2, m3 = st.columns(3)
+m1.metric("Showing", f"{len(rows):,}")
+m2.metric("Visited (shown)", f"{n_visited:,}")
+m3.metric("Not visited (shown)", f"{len(rows) - n_visited:,}")
 
-if visited_filter == "Visited":
-    display_df = display_df[display_df["visited"] == 1]
-elif visited_filter == "Not visited":
-    display_df = display_df[display_df["visited"] == 0]
+# --- Pagination ---
+# Only the current page is built and sent to the browser
+col_size, col_page, col_range = st.columns([1, 1, 2], vertical_alignment="bottom")
 
-if visited_filter == "Visited":
-    year = display_df["date"].apply(lambda d: d.year)
-    display_df = display_df[year.between(int(year_range[0]), int(year_range[1]))]
+with col_size:
+    page_size = st.selectbox(
+        "Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(DEFAULT_PAGE_SIZE)
+    )
 
-# Sort: visited first, then most recent → oldest; unvisited fall to the bottom
-display_df = display_df.sort_values(
-    ["visited", "date"], ascending=[False, False]
-).reset_index(drop=True)
+n_pages = max(1, math.ceil(len(rows) / page_size))
 
-# --- Format for display ---
-display_df = display_df[["state_name", "county_name", "geoid", "date", "notes"]].copy()
-display_df["date"] = display_df["date"].apply(
-    lambda d: d.strftime("%B %d, %Y") if d != NA_DATE else ""
-)
-display_df.columns = ["State", "County", "FIPS", "Date Visited", "Notes"]
+with col_page:
+    page = st.number_input("Page", min_value=1, max_value=n_pages, value=1, step=1)
 
-# --- Metrics ---
-m1, m2, m3 = st.columns(3)
-m1.metric("Showing", f"{len(display_df):,}")
-m2.metric("Visited (shown)", f"{(display_df['Date Visited'] != '').sum():,}")
-m3.metric("Not visited (shown)", f"{(display_df['Date Visited'] == '').sum():,}")
+with col_range:
+    first = min((page - 1) * page_size + 1, len(rows))
+    last = min(page * page_size, len(rows))
+    st.caption(f"Rows {first:,}–{last:,} of {len(rows):,} · page {page} of {n_pages}")
 
-st.dataframe(display_df, use_container_width=True, hide_index=True)
+st.dataframe(index.page(rows, page, page_size), width="stretch", hide_index=True)
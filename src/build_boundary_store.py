@@ -0,0 +1,36 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import argparse
+
+from config import BOUNDARY_YEAR
+from scripts.data import boundary_store_is_current, build_boundary_store
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def main(year=BOUNDARY_YEAR, if_stale=False):
+    if if_stale and boundary_store_is_current(year):
+        print(f"Boundary store for {year} is current")
+        return
+
+    store_dir = build_boundary_store(year=year)
+    print(f"Boundary store written to {store_dir}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Download the Census boundaries and write the boundary store."
+    )
+    parser.add_argument(
+        "--if-stale",
+        action="store_true",
+        help="Only build if the store is missing or was written by older code.",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(if_stale=args.if_stale)
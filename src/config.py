@@ -19,16 +19,160 @@ TERRITORY_CODES = ["60", "66", "69", "72", "78"]
 
 EPSG_CODE = "3082"
 
-# State FIPS codes for region-specific plots
+# Census cartographic boundary vintage used for the state and county layers
+BOUNDARY_YEAR = 2023
+
+# Bump when the layout or normalization of the local boundary store changes, so
+# stores written by older code are rebuilt instead of read.
+BOUNDARY_STORE_VERSION = 3
+
+# State outlines the Alaska and Hawaii insets are placed with, the ones pygris'
+# shift_geometry downloads on every call. A copy is kept in the store and
+# passed to mapping.shift_inset.
+INSET_REFERENCE = {"year": 2021, "resolution": "20m"}
+
+# Columns kept in the local boundary store, per layer
+BOUNDARY_COLUMNS = {
+    "state": ["geoid", "statefp", "name", "geometry"],
+    "county": ["geoid", "statefp", "name", "state_name", "geometry"],
+}
+
+# Simplified boundary layers for the interactive map. Each level is served up
+# to `max_zoom` (Leaflet zoom) and simplified with `tolerance` degrees, which
+# is kept below the width of a pixel at that zoom.
+MAP_DETAIL_LEVELS = {
+    "low": {"max_zoom": 5, "tolerance": 0.02},
+    "medium": {"max_zoom": 7, "tolerance": 0.005},
+    "high": {"max_zoom": 18, "tolerance": 0.001},
+}
+
+# GPS tracks: timezone used to turn track timestamps into visit dates, and the
+# number of track points resolved per batch while streaming a file
+TRACK_TIMEZONE = "America/New_York"
+TRACK_CHUNK_SIZE = 250_000
+
+# Visit changes are appended to an event log. The visit table CSV, its
+# snapshot, is rewritten once this many events are pending.
+VISIT_LOG_COMPACT_EVENTS = 200
+
+# County adjacency graph. Counties are "nearby" neighbours when their
+# boundaries are within ADJACENCY_DISTANCE_KM, measured in the equal-area
+# ADJACENCY_CRS.
+ADJACENCY_CRS = "EPSG:5070"
+ADJACENCY_DISTANCE_KM = 25
+
+# Road-trip planner. Legs between neighbouring counties are their centroid
+# distance times PLANNER_ROAD_FACTOR, and each day drives up to
+# PLANNER_KM_PER_DAY. Routes are searched over the PLANNER_AREA_COUNTIES
+# counties closest to the start, with up to PLANNER_ROUNDS rounds of local
+# improvement after the greedy route. Each round reorders the stops and tries
+# leaving out each of the PLANNER_DROPS least productive ones.
+PLANNER_KM_PER_DAY = 500
+PLANNER_ROAD_FACTOR = 1.3
+PLANNER_AREA_COUNTIES = 2000
+PLANNER_ROUNDS = 3
+PLANNER_DROPS = 3
+
+# Stage records kept in memory by scripts.perf when instrumentation is enabled
+PERF_MAX_RECORDS = 1000
+
+# State FIPS code of Alaska, whose plot is centred on ALASKA_CENTERLINE
 FIPS_ALASKA = "02"
-FIPS_HAWAII = "15"
-FIPS_NC = "37"
-FIPS_NC_ADJACENT = ["13", "37", "45", "47", "51"]  # GA, NC, SC, TN, VA
+
+# Central meridian used to keep the Aleutians on the same side of the Alaska plot
+ALASKA_CENTERLINE = 90
+
+# Regions drawn as static plots. Each region selects its states by FIPS code,
+# either the `states` to keep or the `exclude`d ones, and declares how its
+# geometry is placed and its figure size in inches:
+#   projection  None keeps longitude/latitude; "epsg" reprojects to EPSG_CODE;
+#               "meridian" moves the central meridian to `centerline`; "inset"
+#               moves Alaska and Hawaii below the lower 48 (shift_inset,
+#               like pygris shift_geometry, only handles the 50 states)
+#   limits      fixed axis limits ((xmin, xmax), (ymin, ymax)), instead of
+#               fitting the data
+#   show_on_page
+#               list the region on the Static Plots page, in the order here
+# A region's tables are built the first time it is plotted, so adding regions
+# costs nothing until they are used.
+PLOT_REGIONS = {
+    "us_inset": {
+        "title": "United States",
+        "exclude": TERRITORY_CODES,
+        "projection": "inset",
+        "width": 12,
+        "height": 8,
+        "show_on_page": True,
+    },
+    "contiguous": {
+        "title": "Contiguous United States",
+        "exclude": NON_CONTIGUOUS_CODES,
+        "projection": "epsg",
+        "width": 10,
+        "height": 6,
+    },
+    "alaska": {
+        "title": "Alaska",
+        "states": ["02"],  # AK
+        "projection": "meridian",
+        "centerline": ALASKA_CENTERLINE,
+        "width": 7,
+        "height": 6,
+        "show_on_page": True,
+    },
+    "hawaii": {
+        "title": "Hawaii",
+        "states": ["15"],  # HI
+        "limits": ((-162, -153), (16, 26)),
+        "width": 6,
+        "height": 6,
+        "show_on_page": True,
+    },
+    "north_carolina": {
+        "title": "North Carolina",
+        "states": ["37"],  # NC
+        "width": 10,
+        "height": 5,
+        "show_on_page": True,
+    },
+    "north_carolina_w_adjacent_states": {
+        "title": "North Carolina & Adjacent States",
+        "states": ["13", "37", "45", "47", "51"],  # GA, NC, SC, TN, VA
+        "width": 8,
+        "height": 6,
+        "show_on_page": True,
+    },
+}
+
+# Bump when the way region plot geometry is built changes, so cached
+# geometry from older code is not reused.
+PLOT_GEOMETRY_CACHE_VERSION = 2
 
 # DPI for saved plot files vs. on-demand web preview
 PLOT_DPI = 1000
 PLOT_PREVIEW_DPI = 150
 
+# Renderer for the static plots. "plotnine" builds a ggplot with geom_map;
+# "matplotlib" draws the same layers straight to path collections, skipping
+# plotnine's scale and layout machinery.
+PLOT_BACKENDS = ["plotnine", "matplotlib"]
+PLOT_BACKEND = "plotnine"
+
+# Saved rasters larger than PLOT_TILE_MAX_PIXELS (width x height x DPI^2) are
+# rendered in strips of PLOT_TILE_ROWS pixel rows and streamed into the PNG,
+# which bounds peak memory at PLOT_DPI. Smaller ones render in one pass.
+PLOT_TILE_MAX_PIXELS = 25_000_000
+PLOT_TILE_ROWS = 512
+
+# Vector copies ("svg", "pdf") written next to each saved PNG, for print
+PLOT_VECTOR_FORMATS = []
+
+# Animated timeline of cumulative visits: frames per second, raster DPI, and
+# seconds the last frame is held before a GIF loops or an MP4 ends
+TIMELINE_FPS = 8
+TIMELINE_DPI = 100
+TIMELINE_HOLD_SECONDS = 2
+
 
 PLOT_PARAMS = {
     "color": {
@@ -40,22 +184,9 @@ PLOT_PARAMS = {
         "color": {"county": "#717d7e", "state": "#000000"},  # Gray80  # Black
         "thickness": {"county": 0.2, "state": 0.5},
     },
+    # Figure sizes are declared with each region in PLOT_REGIONS
     "dimensions": {
-        "height": {
-            "contiguous": 6,
-            "alaska": 6,
-            "hawaii": 6,
-            "north_carolina": 5,
-            "north_carolina_w_adjacent_states": 6,
-            "us_inset": 8,
-        },
-        "width": {
-            "contiguous": 10,
-            "alaska": 7,
-            "hawaii": 6,
-            "north_carolina": 10,
-            "north_carolina_w_adjacent_states": 8,
-            "us_inset": 12,
-        },
+        "height": {label: region["height"] for label, region in PLOT_REGIONS.items()},
+        "width": {label: region["width"] for label, region in PLOT_REGIONS.items()},
     },
 }
@@ -0,0 +1,85 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import argparse
+import datetime as dt
+
+from scripts.data import compact_visit_log, import_data_visit_text, record_visit_events
+from scripts.trips import build_name_index, format_visit_date, resolve_county
+from scripts.visit_log import make_events
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def edit_visit(action, county, date=None, note=None):
+    """
+    Log one add, correct or remove event for a county given as "Name, ST".
+
+    Returns the logged event, with the county's state and name.
+    """
+    county_name, _, state = county.rpartition(",")
+
+    df = import_data_visit_text()
+    row = resolve_county(build_name_index(df), county_name.strip(), state.strip())
+    if row is None:
+        raise SystemExit(f"Unknown county: {county}")
+
+    dates = None if date is None else format_visit_date(date)
+    notes = None if note is None else [note]
+
+    try:
+        df_events = make_events(df, [row], action, dates=dates, notes=notes)
+    except ValueError as e:
+        raise SystemExit(str(e)) from None
+    record_visit_events(df_events)
+
+    return {
+        "state": df.loc[row, "state"],
+        "county_name": df.loc[row, "county_name"],
+        **df_events.iloc[0].to_dict(),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Add, correct or remove a county visit, or compact the visit log."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for action, help_text in [
+        ("add", "Record a first visit to a county with no date."),
+        ("correct", "Change the date or note of a recorded visit."),
+    ]:
+        command = commands.add_parser(action, help=help_text)
+        command.add_argument("county", help='County and state, e.g. "Wake, NC".')
+        command.add_argument(
+            "date", type=dt.date.fromisoformat, help="Visit date, YYYY-MM-DD."
+        )
+        command.add_argument("--note", default=None, help="Note for the visit.")
+
+    command = commands.add_parser("remove", help="Clear a recorded visit.")
+    command.add_argument("county", help='County and state, e.g. "Wake, NC".')
+
+    commands.add_parser(
+        "compact", help="Fold logged events into the visit table CSV now."
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.command == "compact":
+        print(f"Compacted {compact_visit_log()} events into the visit table")
+    else:
+        result = edit_visit(
+            args.command,
+            args.county,
+            date=getattr(args, "date", None),
+            note=getattr(args, "note", None),
+        )
+        print(
+            f"Logged {result['action']}: {result['county_name']}, {result['state']} "
+            f"{result['date']} {result['notes']}".rstrip()
+        )
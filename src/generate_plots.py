@@ -1,16 +1,128 @@
 # ---------------------------------------------------------------------------- #
 # IMPORT #
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 
-from config import EPSG_CODE, NON_CONTIGUOUS_CODES, PLOT_PARAMS
+from config import (
+    PLOT_BACKEND,
+    PLOT_BACKENDS,
+    PLOT_DPI,
+    PLOT_PARAMS,
+    PLOT_REGIONS,
+    PLOT_VECTOR_FORMATS,
+)
+from paths import DATA_DIR
+from scripts import perf
 from scripts.data import import_data
-from scripts.plotting import Plot, generate_plot_data
+from scripts.plotting import Plot, generate_plot_data, plot_input_hash
 from scripts.processing import process_data
 
 # ---------------------------------------------------------------------------- #
 # CLASSES / FUNCTIONS #
 
+MANIFEST_PATH = DATA_DIR / "plots" / "render_manifest.json"
 
-def tracking_counties(print_plot=True, save_plot=True):
+
+def load_manifest():
+    """Return the input hash each plot was last rendered from."""
+    if not MANIFEST_PATH.exists():
+        return {}
+
+    with open(MANIFEST_PATH, "r") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest):
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
+def stale_labels(dct_hash, manifest, vector_formats=PLOT_VECTOR_FORMATS):
+    """Labels whose inputs changed since the last render or whose files are gone."""
+    formats = ["png", *vector_formats]
+
+    return [
+        plot_label
+        for plot_label, input_hash in dct_hash.items()
+        if manifest.get(plot_label) != input_hash
+        or not all(
+            (DATA_DIR / "plots" / f"{plot_label}.{format}").exists()
+            for format in formats
+        )
+    ]
+
+
+def region_tables(dct_plot, plot_label):
+    """Subset the plot tables to the state and county layers of one region."""
+    return {layer: {plot_label: dct_plot[layer][plot_label]} for layer in dct_plot}
+
+
+def render_region(
+    plot_tables,
+    plot_label,
+    save_plot=True,
+    backend=PLOT_BACKEND,
+    vector_formats=PLOT_VECTOR_FORMATS,
+    trace=False,
+):
+    """
+    Render and save a single region. Runs inside a worker process.
+
+    Returns the label, and the worker's stage records if `trace` is set.
+    """
+    if trace:
+        # Forked workers inherit the parent's records, which it already has
+        perf.enable()
+        perf.clear()
+
+    plotter = Plot(
+        plot_tables=plot_tables,
+        plot_params=PLOT_PARAMS,
+        backend=backend,
+        vector_formats=vector_formats,
+    )
+    plotter(plot_label=plot_label, save_plot=save_plot, print_plot=False)
+
+    return plot_label, perf.records() if trace else []
+
+
+def tracking_counties(
+    print_plot=True,
+    save_plot=True,
+    workers=1,
+    force=True,
+    backend=PLOT_BACKEND,
+    vector_formats=PLOT_VECTOR_FORMATS,
+    plot_labels=None,
+):
+    """
+    Regenerate the static plots.
+
+    Parameters
+    ----------
+    print_plot : bool, optional
+        Display each plot after rendering. Only honored when rendering
+        sequentially (workers=1).
+    save_plot : bool, optional
+        Save each plot to data/plots/.
+    workers : int or None, optional
+        Number of worker processes. 1 renders sequentially in this process,
+        None uses one worker per CPU (capped at the number of plots).
+    force : bool, optional
+        Render every plot. If False, only plots whose inputs changed since
+        the render manifest was last written are rendered.
+    backend : str, optional
+        Renderer, one of PLOT_BACKENDS.
+    vector_formats : list of str, optional
+        Vector copies ("svg", "pdf") to save next to each PNG.
+    plot_labels : list of str, optional
+        Regions to consider, by default every region in PLOT_REGIONS. Only
+        these regions' tables are built.
+    """
     # Import datasets
     df_visit_county, gdf_county, gdf_state = import_data()
 
@@ -19,21 +131,156 @@ def tracking_counties(print_plot=True, save_plot=True):
         df_visited=df_visit_county, gdf_county=gdf_county, gdf_state=gdf_state
     )
 
-    # Convert datasets to plot specific data
-    dct_plot = generate_plot_data(
-        gdf_county,
-        gdf_state,
-        non_contiguous_codes=NON_CONTIGUOUS_CODES,
-        epsg_code=EPSG_CODE,
+    # Convert datasets to plot specific data. Regions are only built when
+    # rendered, so regions that are up to date never build their geometry.
+    dct_plot = generate_plot_data(gdf_county, gdf_state)
+
+    # Hash the inputs of every plot and skip the ones already rendered from
+    # the same inputs.
+    dct_hash = {
+        plot_label: plot_input_hash(
+            dct_plot.visit_rows(plot_label),
+            plot_label,
+            PLOT_PARAMS,
+            PLOT_DPI,
+            dct_plot.geometry_key(plot_label),
+            backend,
+        )
+        for plot_label in plot_labels or PLOT_REGIONS
+    }
+
+    manifest = load_manifest()
+
+    if force:
+        plot_labels = list(dct_hash.keys())
+    else:
+        plot_labels = stale_labels(dct_hash, manifest, vector_formats)
+
+    if not plot_labels:
+        print("All plots are up to date.")
+        return
+
+    render(
+        dct_plot, plot_labels, print_plot, save_plot, workers, backend, vector_formats
+    )
+
+    if save_plot:
+        manifest.update(
+            {plot_label: dct_hash[plot_label] for plot_label in plot_labels}
+        )
+        save_manifest(manifest)
+
+
+def render(
+    dct_plot,
+    plot_labels,
+    print_plot,
+    save_plot,
+    workers,
+    backend=PLOT_BACKEND,
+    vector_formats=PLOT_VECTOR_FORMATS,
+):
+    """Render the given plots sequentially or across a process pool."""
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = max(1, min(workers, len(plot_labels)))
+
+    if workers == 1:
+        # Initialize plotter
+        plotter = Plot(
+            plot_tables=dct_plot,
+            plot_params=PLOT_PARAMS,
+            backend=backend,
+            vector_formats=vector_formats,
+        )
+
+        # Generate plots
+        for plot_label in plot_labels:
+            plotter(plot_label=plot_label, save_plot=save_plot, print_plot=print_plot)
+
+        return
+
+    # Each task only receives the tables of its own region, so the national
+    # layers are never pickled and each region is sent to a worker once.
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(
+                render_region,
+                region_tables(dct_plot, plot_label),
+                plot_label,
+                save_plot,
+                backend,
+                vector_formats,
+                perf.is_enabled(),
+            )
+            for plot_label in plot_labels
+        ]
+
+        for future in futures:
+            plot_label, stage_records = future.result()
+            perf.add_records(stage_records)
+            print(f"Rendered {plot_label}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Regenerate the static plots.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Worker processes for rendering (default: one per CPU, 1 = sequential).",
+    )
+    parser.add_argument(
+        "--region",
+        nargs="*",
+        choices=list(PLOT_REGIONS),
+        default=None,
+        help="Regions to render (default: all).",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-render every plot, even if its inputs are unchanged.",
     )
 
-    # Initialize plotter
-    plotter = Plot(plot_tables=dct_plot, plot_params=PLOT_PARAMS)
+    parser.add_argument(
+        "--backend",
+        choices=PLOT_BACKENDS,
+        default=PLOT_BACKEND,
+        help=f"Plot renderer (default: {PLOT_BACKEND}).",
+    )
+    parser.add_argument(
+        "--vector",
+        nargs="*",
+        choices=["svg", "pdf"],
+        default=PLOT_VECTOR_FORMATS,
+        help="Vector formats to save alongside each PNG (e.g. --vector svg pdf).",
+    )
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        default=None,
+        help="Record stage timings and memory, and write them to this JSON file.",
+    )
 
-    # Generate plots
-    for plot_label in dct_plot["county"].keys():
-        plotter(plot_label=plot_label, save_plot=save_plot, print_plot=print_plot)
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
-    tracking_counties()
+    args = parse_args()
+
+    if args.trace is not None:
+        perf.enable()
+
+    with perf.stage("generate_plots"):
+        tracking_counties(
+            workers=args.workers,
+            force=args.force,
+            backend=args.backend,
+            vector_formats=args.vector,
+            plot_labels=args.region,
+        )
+
+    if args.trace is not None:
+        perf.write_trace(args.trace)
+        print(f"Wrote trace to {args.trace}")
@@ -0,0 +1,115 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import argparse
+from pathlib import Path
+
+from config import (
+    PLOT_PARAMS,
+    PLOT_REGIONS,
+    TIMELINE_DPI,
+    TIMELINE_FPS,
+    TIMELINE_HOLD_SECONDS,
+)
+from paths import TIMELINE_DIR
+from scripts.data import import_data
+from scripts.plotting import generate_plot_data
+from scripts.processing import process_data
+from scripts.timeline import Timeline
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def generate_timeline(
+    plot_label,
+    output,
+    freq=None,
+    fps=TIMELINE_FPS,
+    dpi=TIMELINE_DPI,
+    hold=TIMELINE_HOLD_SECONDS,
+):
+    """
+    Render the cumulative-visit timeline of one region.
+
+    Parameters
+    ----------
+    plot_label : str
+        Region to animate, one of the static plot regions.
+    output : path-like
+        A .gif or .mp4 file, or a directory for PNG frames.
+    freq : str, optional
+        pandas period frequency to group visits into frames by.
+    fps : int, optional
+    dpi : int, optional
+    hold : float, optional
+        Seconds the last frame is held.
+    """
+    # Import and process datasets, as for the static plots
+    df_visit_county, gdf_county, gdf_state = import_data()
+    gdf_county, gdf_state = process_data(
+        df_visited=df_visit_county, gdf_county=gdf_county, gdf_state=gdf_state
+    )
+    dct_plot = generate_plot_data(gdf_county, gdf_state)
+
+    timeline = Timeline(
+        plot_tables=dct_plot,
+        plot_params=PLOT_PARAMS,
+        plot_label=plot_label,
+        dpi=dpi,
+        freq=freq,
+    )
+    try:
+        timeline.save(output, fps=fps, hold=hold)
+    finally:
+        timeline.close()
+
+    print(f"Wrote {len(timeline)} frames to {output}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Animate the counties visited over time for one region."
+    )
+    parser.add_argument(
+        "--region",
+        choices=list(PLOT_REGIONS),
+        default="us_inset",
+        help="Region to animate (default: us_inset).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help=(
+            "A .gif or .mp4 file, or a directory for PNG frames "
+            f"(default: {TIMELINE_DIR.name}/<region>.gif)."
+        ),
+    )
+    parser.add_argument(
+        "--freq",
+        default=None,
+        help="Group visits into one frame per period, e.g. W, M or Y "
+        "(default: one frame per visit date).",
+    )
+    parser.add_argument("--fps", type=int, default=TIMELINE_FPS)
+    parser.add_argument("--dpi", type=int, default=TIMELINE_DPI)
+    parser.add_argument(
+        "--hold",
+        type=float,
+        default=TIMELINE_HOLD_SECONDS,
+        help="Seconds the last frame is held.",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    generate_timeline(
+        plot_label=args.region,
+        output=args.output or TIMELINE_DIR / f"{args.region}.gif",
+        freq=args.freq,
+        fps=args.fps,
+        dpi=args.dpi,
+        hold=args.hold,
+    )
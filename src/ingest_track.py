@@ -0,0 +1,53 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import argparse
+
+from config import TRACK_TIMEZONE
+from scripts.tracks import ingest_tracks
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def report(result, dry_run=False):
+    """Print the counties each track passed through and the visits added."""
+    for track, df_first in result["counties"].items():
+        print(f"{track}: {len(df_first)} counties, {df_first['points'].sum()} points")
+
+    df_added = result["added"]
+    verb = "Would add" if dry_run else "Added"
+    print(f"{verb} {len(df_added)} first visits")
+    for row in df_added.itertuples():
+        print(f"  {row.date}  {row.county_name}, {row.state} ({row.county_code})")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Record first county visits from GPX or CSV GPS tracks."
+    )
+    parser.add_argument("tracks", nargs="+", help="GPX or CSV track files.")
+    parser.add_argument(
+        "--note",
+        default=None,
+        help="Note recorded with each new visit (default: the track file name).",
+    )
+    parser.add_argument(
+        "--timezone",
+        default=TRACK_TIMEZONE,
+        help=f"Timezone for visit dates (default: {TRACK_TIMEZONE}).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the changes without writing the table.",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = ingest_tracks(
+        args.tracks, note=args.note, timezone=args.timezone, dry_run=args.dry_run
+    )
+    report(result, dry_run=args.dry_run)
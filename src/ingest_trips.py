@@ -0,0 +1,47 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import argparse
+
+from scripts.trips import ingest_trips
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def report(result, dry_run=False):
+    """Print the trips read, counties added and entries that did not resolve."""
+    print(f"Trip files read: {len(result['applied'])}")
+
+    df_added = result["added"]
+    verb = "Would add" if dry_run else "Added"
+    print(f"{verb} {len(df_added)} first visits")
+    for row in df_added.itertuples():
+        print(f"  {row.date}  {row.county_name}, {row.state} ({row.county_code})")
+
+    for trip, problems in result["unresolved"].items():
+        print(f"Unresolved in {trip} (not marked applied):")
+        for problem in problems:
+            print(f"  {problem}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Apply data/trips files to the county visit table."
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-read trip files that were already applied.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report the changes without writing the table.",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report(ingest_trips(force=args.force, dry_run=args.dry_run), dry_run=args.dry_run)
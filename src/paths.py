@@ -1,4 +1,13 @@
+import os
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
+
+# The boundary store can be pointed elsewhere, e.g. at a fixture store for
+# offline benchmark runs.
+SHAPEFILE_DIR = Path(
+    os.environ.get("TRACKINGCOUNTIES_SHAPEFILE_DIR", DATA_DIR / "shapefiles")
+)
+CACHE_DIR = DATA_DIR / "cache"
+TIMELINE_DIR = DATA_DIR / "timelines"
@@ -0,0 +1,96 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import argparse
+import datetime as dt
+import re
+from pathlib import Path
+
+from config import PLANNER_KM_PER_DAY
+from scripts.data import import_data_visit_text
+from scripts.planner import PLANNED_TRIP_DIR, TripPlanner, format_trip_file
+from scripts.shared_data import load_county_graph, load_data
+from scripts.trips import build_name_index, resolve_county
+from scripts.visit_log import county_keys
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def plan_trip(county, days, start_date, km_per_day=PLANNER_KM_PER_DAY):
+    """
+    Plan a trip from a county given as "Name, ST" that covers the most new counties.
+
+    Returns the route from TripPlanner.plan and the trip file text.
+    """
+    county_name, _, state = county.rpartition(",")
+
+    df = import_data_visit_text()
+    row = resolve_county(build_name_index(df), county_name.strip(), state.strip())
+    if row is None:
+        raise SystemExit(f"Unknown county: {county}")
+    start = county_keys(df)[row]
+
+    _, counties, _ = load_data()
+    visited = counties["geoid"][counties["visited"] == 1]
+
+    planner = TripPlanner(load_county_graph(), km_per_day=km_per_day)
+    df_route = planner.plan(start, visited, days)
+
+    n_new = int(df_route["new"].sum())
+    km = df_route["total_km"].iloc[-1]
+    origin = f"{df.at[row, 'county_name']}, {df.at[row, 'state']}"
+    summary = [
+        f"Planned {days}-day road trip from {origin}",
+        f"About {km:,.0f} km, {n_new} new counties",
+    ]
+
+    return df_route, format_trip_file(df_route, df, start_date, summary)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Plan a road trip that picks up as many new counties as possible."
+    )
+    parser.add_argument("county", help='Start county and state, e.g. "Wake, NC".')
+    parser.add_argument("--days", type=int, default=3, help="Driving days.")
+    parser.add_argument(
+        "--start-date",
+        type=dt.date.fromisoformat,
+        default=dt.date.today(),
+        help="First day of the trip, YYYY-MM-DD (default: today).",
+    )
+    parser.add_argument(
+        "--km-per-day",
+        type=float,
+        default=PLANNER_KM_PER_DAY,
+        help=f"Road km driven per day (default: {PLANNER_KM_PER_DAY}).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Trip file to write (default: data/trips/planned/<date>__<county>.md).",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    df_route, text = plan_trip(
+        args.county, args.days, args.start_date, km_per_day=args.km_per_day
+    )
+
+    output = args.output
+    if output is None:
+        slug = re.sub(r"[^a-z0-9]+", "_", args.county.lower()).strip("_")
+        output = PLANNED_TRIP_DIR / f"{args.start_date:%Y-%m-%d}__{slug}.md"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(text, encoding="utf-8")
+
+    print(
+        f"{len(df_route)} counties over {df_route['day'].max() + 1} days, "
+        f"{df_route['new'].sum()} new, {df_route['total_km'].iloc[-1]:,.0f} km"
+    )
+    print(f"Wrote {output}")
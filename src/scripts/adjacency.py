@@ -0,0 +1,294 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from config import (
+    ADJACENCY_CRS,
+    ADJACENCY_DISTANCE_KM,
+    BOUNDARY_STORE_VERSION,
+    BOUNDARY_YEAR,
+)
+from paths import CACHE_DIR
+from scripts.data import import_shapefiles
+from scripts.perf import traced
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Bump when the saved graph layout changes, so graphs from older code are rebuilt
+ADJACENCY_CACHE_VERSION = 1
+
+# border: counties sharing a stretch of boundary, not just a corner point.
+# nearby: counties whose boundaries are within ADJACENCY_DISTANCE_KM.
+RELATIONS = ["border", "nearby"]
+
+# DE-9IM pattern of two counties whose boundaries overlap along a line
+SHARED_BORDER = "****1****"
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def adjacency_key(crs=ADJACENCY_CRS, distance_km=ADJACENCY_DISTANCE_KM):
+    """Hash the boundary vintage and the neighbour definitions."""
+    definition = {
+        "cache_version": ADJACENCY_CACHE_VERSION,
+        "boundary_year": BOUNDARY_YEAR,
+        "boundary_store_version": BOUNDARY_STORE_VERSION,
+        "crs": crs,
+        "distance_km": distance_km,
+    }
+    payload = json.dumps(definition, sort_keys=True).encode()
+
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def haversine_km(lon1, lat1, lon2, lat2):
+    """Great-circle distance between points given in radians."""
+    haversine = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(haversine))
+
+
+def _csr(left, right, n):
+    """
+    Compressed sparse rows of symmetric pairs.
+
+    The neighbours of county i are indices[indptr[i] : indptr[i + 1]].
+    """
+    left, right = np.concatenate([left, right]), np.concatenate([right, left])
+    order = np.lexsort((right, left))
+
+    indptr = np.searchsorted(left[order], np.arange(n + 1))
+    return indptr.astype(np.int64), right[order].astype(np.int64)
+
+
+class CountyGraph:
+    """
+    Shared-border and within-distance neighbours of every county.
+
+    Counties are sorted by geoid, and each relation in RELATIONS is stored in
+    compressed sparse row form, so a county's neighbours are one slice and a
+    frontier is one pass over the edge arrays. Centroids are kept as
+    longitude/latitude for nearest-county queries. Built once per boundary
+    vintage by build, then saved and loaded as .npz.
+
+    Parameters
+    ----------
+    geoids : array-like of str
+        County geoids, sorted.
+    lon, lat : array-like of float
+        Centroid of each county, in degrees.
+    relations : dict
+        (indptr, indices) arrays for each relation in RELATIONS.
+    """
+
+    def __init__(self, geoids, lon, lat, relations):
+        self.geoids = np.asarray(geoids, dtype=object)
+        self._index = pd.Index(self.geoids)
+        self._lon = np.radians(lon)
+        self._lat = np.radians(lat)
+        self._relations = relations
+
+        # Row of each edge, to map a mask over counties onto the edges
+        self._edge_rows = {
+            relation: np.repeat(np.arange(len(self.geoids)), np.diff(indptr))
+            for relation, (indptr, _) in relations.items()
+        }
+
+    def __len__(self):
+        return len(self.geoids)
+
+    @classmethod
+    @traced()
+    def build(cls, gdf_county, crs=ADJACENCY_CRS, distance_km=ADJACENCY_DISTANCE_KM):
+        """
+        Compute the graph from a county layer with an STRtree.
+
+        Parameters
+        ----------
+        gdf_county : geopandas.GeoDataFrame
+            County layer with geoid and geometry, e.g. from import_shapefiles.
+        crs : str, optional
+            Projected CRS, in meters, the distances are measured in.
+        distance_km : float, optional
+            Boundary distance within which counties are "nearby".
+        """
+        gdf = gdf_county[["geoid", "geometry"]].sort_values("geoid")
+        n = len(gdf)
+
+        # Borders are found in the layer's own coordinates, where neighbouring
+        # counties share the same vertices. A pair shares a border when their
+        # boundaries overlap along a line, rather than only at a corner point.
+        geometries = gdf.geometry.to_numpy()
+        left, right = shapely.STRtree(geometries).query(
+            geometries, predicate="intersects"
+        )
+        left, right = left[left < right], right[left < right]
+        shared = shapely.relate_pattern(
+            geometries[left], geometries[right], SHARED_BORDER
+        )
+
+        # Distances are measured after projecting to meters
+        gdf = gdf.to_crs(crs)
+        geometries = gdf.geometry.to_numpy()
+        near_left, near_right = shapely.STRtree(geometries).query(
+            geometries, predicate="dwithin", distance=distance_km * 1000
+        )
+        pair = near_left < near_right
+
+        centroids = gdf.geometry.centroid.to_crs("EPSG:4326")
+
+        return cls(
+            gdf["geoid"].to_numpy(),
+            centroids.x.to_numpy(),
+            centroids.y.to_numpy(),
+            {
+                "border": _csr(left[shared], right[shared], n),
+                "nearby": _csr(near_left[pair], near_right[pair], n),
+            },
+        )
+
+    def save(self, path):
+        """Write the graph to a compressed .npz file."""
+        arrays = {
+            f"{relation}_{name}": array
+            for relation, (indptr, indices) in self._relations.items()
+            for name, array in [("indptr", indptr), ("indices", indices)]
+        }
+        np.savez_compressed(
+            path,
+            geoids=self.geoids.astype(str),
+            lon=np.degrees(self._lon),
+            lat=np.degrees(self._lat),
+            **arrays,
+        )
+
+    @classmethod
+    def load(cls, path):
+        """Read a graph written by save."""
+        with np.load(path) as saved:
+            return cls(
+                saved["geoids"],
+                saved["lon"],
+                saved["lat"],
+                {
+                    relation: (
+                        saved[f"{relation}_indptr"],
+                        saved[f"{relation}_indices"],
+                    )
+                    for relation in RELATIONS
+                },
+            )
+
+    def mask(self, geoids):
+        """Boolean mask over the graph's counties. Unknown geoids are ignored."""
+        rows = self._index.get_indexer(pd.Index(geoids))
+
+        mask = np.zeros(len(self.geoids), dtype=bool)
+        mask[rows[rows >= 0]] = True
+        return mask
+
+    def edges(self, relation="border"):
+        """Return the (indptr, indices) arrays of a relation, over row positions."""
+        return self._relations[relation]
+
+    def distance_km(self, rows, other_rows):
+        """Great-circle distance between the centroids of two sets of rows."""
+        return haversine_km(
+            self._lon[rows],
+            self._lat[rows],
+            self._lon[other_rows],
+            self._lat[other_rows],
+        )
+
+    def neighbours(self, geoid, relation="border"):
+        """
+        Return the geoids of a county's neighbours.
+
+        Raises
+        ------
+        KeyError
+            If the county is not in the graph.
+        """
+        row = self._index.get_loc(geoid)
+        indptr, indices = self._relations[relation]
+
+        return self.geoids[indices[indptr[row] : indptr[row + 1]]]
+
+    def frontier(self, visited, relation="border"):
+        """
+        Return the unvisited counties next to a visited one.
+
+        Parameters
+        ----------
+        visited : array-like of str
+            Geoids of the visited counties.
+        relation : {"border", "nearby"}, optional
+
+        Returns
+        -------
+        numpy.ndarray
+            Geoids, sorted.
+        """
+        visited = self.mask(visited)
+        _, indices = self._relations[relation]
+
+        frontier = np.zeros(len(self.geoids), dtype=bool)
+        frontier[indices[visited[self._edge_rows[relation]]]] = True
+
+        return self.geoids[frontier & ~visited]
+
+    def nearest(self, lon, lat, k=10, exclude=()):
+        """
+        Return the k counties with the closest centroids to a point.
+
+        Parameters
+        ----------
+        lon, lat : float
+            Point, in degrees.
+        k : int, optional
+        exclude : array-like of str, optional
+            Geoids to leave out, e.g. the visited counties.
+
+        Returns
+        -------
+        pandas.DataFrame
+            geoid and great-circle distance_km, nearest first.
+        """
+        distance = haversine_km(np.radians(lon), np.radians(lat), self._lon, self._lat)
+
+        rows = np.flatnonzero(~self.mask(exclude))
+        k = min(k, len(rows))
+        rows = rows[np.argpartition(distance[rows], k - 1)[:k]] if k else rows
+        rows = rows[np.argsort(distance[rows], kind="stable")]
+
+        return pd.DataFrame({"geoid": self.geoids[rows], "distance_km": distance[rows]})
+
+
+def import_county_graph(gdf_county=None, use_cache=True):
+    """
+    Return the county graph of the current boundary vintage.
+
+    The graph is read from data/cache/adjacency/, or built from `gdf_county`
+    (by default the layer from import_shapefiles) and saved there.
+    """
+    path = CACHE_DIR / "adjacency" / f"{adjacency_key()}.npz"
+    if use_cache and path.exists():
+        return CountyGraph.load(path)
+
+    if gdf_county is None:
+        gdf_county, _ = import_shapefiles()
+    graph = CountyGraph.build(gdf_county)
+
+    if use_cache:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        graph.save(path)
+
+    return graph
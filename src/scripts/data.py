@@ -1,17 +1,42 @@
 # ---------------------------------------------------------------------------- #
 # IMPORT #
+import datetime as dt
+import json
+
+import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pygris
 
-from paths import DATA_DIR
+from config import (
+    BOUNDARY_COLUMNS,
+    BOUNDARY_STORE_VERSION,
+    BOUNDARY_YEAR,
+    INSET_REFERENCE,
+    MAP_DETAIL_LEVELS,
+    VISIT_LOG_COMPACT_EVENTS,
+)
+from paths import DATA_DIR, SHAPEFILE_DIR
+from scripts.mapping import simplify_layers
+from scripts.misc import write_text_atomic
+from scripts.perf import traced
+from scripts.visit_log import (
+    append_events,
+    apply_events,
+    load_snapshot_state,
+    pending_events,
+    read_events,
+    save_snapshot_state,
+)
 
 # ---------------------------------------------------------------------------- #
 # CLASSES / FUNCTIONS #
 
+VISIT_TABLE_PATH = DATA_DIR / "tables" / "list_of_counties_active.csv"
 
-def import_data_visit():
-    county_path = DATA_DIR / "tables" / "list_of_counties_active.csv"
 
+@traced()
+def import_data_visit(county_path=VISIT_TABLE_PATH):
     # Define column date types
     dct_dtypes = {
         "state_code": str,
@@ -28,19 +53,248 @@ def import_data_visit():
         dtype=dct_dtypes,
     )
 
+    # The CSV is a snapshot of the visit event log. Replay the events logged
+    # since it was last compacted.
+    if county_path == VISIT_TABLE_PATH:
+        df = apply_events(df, pending_events()[0], blank=np.nan)
+
     return df
 
 
-def import_shapefiles():
-    gdf_state = pygris.states(cb=True, year=2023, cache=True)
-    gdf_state.columns = [col.lower() for col in gdf_state.columns]
+def import_data_visit_text():
+    """Read the visit table with every field as text and blanks kept as ''."""
+    df = pd.read_csv(VISIT_TABLE_PATH, dtype=str, keep_default_na=False)
+
+    return apply_events(df, pending_events()[0])
+
+
+def export_data_visit(df):
+    """
+    Overwrite the visit table in one step, keeping its existing line endings.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Table in the layout returned by import_data_visit_text.
+    """
+    raw = VISIT_TABLE_PATH.read_bytes()
+    newline = "\r\n" if b"\r\n" in raw else "\n"
+
+    text = df.to_csv(index=False, lineterminator=newline)
+    if not raw.endswith(newline.encode()):
+        text = text.removesuffix(newline)
+
+    write_text_atomic(VISIT_TABLE_PATH, text, newline="")
+
+
+def compact_visit_log():
+    """
+    Fold the pending visit events into the visit table CSV.
+
+    The CSV is rewritten once and the snapshot state moves to the end of the
+    log, so later reads replay nothing until new events arrive.
+
+    Returns
+    -------
+    int
+        Number of events folded in.
+    """
+    df_events, end = read_events(load_snapshot_state()["log_bytes"])
+    if df_events.empty:
+        return 0
+
+    df = pd.read_csv(VISIT_TABLE_PATH, dtype=str, keep_default_na=False)
+    export_data_visit(apply_events(df, df_events))
+
+    save_snapshot_state(
+        {
+            "log_bytes": end,
+            "compacted_at": dt.datetime.now(dt.UTC).isoformat(timespec="seconds"),
+        }
+    )
+
+    return len(df_events)
+
+
+def record_visit_events(df_events, compact_after=VISIT_LOG_COMPACT_EVENTS):
+    """
+    Append visit events to the log, in place of rewriting the visit table.
+
+    The table is only rewritten, by compact_visit_log, once `compact_after`
+    events are pending.
+    """
+    if df_events.empty:
+        return
+
+    append_events(df_events)
+
+    if len(pending_events()[0]) >= compact_after:
+        compact_visit_log()
+
+
+def boundary_store_dir(year=BOUNDARY_YEAR):
+    """Return the directory holding the boundary store for a Census vintage."""
+    return SHAPEFILE_DIR / f"cb_{year}"
+
+
+def _normalize_layer(gdf, columns):
+    """Lowercase column names and keep only the columns used downstream."""
+    gdf.columns = [col.lower() for col in gdf.columns]
+    gdf = gdf[columns]
+
+    return gdf
+
+
+def fetch_shapefiles(year=BOUNDARY_YEAR):
+    """Download (or read from the pygris cache) the raw Census boundary layers."""
+    gdf_state = pygris.states(cb=True, year=year, cache=True)
+    gdf_state = _normalize_layer(gdf_state, BOUNDARY_COLUMNS["state"])
+
+    gdf_county = pygris.counties(cb=True, year=year, cache=True)
+    gdf_county = _normalize_layer(gdf_county, BOUNDARY_COLUMNS["county"])
+
+    return gdf_county, gdf_state
+
+
+def fetch_inset_reference():
+    """Download the state outlines shift_geometry positions the insets with."""
+    gdf = pygris.states(cb=True, cache=True, **INSET_REFERENCE)
+
+    return _normalize_layer(gdf, ["geoid", "geometry"])
+
 
-    gdf_county = pygris.counties(cb=True, year=2023, cache=True)
-    gdf_county.columns = [col.lower() for col in gdf_county.columns]
+def write_boundary_store(store_dir, gdf_county, gdf_state, gdf_reference, year):
+    """
+    Write normalized, column-pruned state and county layers to GeoParquet.
+
+    Alongside the full-resolution layers, a simplified copy of both layers is
+    written for every level in MAP_DETAIL_LEVELS, plus the INSET_REFERENCE
+    state outlines used for the inset plot. The manifest is written last,
+    so a store is only considered complete once every layer has been written.
+
+    Parameters
+    ----------
+    store_dir : pathlib.Path
+        Directory to write, e.g. boundary_store_dir(year).
+    gdf_county, gdf_state : geopandas.GeoDataFrame
+        Layers with the BOUNDARY_COLUMNS columns.
+    gdf_reference : geopandas.GeoDataFrame
+        INSET_REFERENCE state outlines, with geoid and geometry.
+    year : int
+        Census cartographic boundary vintage, recorded in the manifest.
+    """
+    store_dir.mkdir(parents=True, exist_ok=True)
+
+    gdf_state.to_parquet(store_dir / "state.parquet", index=False)
+    gdf_county.to_parquet(store_dir / "county.parquet", index=False)
+
+    for level, detail in MAP_DETAIL_LEVELS.items():
+        gdf_county_lod, gdf_state_lod = simplify_layers(
+            gdf_county, gdf_state, tolerance=detail["tolerance"]
+        )
+        gdf_state_lod.to_parquet(store_dir / f"state__{level}.parquet", index=False)
+        gdf_county_lod.to_parquet(store_dir / f"county__{level}.parquet", index=False)
+
+    gdf_reference.to_parquet(store_dir / "inset_reference.parquet", index=False)
+
+    manifest = {
+        "version": BOUNDARY_STORE_VERSION,
+        "year": year,
+        "columns": BOUNDARY_COLUMNS,
+        "detail_levels": MAP_DETAIL_LEVELS,
+        "inset_reference": INSET_REFERENCE,
+    }
+    with open(store_dir / "manifest.json", "w") as f:
+        json.dump(manifest, f, indent=4)
+
+
+def build_boundary_store(year=BOUNDARY_YEAR):
+    """
+    Download the Census boundary layers and write them as the boundary store.
+
+    Parameters
+    ----------
+    year : int, optional
+        Census cartographic boundary vintage. Defaults to BOUNDARY_YEAR.
+
+    Returns
+    -------
+    pathlib.Path
+        Directory containing the boundary store.
+    """
+    store_dir = boundary_store_dir(year)
+
+    gdf_county, gdf_state = fetch_shapefiles(year=year)
+    write_boundary_store(
+        store_dir, gdf_county, gdf_state, fetch_inset_reference(), year
+    )
+
+    return store_dir
+
+
+def boundary_store_is_current(year=BOUNDARY_YEAR):
+    """Return True if a complete store matching the current layout exists."""
+    manifest_path = boundary_store_dir(year) / "manifest.json"
+
+    if not manifest_path.exists():
+        return False
+
+    with open(manifest_path, "r") as f:
+        manifest = json.load(f)
+
+    return (
+        manifest.get("version") == BOUNDARY_STORE_VERSION
+        and manifest.get("columns") == BOUNDARY_COLUMNS
+        and manifest.get("detail_levels") == MAP_DETAIL_LEVELS
+        and manifest.get("inset_reference") == INSET_REFERENCE
+    )
+
+
+def _read_store(suffix, year):
+    # Build the store on first use so a fresh checkout still works. Every
+    # later call reads the local GeoParquet files and needs no network access.
+    if not boundary_store_is_current(year):
+        build_boundary_store(year)
+
+    store_dir = boundary_store_dir(year)
+
+    gdf_state = gpd.read_parquet(
+        store_dir / f"state{suffix}.parquet", columns=BOUNDARY_COLUMNS["state"]
+    )
+    gdf_county = gpd.read_parquet(
+        store_dir / f"county{suffix}.parquet", columns=BOUNDARY_COLUMNS["county"]
+    )
 
     return gdf_county, gdf_state
 
 
+@traced()
+def import_shapefiles(use_store=True, year=BOUNDARY_YEAR):
+    if not use_store:
+        return fetch_shapefiles(year=year)
+
+    return _read_store("", year)
+
+
+@traced(attrs=("level",))
+def import_map_layers(level, year=BOUNDARY_YEAR):
+    """Return the simplified county and state layers for a map detail level."""
+    if level not in MAP_DETAIL_LEVELS:
+        raise ValueError(
+            f"Unknown detail level '{level}'. Expected one of {list(MAP_DETAIL_LEVELS)}."
+        )
+
+    return _read_store(f"__{level}", year)
+
+
+def import_inset_reference(year=BOUNDARY_YEAR):
+    """Return the stored INSET_REFERENCE state outlines."""
+    if not boundary_store_is_current(year):
+        build_boundary_store(year)
+
+    return gpd.read_parquet(boundary_store_dir(year) / "inset_reference.parquet")
+
+
 def import_data():
     # County Visit Data
     df_visit_county = import_data_visit()
@@ -0,0 +1,571 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import datetime as dt
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from paths import CACHE_DIR, DATA_DIR
+from scripts.data import VISIT_TABLE_PATH
+from scripts.misc import write_text_atomic
+from scripts.visit_log import (
+    VISIT_LOG_PATH,
+    county_keys,
+    load_snapshot_state,
+    read_events,
+)
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+ARCHIVE_DIR = DATA_DIR / "tables" / "archive"
+ARCHIVE_PREFIX = "list_of_counties_active_"
+
+# Saved histories, extended with the events logged since instead of rebuilt
+HISTORY_CACHE_DIR = CACHE_DIR / "history"
+
+# Bump when the saved layout changes, so histories saved by older code are rebuilt
+HISTORY_CACHE_VERSION = 1
+
+# Columns of a historical visit table, in the layout of import_data_visit_text
+HISTORY_COLUMNS = [
+    "state",
+    "state_code",
+    "state_name",
+    "county_code",
+    "county_name",
+    "date",
+    "notes",
+]
+IDENTITY_COLUMNS = HISTORY_COLUMNS[:5]
+
+DIFF_COLUMNS = [
+    "state",
+    "state_name",
+    "county_name",
+    "geoid",
+    "change",
+    "date_before",
+    "date_after",
+    "notes_before",
+    "notes_after",
+]
+
+
+def _timestamp(when):
+    """Return `when` as a UTC Timestamp. Naive times are taken to be UTC."""
+    ts = pd.Timestamp(when)
+    return ts.tz_localize("UTC") if ts.tz is None else ts.tz_convert("UTC")
+
+
+class VisitHistory:
+    """
+    Successive visit tables, stored as row-level deltas.
+
+    Each version keeps only the rows that changed since the version before:
+    the county's full row when its date, notes or names changed, or a removal
+    when it left the table. Deltas are sorted by county and then version, so
+    the state of a county at any version is one binary search into its run of
+    deltas. as_of and diff cost one search per county whatever the number of
+    versions, and never build the tables in between.
+
+    Versions are added oldest first, as full tables with add_snapshot or as
+    visit log events with add_events.
+    """
+
+    def __init__(self):
+        self._times = []
+        self._sources = []
+        self._changes = []
+        self._deltas = []
+
+        # Table as of the newest version, indexed by county key
+        self._latest = pd.DataFrame(columns=HISTORY_COLUMNS, dtype=str)
+        self._index = None
+
+    def __len__(self):
+        return len(self._times)
+
+    @property
+    def versions(self):
+        """Return the time, source and number of changed rows of each version."""
+        return pd.DataFrame(
+            {
+                "recorded_at": pd.to_datetime(self._times, utc=True),
+                "source": self._sources,
+                "changes": self._changes,
+            }
+        )
+
+    def _add_versions(self, times, source, df_delta):
+        """
+        Append versions recorded at `times` and their delta rows.
+
+        df_delta is indexed by county key, with HISTORY_COLUMNS, present and
+        the position of its version among `times`.
+        """
+        times = np.array([_timestamp(t).value for t in times], dtype=np.int64)
+        if (np.diff(np.concatenate([self._times[-1:], times])) < 0).any():
+            raise ValueError(
+                f"Versions from {source} must be added oldest first, after the "
+                "versions already stored."
+            )
+
+        first = len(self._times)
+        self._deltas.append(
+            df_delta.rename_axis("key")
+            .reset_index()
+            .assign(version=first + df_delta["version"].to_numpy())
+        )
+        self._times.extend(times.tolist())
+        self._sources.extend([source] * len(times))
+        self._changes.extend(
+            np.bincount(df_delta["version"], minlength=len(times)).tolist()
+        )
+        self._index = None
+
+    def add_snapshot(self, df, recorded_at, source="snapshot"):
+        """
+        Add a full visit table as a new version.
+
+        Parameters
+        ----------
+        df : pandas.DataFrame
+            Table in the layout of import_data_visit_text. Missing columns,
+            e.g. notes in older archived tables, are read as blank.
+        recorded_at : datetime-like
+            Time the table was saved.
+        source : str, optional
+            Label kept with the version.
+        """
+        df = df.reindex(columns=HISTORY_COLUMNS, fill_value="").fillna("")
+        df = df.set_axis(county_keys(df).to_numpy())
+
+        changed = (self._latest.reindex(df.index) != df).any(axis=1)
+        removed = self._latest.index.difference(df.index)
+
+        df_delta = pd.concat(
+            [
+                df[changed].assign(present=True),
+                self._latest.loc[removed].assign(present=False, date="", notes=""),
+            ]
+        )
+        self._add_versions([recorded_at], source, df_delta.assign(version=0))
+        self._latest = df
+
+    def add_events(self, df_events, source="visit log", names=None):
+        """
+        Add visit log events, one version per distinct recorded_at.
+
+        Parameters
+        ----------
+        df_events : pandas.DataFrame
+            Events in log order.
+        source : str, optional
+            Label kept with the versions.
+        names : pandas.DataFrame, optional
+            Table to take the names of counties not in the history yet from.
+            They join the table, with no visit, just before their first event.
+
+        Raises
+        ------
+        KeyError
+            If an event refers to a county in neither the table nor `names`.
+        """
+        if df_events.empty:
+            return
+
+        df_events = df_events.assign(key=county_keys(df_events).to_numpy())
+        unknown = ~df_events["key"].isin(self._latest.index)
+        if unknown.any() and names is not None:
+            df_names = names.set_axis(county_keys(names).to_numpy())
+            df_names = df_names.reindex(columns=HISTORY_COLUMNS, fill_value="")
+            df_joined = df_names.loc[
+                df_names.index.intersection(df_events["key"][unknown])
+            ].assign(date="", notes="")
+            self._latest = pd.concat([self._latest, df_joined])
+            unknown = ~df_events["key"].isin(self._latest.index)
+
+        if unknown.any():
+            raise KeyError(
+                f"Events for unknown counties: {list(df_events['key'][unknown])}"
+            )
+
+        # Each event is compared with the county's previous event, or with the
+        # table before the first, to keep only the ones that change something
+        versions, times = pd.factorize(df_events["recorded_at"])
+        df = (
+            df_events.assign(version=versions)
+            .drop_duplicates(["version", "key"], keep="last")
+            .sort_values(["key", "version"], kind="stable")
+        )
+        first = ~df["key"].duplicated()
+
+        changed = pd.Series(False, index=df.index)
+        for column in ["date", "notes"]:
+            previous = df.groupby("key")[column].shift()
+            previous[first] = self._latest.loc[df["key"][first], column].to_numpy()
+            changed |= df[column] != previous
+        df = df[changed]
+
+        df_delta = self._latest.loc[df["key"], IDENTITY_COLUMNS].assign(
+            date=df["date"].to_numpy(),
+            notes=df["notes"].to_numpy(),
+            present=True,
+            version=df["version"].to_numpy(),
+        )
+        self._add_versions(times, source, df_delta)
+
+        df_last = df.drop_duplicates("key", keep="last")
+        self._latest.loc[df_last["key"], ["date", "notes"]] = df_last[
+            ["date", "notes"]
+        ].to_numpy()
+
+    def _deltas_frame(self):
+        """Return every delta row as one frame, in the order they were added."""
+        if not self._deltas:
+            columns = ["key", *HISTORY_COLUMNS, "present", "version"]
+            self._deltas = [pd.DataFrame(columns=columns)]
+        elif len(self._deltas) > 1:
+            self._deltas = [pd.concat(self._deltas, ignore_index=True)]
+
+        return self._deltas[0]
+
+    def save(self, cache_dir, manifest):
+        """
+        Write the history to `cache_dir`, with a manifest for load to check.
+
+        The deltas and the newest table go to Parquet files named after a hash
+        of the manifest, and manifest.json is replaced last to point at them.
+        Readers, in this process or another, see the previous save or this one.
+
+        Parameters
+        ----------
+        cache_dir : pathlib.Path
+        manifest : dict
+            JSON-serializable description of what the history was built from.
+        """
+        cache_dir.mkdir(parents=True, exist_ok=True)
+
+        manifest = {
+            **manifest,
+            "times": self._times,
+            "sources": self._sources,
+            "changes": self._changes,
+        }
+        payload = json.dumps(manifest, sort_keys=True)
+        name = hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+        for part, df in [("deltas", self._deltas_frame()), ("latest", self._latest)]:
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            os.close(fd)
+            try:
+                df.to_parquet(tmp_path)
+                os.replace(tmp_path, cache_dir / f"{name}__{part}.parquet")
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+
+        write_text_atomic(
+            cache_dir / "manifest.json", json.dumps({**manifest, "name": name})
+        )
+
+        for path in cache_dir.glob("*__*.parquet"):
+            if not path.name.startswith(f"{name}__"):
+                path.unlink(missing_ok=True)
+
+    @classmethod
+    def load(cls, cache_dir):
+        """
+        Read a history written by save.
+
+        Returns
+        -------
+        tuple of (VisitHistory, dict)
+            The history and the manifest it was saved with, or (None, None)
+            if nothing complete is saved.
+        """
+        try:
+            manifest = json.loads((cache_dir / "manifest.json").read_text())
+            name = manifest["name"]
+            df_deltas = pd.read_parquet(cache_dir / f"{name}__deltas.parquet")
+            df_latest = pd.read_parquet(cache_dir / f"{name}__latest.parquet")
+        except (FileNotFoundError, KeyError, json.JSONDecodeError):
+            return None, None
+
+        history = cls()
+        history._times = manifest["times"]
+        history._sources = manifest["sources"]
+        history._changes = manifest["changes"]
+        history._deltas = [df_deltas]
+        history._latest = df_latest
+
+        return history, manifest
+
+    def _build_index(self):
+        """Sort the deltas by county and version, as one searchable array."""
+        df = pd.concat(self._deltas, ignore_index=True)
+
+        # Counties in the newest table first, in its order, then counties that
+        # have since left the table
+        keys = self._latest.index
+        keys = keys.append(pd.Index(np.sort(df["key"][~df["key"].isin(keys)].unique())))
+        codes = keys.get_indexer(df["key"])
+
+        n_versions = len(self._times)
+        order = np.lexsort((df["version"].to_numpy(), codes))
+        df = df.iloc[order].reset_index(drop=True)
+
+        # Names of every county, with no visit: the newest row of counties still
+        # in the table, and the last row of the others
+        df_blank = (
+            pd.concat([self._latest, df[df["present"]].iloc[::-1].set_index("key")])
+            .groupby(level=0, sort=False)
+            .head(1)
+            .reindex(keys)
+            .assign(date="", notes="")
+        )
+
+        self._index = {
+            "keys": keys,
+            "n_current": len(self._latest),
+            "composite": codes[order].astype(np.int64) * n_versions
+            + df["version"].to_numpy(),
+            "present": df["present"].to_numpy(),
+            "columns": {column: df[column].to_numpy() for column in HISTORY_COLUMNS},
+            "blank": {
+                column: df_blank[column].to_numpy() for column in HISTORY_COLUMNS
+            },
+        }
+
+        return self._index
+
+    def version_at(self, when):
+        """
+        Return the newest version recorded at or before `when`, or -1.
+
+        A date without a time includes the whole day.
+        """
+        if isinstance(when, dt.date) and not isinstance(when, dt.datetime):
+            end = _timestamp(when) + pd.Timedelta(days=1)
+            return int(np.searchsorted(self._times, end.value, side="left")) - 1
+
+        return int(np.searchsorted(self._times, _timestamp(when).value, "right")) - 1
+
+    def _positions(self, version):
+        """Delta row holding each county's state at `version`, -1 if none."""
+        index = self._index or self._build_index()
+        n_keys = len(index["keys"])
+        if version < 0:
+            return np.full(n_keys, -1)
+
+        composite = index["composite"]
+        codes = np.arange(n_keys)
+        targets = codes * len(self._times) + version
+        positions = np.searchsorted(composite, targets, side="right") - 1
+
+        found = positions >= 0
+        found[found] = composite[positions[found]] // len(self._times) == codes[found]
+        found[found] = index["present"][positions[found]]
+
+        return np.where(found, positions, -1)
+
+    def _values(self, positions, columns):
+        """Column values at the delta positions, with no visit where -1."""
+        index = self._index or self._build_index()
+        return {
+            column: np.where(
+                positions >= 0,
+                index["columns"][column][positions],
+                index["blank"][column],
+            )
+            for column in columns
+        }
+
+    def as_of(self, when, blank=""):
+        """
+        Return the visit table as it stood at `when`.
+
+        Counties in today's table that had not been added yet are kept, with no
+        visit, so every historical table joins onto the current boundaries.
+
+        Parameters
+        ----------
+        when : datetime-like
+            Time of the table. A date without a time includes the whole day.
+        blank : optional
+            Value for a missing date or note: "" for the layout of
+            import_data_visit_text, NaN for the layout read by
+            import_data_visit, which process_data expects.
+
+        Returns
+        -------
+        pandas.DataFrame
+        """
+        positions = self._positions(self.version_at(when))
+        index = self._index
+
+        keep = (np.arange(len(positions)) < index["n_current"]) | (positions >= 0)
+        df = pd.DataFrame(self._values(positions, HISTORY_COLUMNS))[keep]
+
+        for column in ["date", "notes"]:
+            df[column] = df[column].mask(df[column] == "", blank)
+
+        return df.reset_index(drop=True)
+
+    def diff(self, start, end):
+        """
+        Return the counties whose visit date or notes differ between two times.
+
+        change is "add" for a first visit, "remove" for a cleared visit and
+        "correct" for a changed date or note, matching the visit log actions.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per changed county, with DIFF_COLUMNS.
+        """
+        before = self._positions(self.version_at(start))
+        after = self._positions(self.version_at(end))
+
+        values_before = self._values(before, ["date", "notes"])
+        values_after = self._values(after, HISTORY_COLUMNS)
+
+        changed = (values_before["date"] != values_after["date"]) | (
+            values_before["notes"] != values_after["notes"]
+        )
+        date_before = values_before["date"][changed]
+        date_after = values_after["date"][changed]
+
+        # Names from the later table, or the earlier one for a county since removed
+        names = self._values(np.where(after >= 0, after, before), IDENTITY_COLUMNS)
+
+        return pd.DataFrame(
+            {
+                "state": names["state"][changed],
+                "state_name": names["state_name"][changed],
+                "county_name": names["county_name"][changed],
+                "geoid": self._index["keys"][changed],
+                "change": np.select(
+                    [date_before == "", date_after == ""], ["add", "remove"], "correct"
+                ),
+                "date_before": date_before,
+                "date_after": date_after,
+                "notes_before": values_before["notes"][changed],
+                "notes_after": values_after["notes"][changed],
+            },
+            columns=DIFF_COLUMNS,
+        )
+
+
+def archive_time(path):
+    """Return the time in an archived table's file name, taken to be UTC."""
+    return _timestamp(dt.datetime.fromisoformat(path.stem.removeprefix(ARCHIVE_PREFIX)))
+
+
+def _file_stamp(path):
+    stat = path.stat()
+    return [path.name, stat.st_size, stat.st_mtime_ns]
+
+
+def history_inputs():
+    """
+    Describe the files a saved history covers, other than the visit log.
+
+    A saved history is reused while these are unchanged. The log is only ever
+    appended to, so it is tracked by the byte offset read up to instead.
+    """
+    archive = sorted(ARCHIVE_DIR.glob(f"{ARCHIVE_PREFIX}*.csv"), key=archive_time)
+
+    return {
+        "version": HISTORY_CACHE_VERSION,
+        "archive": [_file_stamp(path) for path in archive],
+        "table": _file_stamp(VISIT_TABLE_PATH),
+        "snapshot": load_snapshot_state(),
+    }
+
+
+def _history_to_table(state):
+    """
+    Build the versions up to the visit table: the archived full tables, the
+    logged events already compacted into the visit table, and the table itself.
+
+    Also returns whether the table's time stamp is final. One taken from the
+    file time changes to the first event logged after it.
+    """
+    history = VisitHistory()
+
+    for path in sorted(ARCHIVE_DIR.glob(f"{ARCHIVE_PREFIX}*.csv"), key=archive_time):
+        history.add_snapshot(
+            pd.read_csv(path, dtype=str, keep_default_na=False),
+            archive_time(path),
+            source=path.name,
+        )
+
+    df_table = pd.read_csv(VISIT_TABLE_PATH, dtype=str, keep_default_na=False)
+
+    df_all, _ = read_events()
+    df_pending, _ = read_events(state["log_bytes"])
+    history.add_events(df_all.iloc[: len(df_all) - len(df_pending)], names=df_table)
+
+    if "compacted_at" in state:
+        table_time = state["compacted_at"]
+    elif not df_pending.empty:
+        table_time = df_pending["recorded_at"].iloc[0]
+    else:
+        table_time = dt.datetime.fromtimestamp(VISIT_TABLE_PATH.stat().st_mtime, dt.UTC)
+
+    history.add_snapshot(df_table, table_time, source=VISIT_TABLE_PATH.name)
+
+    return history, "compacted_at" in state or not df_pending.empty
+
+
+def load_visit_history(cache_dir=HISTORY_CACHE_DIR):
+    """
+    Return the visit history of the archive, the visit table and the visit log.
+
+    Versions are added oldest first: the archived full tables, the logged
+    events already compacted into the visit table, the visit table itself and
+    the events logged since. The visit table is stamped with its last
+    compaction. A table never compacted is the log's starting point, stamped
+    with the first logged event, or its file time if nothing is logged yet.
+
+    The history is saved to `cache_dir` with the log offset it covers. While
+    the archive, the visit table and its snapshot state are unchanged, the
+    saved history is read back and only the events logged after that offset
+    are added. A compaction or an edited table rebuilds it.
+
+    Returns
+    -------
+    VisitHistory
+    """
+    inputs = history_inputs()
+    log_size = VISIT_LOG_PATH.stat().st_size if VISIT_LOG_PATH.exists() else 0
+
+    history, manifest = VisitHistory.load(cache_dir)
+    if (
+        history is None
+        or manifest.get("inputs") != inputs
+        or manifest.get("log_bytes", log_size + 1) > log_size
+        or not (manifest.get("stamp_final") or manifest["log_bytes"] == log_size)
+    ):
+        history, stamp_final = _history_to_table(inputs["snapshot"])
+        log_bytes, manifest = inputs["snapshot"]["log_bytes"], None
+    else:
+        log_bytes, stamp_final = manifest["log_bytes"], manifest["stamp_final"]
+
+    df_events, log_end = read_events(log_bytes)
+    history.add_events(df_events)
+    stamp_final = stamp_final or not df_events.empty
+
+    if manifest is None or log_end != log_bytes:
+        history.save(
+            cache_dir,
+            {"inputs": inputs, "log_bytes": log_end, "stamp_final": stamp_final},
+        )
+
+    return history
@@ -0,0 +1,178 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import hashlib
+import json
+import math
+
+import geopandas as gpd
+import pandas as pd
+
+from config import BOUNDARY_STORE_VERSION, BOUNDARY_YEAR, MAP_DETAIL_LEVELS
+from paths import CACHE_DIR
+from scripts.mapping import quantize
+from scripts.misc import write_text_atomic
+from scripts.perf import traced
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Bump when the payload layout changes, so payloads from older code are rebuilt
+MAP_PAYLOAD_VERSION = 1
+
+
+def format_date(date, print_fmt: str = "%B %d, %Y") -> str:
+    """Format a datetime as a human-readable string."""
+    return date.strftime(print_fmt)
+
+
+def coordinate_precision(level: str) -> int:
+    """Decimal places kept for a detail level: one finer than its tolerance."""
+    tolerance = MAP_DETAIL_LEVELS[level]["tolerance"]
+    return math.ceil(-math.log10(tolerance)) + 1
+
+
+def with_geometry(
+    gdf: gpd.GeoDataFrame, gdf_geom: gpd.GeoDataFrame
+) -> gpd.GeoDataFrame:
+    """Swap the geometry of a processed layer for a simplified one, by geoid."""
+    out = gdf.drop(columns="geometry").merge(
+        gdf_geom[["geoid", "geometry"]], on="geoid", how="inner"
+    )
+    return gpd.GeoDataFrame(out, geometry="geometry", crs=gdf_geom.crs)
+
+
+def prepare_states(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Subset state GeoDataFrame to columns needed by folium."""
+    out = gdf[["geometry", "visited"]].copy()
+    out["visited"] = out["visited"].astype(int)
+    return out
+
+
+def prepare_counties(gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Subset county GeoDataFrame and pre-format dates for folium tooltips."""
+    cols = ["geometry", "visited", "state_name", "name", "geoid", "date"]
+    out = gdf[cols].copy()
+    out["visited"] = out["visited"].astype(int)
+    out["date_str"] = out.apply(
+        lambda row: format_date(row["date"]) if row["visited"] == 1 else "",
+        axis=1,
+    )
+    return out.drop(columns=["date"])
+
+
+def map_payload_key(level, gdf_county, gdf_state):
+    """Hash the detail level, boundary vintage and visit attributes of both layers."""
+    digest = hashlib.sha256()
+
+    header = {
+        "payload_version": MAP_PAYLOAD_VERSION,
+        "boundary_year": BOUNDARY_YEAR,
+        "boundary_store_version": BOUNDARY_STORE_VERSION,
+        "level": level,
+        "detail": MAP_DETAIL_LEVELS[level],
+    }
+    digest.update(json.dumps(header, sort_keys=True).encode())
+
+    for gdf in (gdf_county, gdf_state):
+        df_attrs = pd.DataFrame(gdf.drop(columns="geometry")).sort_values("geoid")
+        digest.update(pd.util.hash_pandas_object(df_attrs, index=False).values)
+
+    return digest.hexdigest()[:16]
+
+
+@traced(attrs=("level",))
+def build_map_payload(level, gdf_county, gdf_state, gdf_county_geom, gdf_state_geom):
+    """
+    Serialize the map layers to compact GeoJSON strings.
+
+    Geometry comes from the simplified layers of the given detail level,
+    reprojected to WGS84 and rounded to `coordinate_precision(level)` decimal
+    places. Features only carry the properties the map needs: `visited`, which
+    the map's style table is keyed on, and the county tooltip fields.
+
+    Parameters
+    ----------
+    level : str
+        Key of MAP_DETAIL_LEVELS.
+    gdf_county, gdf_state : geopandas.GeoDataFrame
+        Output of process_data.
+    gdf_county_geom, gdf_state_geom : geopandas.GeoDataFrame
+        Simplified layers for the level, from import_map_layers.
+
+    Returns
+    -------
+    dict
+        GeoJSON strings keyed by layer ("county", "state").
+    """
+    decimals = coordinate_precision(level)
+
+    dct_layers = {
+        "state": prepare_states(with_geometry(gdf_state, gdf_state_geom)),
+        "county": prepare_counties(with_geometry(gdf_county, gdf_county_geom)),
+    }
+
+    return {
+        layer: quantize(gdf.to_crs("EPSG:4326"), decimals).to_json(
+            drop_id=True, separators=(",", ":")
+        )
+        for layer, gdf in dct_layers.items()
+    }
+
+
+@traced(attrs=("level",))
+def build_frontier_payload(level, gdf_county_geom, geoids):
+    """
+    Serialize the frontier counties to compact GeoJSON, for the map overlay.
+
+    Features carry the county and state name for the tooltip, with geometry
+    from the detail level's simplified layer, rounded as in build_map_payload.
+    """
+    gdf = gdf_county_geom[gdf_county_geom["geoid"].isin(geoids)]
+
+    return quantize(
+        gdf[["geometry", "state_name", "name"]].to_crs("EPSG:4326"),
+        coordinate_precision(level),
+    ).to_json(drop_id=True, separators=(",", ":"))
+
+
+def prune_map_payloads(cache_dir, level, key):
+    """Delete a detail level's payloads for other keys, and unrecognized files."""
+    for path in cache_dir.glob("*.geojson"):
+        prefix = path.name.split("__")[0]
+        stale = prefix == level and not path.name.startswith(f"{level}__{key}__")
+
+        if stale or prefix not in MAP_DETAIL_LEVELS:
+            # Another process may be pruning the same file
+            path.unlink(missing_ok=True)
+
+
+@traced(attrs=("level",))
+def load_map_payload(level, gdf_county, gdf_state, gdf_county_geom, gdf_state_geom):
+    """
+    Return the map payload for a detail level, building it on a cache miss.
+
+    Only the payload of the current visit table is kept for each level. Files
+    are replaced atomically, so concurrent sessions never read a partial one.
+    """
+    cache_dir = CACHE_DIR / "map_payload"
+    key = map_payload_key(level, gdf_county, gdf_state)
+    dct_paths = {
+        layer: cache_dir / f"{level}__{key}__{layer}.geojson"
+        for layer in ("state", "county")
+    }
+
+    try:
+        return {layer: path.read_text() for layer, path in dct_paths.items()}
+    except FileNotFoundError:
+        pass
+
+    payload = build_map_payload(
+        level, gdf_county, gdf_state, gdf_county_geom, gdf_state_geom
+    )
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    for layer, path in dct_paths.items():
+        write_text_atomic(path, payload[layer])
+    prune_map_payloads(cache_dir, level, key)
+
+    return payload
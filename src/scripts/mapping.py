@@ -1,10 +1,9 @@
 # ---------------------------------------------------------------------------- #
 # IMPORT #
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-from shapely.affinity import translate
-from shapely.geometry import LineString
-from shapely.ops import split, unary_union
+import shapely
 
 # ---------------------------------------------------------------------------- #
 # CLASSES / FUNCTIONS #
@@ -14,6 +13,10 @@ def shift_meridian(geo_df, new_centerline):
     """
     Shift geometries in a GeoDataFrame to be centered around a new central meridian.
 
+    Every geometry is clipped into the parts west and east of the new central
+    meridian, each side is translated as a whole, and the two sides are unioned
+    back together. All three steps operate on the full geometry array at once.
+
     Parameters
     ----------
     geo_df : geopandas.GeoDataFrame
@@ -27,56 +30,154 @@ def shift_meridian(geo_df, new_centerline):
         A new GeoDataFrame with geometries shifted to the new central meridian.
     """
 
-    # Define new central meridian
-    central_meridian = LineString([(new_centerline, 90), (new_centerline, -90)])
+    geoms = geo_df.geometry.to_numpy()
 
-    # Init
-    gframes = []
+    # Split every geometry by the new central meridian. The clipping
+    # rectangles extend past +/-180 so nothing is lost on either side.
+    west = shapely.clip_by_rect(geoms, -360, -90, new_centerline, 90)
+    east = shapely.clip_by_rect(geoms, new_centerline, -90, 360, 90)
 
-    for _, row in geo_df.iterrows():
-        # Extract values
-        element = row["geometry"]
+    # Parts west of the meridian move right, parts east of it move left
+    west = shapely.transform(west, lambda coords: coords + (180 - new_centerline, 0))
+    east = shapely.transform(east, lambda coords: coords + (-180 - new_centerline, 0))
 
-        # Split current geometry by new central meridian.
-        split_geoms = split(element, central_meridian)
+    # Combine the shifted parts into a single geometry per row
+    unified = shapely.union(west, east)
 
-        # Init
-        shifted_parts = []
-        for part in split_geoms.geoms:
-            min_x = part.bounds[0]  # Extract minimum x (longitude)
+    geo_df = geo_df.copy()
+    geo_df[geo_df.geometry.name] = gpd.GeoSeries(
+        unified, index=geo_df.index, crs=geo_df.crs
+    )
 
-            # Determine the translation direction
-            if min_x >= new_centerline:
-                adjust_factor = -1
-            else:
-                adjust_factor = 1
+    return geo_df
 
-            # Calculate the translation offset
-            x_off = (180 * adjust_factor) - new_centerline
 
-            # Translate geometry
-            shifted_part = translate(part, xoff=x_off)
+# Placement of the inset states below the lower 48, as in
+# pygris.utils.shift_geometry(preserve_area=False, position="below"): the CRS
+# each state is drawn in, its scale, and its position as fractions of the
+# lower 48's extent.
+INSET_CRS = "ESRI:102003"
+INSET_PLACEMENT = {
+    "02": ("EPSG:3338", 0.5, (0.06, -0.14)),
+    "15": ("ESRI:102007", 1.5, (0.32, 0.2)),
+    "72": ("EPSG:32161", 2.5, (0.75, 0.15)),
+}
 
-            shifted_parts.append(shifted_part)
 
-        # Combine the shifted parts into a single geometry
-        unified_geom = gpd.GeoSeries(unary_union(shifted_parts))
+def shift_inset(geo_df, gdf_reference):
+    """
+    Move Alaska, Hawaii and Puerto Rico below the lower 48 states.
 
-        # Converty unified geometries into geo dataframe
-        gdf_geom_shift = gpd.GeoDataFrame({"geometry": unified_geom})
-        gframes.append(gdf_geom_shift)
+    Gives the same result as pygris.utils.shift_geometry with its defaults, but
+    takes the reference state outlines as an argument instead of downloading
+    them on every call, so it needs no network and is safe to call from
+    several threads at once.
 
-    # Concatenate all geo dataframes togeter
-    gdf_unify = pd.concat(gframes)
+    Parameters
+    ----------
+    geo_df : geopandas.GeoDataFrame
+        Features in the United States.
+    gdf_reference : geopandas.GeoDataFrame
+        State outlines with a geoid column, as from import_inset_reference.
 
-    # Assign original index to new geometry dataframe
-    gdf_unify.index = geo_df.index
+    Returns
+    -------
+    geopandas.GeoDataFrame
+        The features in INSET_CRS, lower 48 first, then each inset state.
+    """
+    reference = gdf_reference.to_crs(INSET_CRS)
+    outlines = {fips: reference[reference["geoid"] == fips] for fips in INSET_PLACEMENT}
+    boxes = gpd.GeoDataFrame(
+        {"state_fips": list(INSET_PLACEMENT)},
+        geometry=[gdf.envelope.iloc[0] for gdf in outlines.values()],
+        crs=reference.crs,
+    )
+
+    # Features are assigned to a state by the bounding box they fall in
+    gdf_albers = geo_df.to_crs(INSET_CRS).sjoin(boxes, how="left")
+    gdf_albers["state_fips"] = gdf_albers["state_fips"].fillna("00")
+
+    is_inset = gdf_albers["state_fips"].isin(list(INSET_PLACEMENT))
+    xmin, ymin, xmax, ymax = reference[
+        ~reference["geoid"].isin(list(INSET_PLACEMENT))
+    ].total_bounds
+
+    parts = [gdf_albers[~is_inset]]
+    for fips, (crs, scale, (x, y)) in INSET_PLACEMENT.items():
+        gdf = gdf_albers[gdf_albers["state_fips"] == fips]
+        if gdf.empty:
+            continue
+
+        # Hawaii is cut to its box, dropping the Northwestern Hawaiian Islands
+        if fips == "15":
+            gdf = gdf.overlay(boxes[boxes["state_fips"] == fips][["geometry"]])
+        gdf = gdf.to_crs(crs)
+
+        centroid = outlines[fips].to_crs(crs).centroid.iloc[0]
+        gdf.geometry = (
+            gdf.geometry.translate(xoff=-centroid.x, yoff=-centroid.y)
+            .scale(xfact=scale, yfact=scale, origin=(centroid.x, centroid.y))
+            .translate(
+                xoff=xmin + x * (xmax - xmin),
+                yoff=ymin + y * (ymax - ymin),
+            )
+        )
+        parts.append(gdf.set_crs(INSET_CRS, allow_override=True))
+
+    return pd.concat(parts).drop(columns=["state_fips", "index_right"])
+
+
+def quantize(gdf, decimals):
+    """
+    Round every coordinate of a GeoDataFrame to a fixed number of decimals.
 
-    # Concatenate new transposed geo dataframe back to initial
-    geo_df = pd.concat([geo_df.drop(columns=["geometry"]), gdf_unify], axis=1)
+    Shared vertices round to the same value, so neighbouring shapes keep a
+    common border. Rounded floats also serialize to much shorter JSON.
+    """
+    gdf = gdf.copy()
+    gdf["geometry"] = shapely.transform(
+        gdf.geometry.to_numpy(), lambda coords: np.round(coords, decimals)
+    )
 
-    return geo_df
+    return gdf
 
 
 def adjust_crs(gdf, epsg):
     return gdf.to_crs(epsg=epsg)
+
+
+def simplify_layers(gdf_county, gdf_state, tolerance):
+    """
+    Simplify the county and state layers without opening gaps between them.
+
+    Counties are simplified as a single coverage, so neighbouring counties keep
+    identical shared borders. States are then rebuilt by dissolving the
+    simplified counties, so state outlines sit exactly on the county edges.
+
+    Parameters
+    ----------
+    gdf_county : geopandas.GeoDataFrame
+        County layer with `statefp` and `geometry` columns.
+    gdf_state : geopandas.GeoDataFrame
+        State layer keyed by `geoid` (state FIPS code).
+    tolerance : float
+        Simplification tolerance, in the units of the layers' CRS.
+
+    Returns
+    -------
+    tuple of geopandas.GeoDataFrame
+        Simplified county and state layers, with the same columns as the inputs.
+    """
+    gdf_county = gdf_county.copy()
+    gdf_county["geometry"] = gdf_county.geometry.simplify_coverage(tolerance)
+
+    state_geom = gdf_county[["statefp", "geometry"]].dissolve(
+        by="statefp", method="coverage"
+    )
+
+    gdf_state = gdf_state.drop(columns="geometry").merge(
+        state_geom, left_on="geoid", right_index=True, how="inner"
+    )
+    gdf_state = gpd.GeoDataFrame(gdf_state, geometry="geometry", crs=gdf_county.crs)
+
+    return gdf_county, gdf_state
@@ -1,6 +1,7 @@
 ################################################################################
 # SETUP #
 import os
+import tempfile
 from pathlib import Path
 
 
@@ -62,3 +63,29 @@ def get_project_directory(search_directory=Path.cwd(), root_file="root.txt"):
 
     else:
         return get_project_directory(search_directory=search_directory.parent)
+
+
+def write_text_atomic(path, text, newline=None):
+    """
+    Write a text file in one step, via a temporary file in the same directory.
+
+    Readers see either the previous file or the complete new one, never a
+    partly written file.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The file to write.
+    text : str
+        The new contents of the file.
+    newline : str, optional
+        Passed to open(); use "" to write line endings in `text` unchanged.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline=newline) as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,193 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+from config import PERF_MAX_RECORDS
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Set to 1 to record stages from the start of the process, e.g. for the app
+PERF_ENV = "TRACKINGCOUNTIES_PERF"
+
+_RECORDS = deque(maxlen=PERF_MAX_RECORDS)
+_LOCK = threading.Lock()
+_LOCAL = threading.local()
+_STATE = {"enabled": False}
+
+
+def enable():
+    """Start recording stages, and tracing allocations for peak memory."""
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _STATE["enabled"] = True
+
+
+def is_enabled():
+    return _STATE["enabled"]
+
+
+def records():
+    """Return the recorded stages, oldest first."""
+    with _LOCK:
+        return list(_RECORDS)
+
+
+def add_records(stage_records):
+    """Append stages recorded elsewhere, e.g. returned by a worker process."""
+    with _LOCK:
+        _RECORDS.extend(stage_records)
+
+
+def clear():
+    with _LOCK:
+        _RECORDS.clear()
+
+
+@contextmanager
+def stage(name, **attrs):
+    """
+    Record the wall time, CPU time and peak memory of a block.
+
+    Stages nest; each record carries its depth and its parent's name. Peak
+    memory is measured with tracemalloc, which sees Python and numpy
+    allocations but not buffers allocated inside C libraries such as Agg or
+    GEOS. CPU time is for the whole process and peak memory counts every
+    thread, so both overlap between stages running concurrently in different
+    threads. Does nothing unless recording is enabled.
+
+    Parameters
+    ----------
+    name : str
+        Stage name, e.g. "process_data".
+    **attrs
+        JSON-serializable values stored with the record, e.g. plot_label.
+    """
+    if not is_enabled():
+        yield
+        return
+
+    stack = _LOCAL.__dict__.setdefault("stack", [])
+    parent = stack[-1] if stack else None
+
+    # tracemalloc has a single peak counter. Fold the peak reached so far into
+    # the parent before resetting it, so the parent's peak covers this stage.
+    current, peak = tracemalloc.get_traced_memory()
+    if parent is not None:
+        parent["peak"] = max(parent["peak"], peak)
+    tracemalloc.reset_peak()
+
+    frame = {"name": name, "peak": current}
+    stack.append(frame)
+
+    started = time.time()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+        stack.pop()
+        frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+        if parent is not None:
+            parent["peak"] = max(parent["peak"], frame["peak"])
+
+        record = {
+            "name": name,
+            "parent": parent["name"] if parent is not None else None,
+            "depth": len(stack),
+            "start": started,
+            "wall_s": wall,
+            "cpu_s": cpu,
+            "peak_mb": (frame["peak"] - current) / 2**20,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "attrs": attrs,
+        }
+        with _LOCK:
+            _RECORDS.append(record)
+
+
+def traced(name=None, attrs=()):
+    """
+    Decorate a function so each call is recorded as a stage.
+
+    Parameters
+    ----------
+    name : str, optional
+        Stage name. Defaults to the function's qualified name.
+    attrs : tuple of str, optional
+        Arguments of the function to store with the record, by name.
+    """
+
+    def decorate(func):
+        stage_name = name or func.__qualname__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+            values = {attr: arguments.arguments[attr] for attr in attrs}
+
+            with stage(stage_name, **values):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def trace_events(stage_records=None):
+    """
+    Convert stage records to the Chrome trace event format.
+
+    The result opens in chrome://tracing or https://ui.perfetto.dev, with one
+    row per process and thread.
+    """
+    if stage_records is None:
+        stage_records = records()
+
+    events = [
+        {
+            "name": record["name"],
+            "cat": "stage",
+            "ph": "X",
+            "ts": record["start"] * 1e6,
+            "dur": record["wall_s"] * 1e6,
+            "pid": record["pid"],
+            "tid": record["tid"],
+            "args": {
+                "cpu_s": record["cpu_s"],
+                "peak_mb": record["peak_mb"],
+                **record["attrs"],
+            },
+        }
+        for record in stage_records
+    ]
+
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_trace(path, stage_records=None):
+    """Write the recorded stages to `path` as a Chrome trace JSON file."""
+    with open(path, "w") as f:
+        json.dump(trace_events(stage_records), f, indent=1)
+        f.write("\n")
+
+
+if os.environ.get(PERF_ENV) == "1":
+    enable()
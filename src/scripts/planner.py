@@ -0,0 +1,397 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import datetime as dt
+import heapq
+import itertools
+import math
+
+import numpy as np
+import pandas as pd
+
+from config import (
+    PLANNER_AREA_COUNTIES,
+    PLANNER_DROPS,
+    PLANNER_KM_PER_DAY,
+    PLANNER_ROAD_FACTOR,
+    PLANNER_ROUNDS,
+)
+from scripts.perf import traced
+from scripts.trips import TRIP_DIR, build_name_index, resolve_county
+from scripts.visit_log import county_keys
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Planned trips are kept apart from TRIP_DIR, so `make trips` does not record
+# them as visits before they happen. Move a file up once the trip is driven.
+PLANNED_TRIP_DIR = TRIP_DIR / "planned"
+
+ROUTE_COLUMNS = ["geoid", "day", "leg_km", "total_km", "new"]
+
+
+class TripPlanner:
+    """
+    Plan road trips that pick up as many new counties as possible.
+
+    A route is a walk through counties that share a border, starting from a
+    given county. Each leg costs the distance between the two centroids times
+    `road_factor`, and the route may drive `km_per_day` per day. Every
+    unvisited county on the walk counts once.
+
+    Routes are searched over the `area_counties` counties closest by road to
+    the start. A greedy pass repeatedly drives to the county whose shortest
+    walk picks up the most new counties per km, found with one Dijkstra search
+    bounded by the remaining budget. Each round then reorders the stops with
+    2-opt on their shortest-walk distances, and also tries leaving out each of
+    the `drops` stops that add the fewest new counties per km. Every candidate
+    spends its freed budget greedily, and the one covering the most new
+    counties is kept, for up to `rounds` rounds while the count improves.
+
+    Parameters
+    ----------
+    graph : scripts.adjacency.CountyGraph
+    km_per_day : float, optional
+    road_factor : float, optional
+        Road distance per km of straight line between centroids.
+    area_counties : int, optional
+    rounds : int, optional
+    drops : int, optional
+        Stops left out in turn each round; 0 only reorders.
+    """
+
+    def __init__(
+        self,
+        graph,
+        km_per_day=PLANNER_KM_PER_DAY,
+        road_factor=PLANNER_ROAD_FACTOR,
+        area_counties=PLANNER_AREA_COUNTIES,
+        rounds=PLANNER_ROUNDS,
+        drops=PLANNER_DROPS,
+    ):
+        self.graph = graph
+        self.km_per_day = km_per_day
+        self.road_factor = road_factor
+        self.area_counties = area_counties
+        self.rounds = rounds
+        self.drops = drops
+
+        indptr, indices = graph.edges("border")
+        rows = np.repeat(np.arange(len(graph)), np.diff(indptr))
+        lengths = graph.distance_km(rows, indices) * road_factor
+
+        # Plain lists: the searches below step through them one edge at a time
+        self._indptr = indptr.tolist()
+        self._indices = indices.tolist()
+        self._lengths = lengths.tolist()
+
+    def _dijkstra(self, source, cutoff, allowed):
+        """
+        Shortest walks from `source` through allowed counties, up to `cutoff` km.
+
+        Returns the distance and parent lists over all counties, and the
+        counties reached in order of distance.
+        """
+        dist = [math.inf] * len(allowed)
+        parent = [-1] * len(allowed)
+        dist[source] = 0.0
+
+        indptr, indices, lengths = self._indptr, self._indices, self._lengths
+        order = []
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if d > dist[u]:
+                continue
+            order.append(u)
+
+            for k in range(indptr[u], indptr[u + 1]):
+                v = indices[k]
+                nd = d + lengths[k]
+                if nd < dist[v] and nd <= cutoff and allowed[v]:
+                    dist[v] = nd
+                    parent[v] = u
+                    heapq.heappush(heap, (nd, v))
+
+        return dist, parent, order
+
+    @staticmethod
+    def _walk(parent, target):
+        """Counties from the search source (excluded) to `target`."""
+        path = []
+        while parent[target] != -1:
+            path.append(target)
+            target = parent[target]
+
+        return path[::-1]
+
+    def _search_area(self, source, budget):
+        """Flag the `area_counties` counties closest by road to the source."""
+        _, _, order = self._dijkstra(source, budget, [True] * len(self.graph))
+
+        allowed = [False] * len(self.graph)
+        for v in order[: self.area_counties]:
+            allowed[v] = True
+
+        return allowed
+
+    def _extend(self, route, collected, remaining, allowed):
+        """
+        Greedily extend a route in place, returning the stops it drove to.
+
+        Each step drives to the reachable county with the most new counties
+        per km on its shortest walk, until no new county is within budget.
+        """
+        stops = []
+        while True:
+            dist, parent, order = self._dijkstra(route[-1], remaining, allowed)
+
+            # New counties on the walk to each county, built outwards from the
+            # source since a county's parent is always settled before it
+            gain = {route[-1]: 0}
+            best, best_score = None, (0.0, 0)
+            for v in order[1:]:
+                gain[v] = gain[parent[v]] + (not collected[v])
+                score = (gain[v] / dist[v], gain[v])
+                if score > best_score:
+                    best, best_score = v, score
+
+            if best is None:
+                return stops
+
+            for v in self._walk(parent, best):
+                route.append(v)
+                collected[v] = True
+            remaining -= dist[best]
+            stops.append(best)
+
+    @staticmethod
+    def _two_opt(dist):
+        """
+        Order the stops with 2-opt to shorten the walk through them.
+
+        `dist` holds the shortest-walk distances between the source, first,
+        and the stops. Returns the visiting order as indices into `dist`.
+        """
+        # The walk is open: the source stays first and the last stop is free.
+        # Reversing seq[i : j + 1] swaps legs (a, b) and (c, d) for (a, c) and
+        # (b, d); all j for one i are scored at once.
+        seq = list(range(len(dist)))
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, len(seq) - 1):
+                a, b = seq[i - 1], seq[i]
+                c = np.array(seq[i + 1 :])
+                d = np.array(seq[i + 2 :] + [-1])
+
+                delta = (
+                    dist[a, c]
+                    - dist[a, b]
+                    + np.where(d >= 0, dist[b, d] - dist[c, d], 0.0)
+                )
+                j = int(np.argmin(delta))
+                if delta[j] < -1e-9:
+                    seq[i : i + j + 2] = seq[i : i + j + 2][::-1]
+                    improved = True
+
+        return seq
+
+    def _rearrange(self, source, stops, budget, allowed, visited):
+        """
+        Candidate walks through the stops, to be extended greedily.
+
+        The first candidate visits every stop in 2-opt order. The others each
+        leave out one of the `drops` stops that lose the fewest new counties
+        per km saved, freeing budget for counties the greedy pass passed by.
+
+        Returns
+        -------
+        list of tuple of (list, list)
+            Each candidate's walk, along shortest walks, and its stops.
+        """
+        nodes = [source, *stops]
+
+        # Every stop is within budget of the source, so of each other by 2x
+        searches = [self._dijkstra(u, 2 * budget, allowed) for u in nodes]
+        dist = np.array([[search[0][v] for v in nodes] for search in searches])
+        seq = self._two_opt(dist)
+
+        def walk(seq):
+            route = [source]
+            for u, v in itertools.pairwise(seq):
+                route.extend(self._walk(searches[u][1], nodes[v]))
+            return route
+
+        full = self._coverage(walk(seq), visited)
+        scores = []
+        for i in range(1, len(seq)):
+            a, b = seq[i - 1], seq[i]
+            saved = dist[a, b]
+            if i + 1 < len(seq):
+                c = seq[i + 1]
+                saved += dist[b, c] - dist[a, c]
+
+            lost = full - self._coverage(walk(seq[:i] + seq[i + 1 :]), visited)
+            if saved > 1e-9:
+                scores.append((lost / saved, i))
+
+        candidates = [seq] + [seq[:i] + seq[i + 1 :] for _, i in sorted(scores)]
+
+        return [
+            (walk(order), [nodes[u] for u in order[1:]])
+            for order in candidates[: self.drops + 1]
+        ]
+
+    @staticmethod
+    def _coverage(route, visited):
+        """Number of counties on a walk not visited before."""
+        return int(np.sum(~visited[np.unique(route)]))
+
+    def route_km(self, route):
+        """Road length of a walk given as graph rows."""
+        route = np.asarray(route)
+        legs = self.graph.distance_km(route[:-1], route[1:]) * self.road_factor
+
+        return float(np.sum(legs))
+
+    @traced(attrs=("days",))
+    def plan(self, start, visited, days):
+        """
+        Plan a route from a start county.
+
+        Parameters
+        ----------
+        start : str
+            Geoid of the start county.
+        visited : array-like of str
+            Geoids of the counties already visited, e.g. the rows of the
+            county layer from process_data with visited == 1.
+        days : int
+            Driving days.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per county entered, in order, with ROUTE_COLUMNS: the
+            0-based day it is reached on, the leg and running road km, and
+            whether it is a county not visited before.
+
+        Raises
+        ------
+        KeyError
+            If the start county is not in the graph.
+        """
+        source = pd.Index(self.graph.geoids).get_loc(start)
+
+        budget = days * self.km_per_day
+        allowed = self._search_area(source, budget)
+        visited = self.graph.mask(visited)
+
+        collected = visited.tolist()
+        collected[source] = True
+        route = [source]
+        stops = self._extend(route, collected, budget, allowed)
+
+        for _ in range(self.rounds):
+            if len(stops) < 2:
+                break
+
+            best, best_stops = route, stops
+            for candidate, candidate_stops in self._rearrange(
+                source, stops, budget, allowed, visited
+            ):
+                length = self.route_km(candidate)
+                if length > budget:
+                    continue
+
+                collected = visited.tolist()
+                for v in candidate:
+                    collected[v] = True
+                candidate_stops += self._extend(
+                    candidate, collected, budget - length, allowed
+                )
+
+                if self._coverage(candidate, visited) > self._coverage(best, visited):
+                    best, best_stops = candidate, candidate_stops
+
+            if best is route:
+                break
+            route, stops = best, best_stops
+
+        return self._route_frame(route, visited)
+
+    def _route_frame(self, route, visited):
+        route = np.asarray(route)
+        legs = np.concatenate(
+            [[0.0], self.graph.distance_km(route[:-1], route[1:]) * self.road_factor]
+        )
+        total = np.cumsum(legs)
+
+        # A county reached exactly at the end of a day's driving ends that day
+        day = np.maximum(np.ceil(total / self.km_per_day - 1e-9) - 1, 0).astype(int)
+
+        return pd.DataFrame(
+            {
+                "geoid": self.graph.geoids[route],
+                "day": day,
+                "leg_km": legs,
+                "total_km": total,
+                "new": ~pd.Series(route).duplicated().to_numpy() & ~visited[route],
+            },
+            columns=ROUTE_COLUMNS,
+        )
+
+
+def format_trip_file(df_route, df, start_date, summary):
+    """
+    Write a planned route as a trip file, in the data/trips/README.md format.
+
+    Parameters
+    ----------
+    df_route : pandas.DataFrame
+        Route from TripPlanner.plan.
+    df : pandas.DataFrame
+        Visit table from import_data_visit_text, for county names.
+    start_date : datetime.date
+        Date of the route's day 0.
+    summary : list of str
+        Summary bullets.
+
+    Returns
+    -------
+    str
+        Each day lists the counties entered that day, after the county the
+        previous day ended in. Counties missing from the visit table are left
+        out, since a trip file cannot name them.
+    """
+    rows = pd.Series(df.index, index=county_keys(df))
+    df_route = df_route[df_route["geoid"].isin(rows.index)]
+
+    # Where a county and an independent city share a name, the plain name is
+    # the county, so the city is written e.g. "Richmond city"
+    index = build_name_index(df)
+    names = {}
+    for geoid in df_route["geoid"].unique():
+        row = rows[geoid]
+        county_name, state = df.at[row, "county_name"], df.at[row, "state"]
+        if resolve_county(index, county_name, state) != row:
+            county_name = f"{county_name} city"
+        names[geoid] = f"{county_name}, {state}"
+
+    states = df.loc[rows[df_route["geoid"]], "state_name"].unique()
+
+    lines = ["# Trip Overview", "## Summary"]
+    lines += [f"- {bullet}" for bullet in summary]
+    lines += ["", f"**States:** {', '.join(states)}", "", "## Counties"]
+
+    overnight = None
+    for day, df_day in df_route.groupby("day", sort=True):
+        geoids = list(df_day["geoid"])
+        if overnight is not None and overnight != geoids[0]:
+            geoids.insert(0, overnight)
+        overnight = geoids[-1]
+
+        date = start_date + dt.timedelta(days=int(day))
+        lines += [f"### {date:%Y-%m-%d}"] + [f"* {names[g]}" for g in geoids] + [""]
+
+    return "\n".join(lines).rstrip() + "\n"
@@ -1,140 +1,524 @@
 # ---------------------------------------------------------------------------- #
 # IMPORT #
-
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections.abc import Mapping
+
+import geopandas as gpd
+import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import plotnine as p9
-import siuba as s
-from pygris.utils import shift_geometry
+import shapely
+from matplotlib.collections import PathCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.patches import Rectangle
+from matplotlib.path import Path
 
 from config import (
-    FIPS_ALASKA,
-    FIPS_HAWAII,
-    FIPS_NC,
-    FIPS_NC_ADJACENT,
+    BOUNDARY_STORE_VERSION,
+    BOUNDARY_YEAR,
+    EPSG_CODE,
+    PLOT_BACKEND,
+    PLOT_BACKENDS,
     PLOT_DPI,
-    TERRITORY_CODES,
+    PLOT_GEOMETRY_CACHE_VERSION,
+    PLOT_REGIONS,
+    PLOT_TILE_MAX_PIXELS,
+    PLOT_VECTOR_FORMATS,
 )
-from paths import PROJECT_ROOT
-from scripts.mapping import adjust_crs, shift_meridian
+from paths import CACHE_DIR, PROJECT_ROOT
+from scripts.data import import_inset_reference
+from scripts.export import save_png_tiled
+from scripts.mapping import adjust_crs, shift_inset, shift_meridian
+from scripts.perf import traced
 
 # ---------------------------------------------------------------------------- #
 # CLASSES / FUNCTIONS #
 
+# Columns that change with the visit table. Everything else on the plot tables
+# is derived from the boundary files and can be cached between runs.
+VISIT_COLUMNS = ["visited", "date"]
+
+# Layers of every region, in the order the plot tables are keyed
+PLOT_LAYERS = ["state", "county"]
+
+# Fields of a region definition that decide its geometry. The others, like the
+# figure size, only change how it is drawn.
+REGION_GEOMETRY_FIELDS = ["states", "exclude", "projection", "centerline"]
+
+# Fixed axis limits (x, y) for regions that should not fit their data
+COORD_LIMITS = {
+    plot_label: region["limits"]
+    for plot_label, region in PLOT_REGIONS.items()
+    if "limits" in region
+}
+
+# Layout constants matching plotnine's theme_linedraw, so both backends place
+# the panel identically: margin as a fraction of figure width, scale expansion
+# as a fraction of the data range, and panel border width in points.
+PLOT_MARGIN = 0.01
+SCALE_EXPANSION = 0.05
+PANEL_BORDER_WIDTH = 2
+
+# plotnine multiplies `size` by sqrt(pi) to get a matplotlib linewidth
+LINEWIDTH_FACTOR = np.sqrt(np.pi)
+
+
+def region_geometry_key(region, epsg_code=EPSG_CODE):
+    """Hash the boundary vintage and the parts of a region that shape its geometry."""
+    definition = {
+        "cache_version": PLOT_GEOMETRY_CACHE_VERSION,
+        "boundary_year": BOUNDARY_YEAR,
+        "boundary_store_version": BOUNDARY_STORE_VERSION,
+        **{
+            field: sorted(value) if isinstance(value, list) else value
+            for field, value in region.items()
+            if field in REGION_GEOMETRY_FIELDS
+        },
+    }
+    if region.get("projection") == "epsg":
+        definition["epsg_code"] = epsg_code
+
+    payload = json.dumps(definition, sort_keys=True).encode()
+
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+def plot_input_hash(
+    dct_visits, plot_label, plot_params, dpi, geometry_key, backend=PLOT_BACKEND
+):
+    """
+    Hash everything that affects how a single region plot renders.
+
+    Parameters
+    ----------
+    dct_visits : dict
+        The region's rows per layer, with geoid and VISIT_COLUMNS, as from
+        PlotTables.visit_rows. Only these columns are hashed.
+    plot_label : str
+        Region to hash.
+    plot_params : dict
+        Plot style parameters (PLOT_PARAMS).
+    dpi : int
+        Output resolution.
+    geometry_key : str
+        Output of region_geometry_key, covering the boundary vintage, region
+        definition and projection.
+    backend : str, optional
+        Renderer, one of PLOT_BACKENDS.
+
+    Returns
+    -------
+    str
+        Hex digest that changes whenever the rendered plot could change.
+    """
+    digest = hashlib.sha256()
+
+    # Visit attributes of the rows in this region, in a stable order
+    for layer in ("county", "state"):
+        df_visits = (
+            pd.DataFrame(dct_visits[layer][["geoid", *VISIT_COLUMNS]])
+            .sort_values("geoid")
+            .reset_index(drop=True)
+        )
+        digest.update(pd.util.hash_pandas_object(df_visits, index=False).values)
+
+    params = {
+        "color": plot_params["color"],
+        "opacity": plot_params["opacity"],
+        "entity_border": plot_params["entity_border"],
+        "height": plot_params["dimensions"]["height"][plot_label],
+        "width": plot_params["dimensions"]["width"][plot_label],
+        "dpi": dpi,
+        "geometry_key": geometry_key,
+        "backend": backend,
+    }
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+
+    return digest.hexdigest()
+
+
+def save_region_geometry(dct_geom, cache_dir):
+    """
+    Write each layer of one region to GeoParquet, the state layer last.
+
+    Each file is written to a temporary name and moved into place, so other
+    processes sharing the cache never read a partly written layer.
+    """
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # The state file marks the region as complete, so it is written last
+    for layer in sorted(dct_geom, key=lambda layer: layer == "state"):
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            dct_geom[layer].to_parquet(tmp_path)
+            os.replace(tmp_path, cache_dir / f"{layer}.parquet")
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def load_region_geometry(cache_dir):
+    """Read one region's cached layers, or return None if they are incomplete."""
+    if not (cache_dir / "state.parquet").exists():
+        return None
+
+    return {
+        layer: gpd.read_parquet(cache_dir / f"{layer}.parquet") for layer in PLOT_LAYERS
+    }
+
+
+def select_region(gdf_county, gdf_state, region):
+    """Return the state and county rows of a region, keyed by layer, unprojected."""
+    if "states" in region:
+        in_state = gdf_state["geoid"].isin(region["states"])
+        in_county = gdf_county["statefp"].isin(region["states"])
+    else:
+        in_state = ~gdf_state["geoid"].isin(region.get("exclude", []))
+        in_county = ~gdf_county["statefp"].isin(region.get("exclude", []))
+
+    return {"state": gdf_state[in_state], "county": gdf_county[in_county]}
+
+
+@traced(attrs=("plot_label",))
+def generate_region_geometry(
+    gdf_county, gdf_state, plot_label, region, epsg_code=EPSG_CODE
+):
+    """
+    Select and place the state and county geometry of one region.
+
+    Parameters
+    ----------
+    gdf_county, gdf_state : geopandas.GeoDataFrame
+        County and state layers, with statefp and geoid.
+    plot_label : str
+        Region name, recorded with the stage timing.
+    region : dict
+        Region definition, see PLOT_REGIONS.
+    epsg_code : str, optional
+        CRS of regions with the "epsg" projection.
+
+    Returns
+    -------
+    dict
+        GeoDataFrame per layer in PLOT_LAYERS.
+    """
+    dct_geom = select_region(gdf_county, gdf_state, region)
+
+    projection = region.get("projection")
+    if projection == "epsg":
+        dct_geom = {
+            layer: adjust_crs(gdf, epsg=epsg_code) for layer, gdf in dct_geom.items()
+        }
+
+    elif projection == "meridian":
+        # The western edge of the Aleutian islands lies west of the 180 deg
+        # meridian, so on the default projection it is drawn on the far side
+        # of the plot from the rest of Alaska. Moving the central meridian
+        # keeps the state in one piece.
+        dct_geom = {
+            layer: shift_meridian(gdf, region["centerline"])
+            for layer, gdf in dct_geom.items()
+        }
+
+    elif projection == "inset":
+        gdf_reference = import_inset_reference()
+        dct_geom = {
+            layer: shift_inset(gdf, gdf_reference) for layer, gdf in dct_geom.items()
+        }
+
+    elif projection is not None:
+        raise ValueError(f"Unknown projection '{projection}' for region {plot_label}")
+
+    return dct_geom
+
+
+@traced()
+def generate_plot_geometry(
+    gdf_county, gdf_state, regions=PLOT_REGIONS, epsg_code=EPSG_CODE
+):
+    """Build the geometry of every region at once, keyed by layer then region."""
+    dct_plot = {layer: {} for layer in PLOT_LAYERS}
+
+    for plot_label, region in regions.items():
+        dct_geom = generate_region_geometry(
+            gdf_county, gdf_state, plot_label, region, epsg_code
+        )
+        for layer, gdf in dct_geom.items():
+            dct_plot[layer][plot_label] = gdf
 
-def generate_plot_data(gdf_county, gdf_state, non_contiguous_codes, epsg_code):
-    # Init
-    dct_plot = {"state": {}, "county": {}}
-
-    # CONTIGUOUS US -----------------------------------
-    plot_label = "contiguous"
-
-    # Reduce state and county datasets to only entities
-    # within the contiguous United States.
-    dct_plot["state"][plot_label] = gdf_state >> s.filter(
-        ~s._.geoid.isin(non_contiguous_codes)
-    )
-
-    dct_plot["county"][plot_label] = gdf_county >> s.filter(
-        ~s._.statefp.isin(non_contiguous_codes)
-    )
-
-    # Adjust the projections of the map geometries. We are only
-    # adjusting the contigous us for now. Alaska and Hawaii
-    # plot better with the default projection
-
-    dct_plot["state"][plot_label] = adjust_crs(
-        dct_plot["state"][plot_label], epsg=epsg_code
-    )
+    return dct_plot
 
-    dct_plot["county"][plot_label] = adjust_crs(
-        dct_plot["county"][plot_label], epsg=epsg_code
-    )
 
-    # ALASKA -----------------------------------
-    plot_label = "alaska"
+class RegionLayer(Mapping):
+    """One layer of PlotTables, keyed by region."""
+
+    def __init__(self, plot_tables, layer):
+        self._plot_tables = plot_tables
+        self._layer = layer
+
+    def __getitem__(self, plot_label):
+        return self._plot_tables.region(plot_label)[self._layer].copy(deep=False)
+
+    def __iter__(self):
+        return iter(self._plot_tables.regions)
+
+    def __len__(self):
+        return len(self._plot_tables.regions)
+
+
+class PlotTables(Mapping):
+    """
+    Plot tables of every region, each built on first access.
+
+    Indexed like a dict of layers, then regions: plot_tables["county"]["alaska"].
+    Looking up one region selects and projects only that region's geometry,
+    read from data/cache/plot_geometry/ when it was built before, then joins
+    the visit attributes on. The result is memoized, and every lookup returns
+    a shallow copy, so callers can add columns without touching it.
+
+    Parameters
+    ----------
+    gdf_county, gdf_state : geopandas.GeoDataFrame
+        Processed county and state layers, with the visit attributes.
+    regions : dict, optional
+        Region definitions, see PLOT_REGIONS.
+    epsg_code : str, optional
+    use_cache : bool, optional
+        Read and write the projected geometry on disk.
+    """
+
+    def __init__(
+        self,
+        gdf_county,
+        gdf_state,
+        regions=PLOT_REGIONS,
+        epsg_code=EPSG_CODE,
+        use_cache=True,
+    ):
+        self.regions = regions
+        self.epsg_code = epsg_code
+        self.use_cache = use_cache
+
+        self._layers = {"county": gdf_county, "state": gdf_state}
+        self._built = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, layer):
+        if layer not in PLOT_LAYERS:
+            raise KeyError(layer)
+
+        return RegionLayer(self, layer)
+
+    def __iter__(self):
+        return iter(PLOT_LAYERS)
+
+    def __len__(self):
+        return len(PLOT_LAYERS)
+
+    def geometry_key(self, plot_label):
+        return region_geometry_key(self.regions[plot_label], self.epsg_code)
+
+    def visit_rows(self, plot_label):
+        """
+        Return the visit attributes of a region's rows per layer.
+
+        Selects the rows from the processed layers without building the
+        region's geometry, so checking whether a plot is stale stays cheap.
+        """
+        dct_rows = select_region(
+            self._layers["county"], self._layers["state"], self.regions[plot_label]
+        )
 
-    dct_plot["state"][plot_label] = gdf_state >> s.filter(s._.geoid == FIPS_ALASKA)
+        return {
+            layer: gdf[["geoid", *VISIT_COLUMNS]] for layer, gdf in dct_rows.items()
+        }
 
-    dct_plot["county"][plot_label] = gdf_county >> s.filter(s._.statefp == FIPS_ALASKA)
+    def region(self, plot_label):
+        """Return a region's tables per layer, building them on first use."""
+        # One lock per region, so regions build side by side in threads
+        with self._lock:
+            lock = self._locks.setdefault(plot_label, threading.Lock())
 
-    # Adjust centerline of Alaskan projection. The western edge of the
-    # Aluetian islands lie west of the 180 deg meridian. On the deault
-    # map projection, this means Alaska is not projected as one
-    # contiguous object. Instead, the far western edge of the
-    # Aleutians are plotted on the far right of the plot, while the rest
-    # of Alaska is plotted on the far right. In order to plot Alaska
-    # as a single entity, we need to shift where the projection thinks
-    # the maps central meridian lies.
+        with lock:
+            if plot_label not in self._built:
+                self._built[plot_label] = self._build(plot_label)
 
-    # Define new center meridian
-    cl = 90
+            return self._built[plot_label]
 
-    # Shift projections
-    dct_plot["state"][plot_label] = shift_meridian(dct_plot["state"][plot_label], cl)
-    dct_plot["county"][plot_label] = shift_meridian(dct_plot["county"][plot_label], cl)
+    def _build(self, plot_label):
+        region = self.regions[plot_label]
+        cache_dir = CACHE_DIR / "plot_geometry" / self.geometry_key(plot_label)
 
-    # HAWAII -----------------------------------
-    plot_label = "hawaii"
+        dct_geom = load_region_geometry(cache_dir) if self.use_cache else None
 
-    dct_plot["state"][plot_label] = gdf_state >> s.filter(s._.geoid == FIPS_HAWAII)
+        if dct_geom is None:
+            dct_geom = generate_region_geometry(
+                self._layers["county"],
+                self._layers["state"],
+                plot_label,
+                region,
+                self.epsg_code,
+            )
+            dct_geom = {
+                layer: gdf.drop(columns=VISIT_COLUMNS)
+                for layer, gdf in dct_geom.items()
+            }
+
+            if self.use_cache:
+                save_region_geometry(dct_geom, cache_dir)
+
+        # Only the visit attributes are joined on fresh
+        return {
+            layer: gdf.merge(
+                self._layers[layer][["geoid", *VISIT_COLUMNS]], on="geoid", how="left"
+            )
+            for layer, gdf in dct_geom.items()
+        }
+
+
+def generate_plot_data(
+    gdf_county, gdf_state, regions=PLOT_REGIONS, epsg_code=EPSG_CODE, use_cache=True
+):
+    """
+    Return the plot tables of every region, built lazily.
+
+    The projected region geometry only depends on the boundary files and the
+    region definition, so each region is built once and stored on disk. Visit
+    attributes are joined on fresh every run. See PlotTables.
+    """
+    return PlotTables(
+        gdf_county, gdf_state, regions=regions, epsg_code=epsg_code, use_cache=use_cache
+    )
 
-    dct_plot["county"][plot_label] = gdf_county >> s.filter(s._.statefp == FIPS_HAWAII)
 
-    # North Carolina -----------------------------------
-    plot_label = "north_carolina"
+def geometry_paths(geometries):
+    """
+    Build one compound matplotlib Path per polygon geometry.
 
-    dct_plot["state"][plot_label] = gdf_state >> s.filter(s._.geoid == FIPS_NC)
+    Coordinates for every geometry are extracted in a single shapely call and
+    split per geometry, instead of building a patch per polygon part. As in
+    plotnine's PolygonPatch, exteriors run clockwise and holes
+    counter-clockwise so holes are left unfilled.
 
-    dct_plot["county"][plot_label] = gdf_county >> s.filter(s._.statefp == FIPS_NC)
+    Parameters
+    ----------
+    geometries : array-like of shapely Polygon or MultiPolygon
 
-    # North Carolina w/ Adjacent States -----------------------------------
-    plot_label = "north_carolina_w_adjacent_states"
+    Returns
+    -------
+    list of matplotlib.path.Path
+    """
+    geometries = shapely.orient_polygons(np.asarray(geometries), exterior_cw=True)
 
-    dct_plot["state"][plot_label] = gdf_state >> s.filter(
-        s._.geoid.isin(FIPS_NC_ADJACENT)
-    )
+    parts, part_geom = shapely.get_parts(geometries, return_index=True)
+    rings, ring_part = shapely.get_rings(parts, return_index=True)
+    coords, coord_ring = shapely.get_coordinates(rings, return_index=True)
+    coord_geom = part_geom[ring_part][coord_ring]
 
-    dct_plot["county"][plot_label] = gdf_county >> s.filter(
-        s._.statefp.isin(FIPS_NC_ADJACENT)
-    )
+    # Every ring starts with a MOVETO and is closed by its repeated end point
+    codes = np.full(len(coords), Path.LINETO, dtype=Path.code_type)
+    codes[np.flatnonzero(np.diff(coord_ring, prepend=-1))] = Path.MOVETO
 
-    # US WITH ALASKA + HAWAII INSETS -----------------------------------
-    plot_label = "us_inset"
+    splits = np.searchsorted(coord_geom, np.arange(1, len(geometries)))
 
-    # Exclude territories — shift_geometry only handles the 50 states
-    gdf_state_50 = gdf_state >> s.filter(~s._.geoid.isin(TERRITORY_CODES))
-    gdf_county_50 = gdf_county >> s.filter(~s._.statefp.isin(TERRITORY_CODES))
+    return [
+        Path(vertices, path_codes)
+        for vertices, path_codes in zip(
+            np.split(coords, splits), np.split(codes, splits)
+        )
+    ]
 
-    dct_plot["state"][plot_label] = shift_geometry(gdf_state_50)
-    dct_plot["county"][plot_label] = shift_geometry(gdf_county_50)
 
-    return dct_plot
+def expand_range(lower, upper, mult=SCALE_EXPANSION):
+    """Pad a range on both sides, like plotnine's default continuous scale."""
+    pad = (upper - lower) * mult
+    return lower - pad, upper + pad
 
 
 class Plot:
-    def __init__(self, plot_tables, plot_params, units="in", dpi=PLOT_DPI):
+    def __init__(
+        self,
+        plot_tables,
+        plot_params,
+        units="in",
+        dpi=PLOT_DPI,
+        backend=PLOT_BACKEND,
+        vector_formats=PLOT_VECTOR_FORMATS,
+    ):
+        if backend not in PLOT_BACKENDS:
+            raise ValueError(
+                f"Unknown plot backend '{backend}'. Expected one of {PLOT_BACKENDS}."
+            )
+
         self.plot_tables = plot_tables
         self.plot_params = plot_params
         self.units = units
         self.dpi = dpi
+        self.backend = backend
+        self.vector_formats = list(vector_formats)
         self.plot_dir = PROJECT_ROOT / "data" / "plots"
+        self._layer_data = {}
 
     def __call__(self, plot_label, print_plot=True, save_plot=True):
-        p = self.generate_plot(plot_label=plot_label)
-
         if save_plot:
-            self.save_plot(plot=p, plot_label=plot_label)
+            self.save(plot_label=plot_label)
 
         if print_plot:
-            print(p)
+            if self.backend == "matplotlib":
+                self.generate_figure(plot_label=plot_label)
+                plt.show()
+            else:
+                print(self.generate_plot(plot_label=plot_label))
+
+    def plot_path(self, plot_label, format="png"):
+        return self.plot_dir / f"{plot_label}.{format}"
+
+    def output_paths(self, plot_label):
+        """Every file save() writes for a region: the PNG, then vector copies."""
+        return [
+            self.plot_path(plot_label, format)
+            for format in ["png", *self.vector_formats]
+        ]
+
+    def output_mode(self, plot_label, dpi=None):
+        """Return "tiled" above PLOT_TILE_MAX_PIXELS of raster, else "single"."""
+        dpi = dpi or self.dpi
+        pixels = (
+            self.plot_params["dimensions"]["width"][plot_label]
+            * self.plot_params["dimensions"]["height"][plot_label]
+            * dpi**2
+        )
+
+        return "tiled" if pixels > PLOT_TILE_MAX_PIXELS else "single"
 
+    def layer_data(self, layer, plot_label):
+        """
+        Return a region layer with `visited` as a Categorical.
+
+        Built once per layer and region. The table is a shallow copy, so the
+        geometry is shared with plot_tables rather than copied.
+        """
+        key = (layer, plot_label)
+        if key not in self._layer_data:
+            # Ensure visited is Categorical so discrete scales work regardless
+            # of how the data was cached or serialized upstream.
+            data = self.plot_tables[layer][plot_label].copy(deep=False)
+            data["visited"] = pd.Categorical(data["visited"])
+            self._layer_data[key] = data
+
+        return self._layer_data[key]
+
+    @traced(attrs=("plot_label",))
     def generate_plot(self, plot_label):
-        # Ensure visited is Categorical so discrete scales work regardless of
-        # how the data was cached or serialized upstream.
-        county_data = self.plot_tables["county"][plot_label].copy()
-        county_data["visited"] = pd.Categorical(county_data["visited"])
-        state_data = self.plot_tables["state"][plot_label].copy()
-        state_data["visited"] = pd.Categorical(state_data["visited"])
+        county_data = self.layer_data("county", plot_label)
+        state_data = self.layer_data("state", plot_label)
 
         p = (
             p9.ggplot()
@@ -161,23 +545,160 @@ class Plot:
                 ),
                 axis_text=p9.element_blank(),
                 axis_ticks=p9.element_blank(),
-                panel_border=p9.element_rect(fill="#000000", color="#000000", size=2),
+                panel_border=p9.element_rect(
+                    fill="#000000", color="#000000", size=PANEL_BORDER_WIDTH
+                ),
                 panel_grid_major=p9.element_blank(),
                 panel_grid_minor=p9.element_blank(),
             )
         )
 
-        if plot_label == "hawaii":
-            p += p9.coord_cartesian(xlim=(-162, -153), ylim=(16, 26))
+        if plot_label in COORD_LIMITS:
+            xlim, ylim = COORD_LIMITS[plot_label]
+            p += p9.coord_cartesian(xlim=xlim, ylim=ylim)
 
         return p
 
-    def save_plot(self, plot, plot_label):
-        plot_path = self.plot_dir / f"{plot_label}.png"
-        plot.save(
-            filename=plot_path,
+    def layer_facecolors(self, visited, layer):
+        """Return the RGBA fill of each shape in a layer from its 0/1 visited flag."""
+        visited = pd.Series(visited).astype(int)
+        facecolors = to_rgba_array(visited.map(self.plot_params["color"]))
+
+        # Only the state layer maps opacity, and only onto the fill
+        if layer == "state":
+            facecolors[:, 3] = visited.map(self.plot_params["opacity"])
+
+        return facecolors
+
+    def layer_collection(self, gdf, layer, zorder):
+        """Draw one layer as a single PathCollection, styled as in generate_plot."""
+        return PathCollection(
+            geometry_paths(gdf.geometry.values),
+            facecolors=self.layer_facecolors(gdf["visited"], layer),
+            edgecolors=self.plot_params["entity_border"]["color"][layer],
+            linewidths=self.plot_params["entity_border"]["thickness"][layer]
+            * LINEWIDTH_FACTOR,
+            zorder=zorder,
+        )
+
+    @traced(attrs=("plot_label",))
+    def generate_figure(self, plot_label):
+        """
+        Draw a region straight to a matplotlib figure.
+
+        Produces the same image as generate_plot: the same layers, colors,
+        border widths, panel margins, scale expansion and panel border.
+        """
+        width = self.plot_params["dimensions"]["width"][plot_label]
+        height = self.plot_params["dimensions"]["height"][plot_label]
+        gdf_county = self.plot_tables["county"][plot_label]
+        gdf_state = self.plot_tables["state"][plot_label]
+
+        fig = plt.figure(figsize=(width, height))
+
+        # Margins are the same absolute size on every side. Computed the way
+        # plotnine does, so the panel edges round to the same pixels.
+        margin_x = PLOT_MARGIN
+        margin_y = PLOT_MARGIN * (width / height)
+        ax = fig.add_axes(
+            (margin_x, margin_y, (1 - margin_x) - margin_x, (1 - margin_y) - margin_y)
+        )
+        ax.set_axis_off()
+
+        ax.add_collection(self.layer_collection(gdf_county, "county", zorder=1))
+        ax.add_collection(self.layer_collection(gdf_state, "state", zorder=2))
+
+        if plot_label in COORD_LIMITS:
+            xlim, ylim = COORD_LIMITS[plot_label]
+        else:
+            xmin, ymin, xmax, ymax = (
+                np.r_[gdf_county.total_bounds, gdf_state.total_bounds].reshape(2, 4).T
+            )
+            xlim, ylim = (xmin.min(), xmax.max()), (ymin.min(), ymax.max())
+
+        ax.set_xlim(expand_range(*xlim))
+        ax.set_ylim(expand_range(*ylim))
+
+        ax.add_patch(
+            Rectangle(
+                (0, 0),
+                1,
+                1,
+                transform=ax.transAxes,
+                fill=False,
+                edgecolor="#000000",
+                linewidth=PANEL_BORDER_WIDTH,
+                clip_on=False,
+                zorder=3,
+            )
+        )
+
+        return fig
+
+    def figure(self, plot_label, dpi=None):
+        """Return the laid-out matplotlib figure of a region, for either backend."""
+        if self.backend == "matplotlib":
+            return self.generate_figure(plot_label=plot_label)
+
+        return (
+            self.generate_plot(plot_label=plot_label)
+            .save_helper(
+                height=self.plot_params["dimensions"]["height"][plot_label],
+                width=self.plot_params["dimensions"]["width"][plot_label],
+                units=self.units,
+                dpi=dpi or self.dpi,
+                verbose=False,
+            )
+            .figure
+        )
+
+    @traced(attrs=("plot_label", "dpi", "format"))
+    def render(self, plot_label, filename, dpi=None, format=None):
+        """Render a region with the selected backend and save it to filename."""
+        dpi = dpi or self.dpi
+
+        if self.backend == "matplotlib":
+            fig = self.generate_figure(plot_label=plot_label)
+            fig.savefig(filename, dpi=dpi, format=format)
+            plt.close(fig)
+            return
+
+        self.generate_plot(plot_label=plot_label).save(
+            filename=filename,
+            format=format,
             height=self.plot_params["dimensions"]["height"][plot_label],
             width=self.plot_params["dimensions"]["width"][plot_label],
             units=self.units,
-            dpi=self.dpi,
+            dpi=dpi,
+            verbose=False,
         )
+
+    @traced(attrs=("plot_label",))
+    def save(self, plot_label, path=None):
+        """
+        Write a region's PNG, and any vector copies, to plot_dir.
+
+        With `path`, only that file is written instead, in the format given by
+        its suffix. Rasters above PLOT_TILE_MAX_PIXELS are rendered in strips
+        and streamed into the PNG, so the full raster is never held in memory.
+        """
+        paths = self.output_paths(plot_label) if path is None else [path]
+
+        for filename in paths:
+            format = filename.suffix.lstrip(".").lower()
+
+            if format == "png" and self.output_mode(plot_label) == "tiled":
+                fig = self.figure(plot_label=plot_label)
+                save_png_tiled(fig, filename, dpi=self.dpi)
+                plt.close(fig)
+            else:
+                self.render(plot_label=plot_label, filename=filename, format=format)
+
+    def save_plot(self, plot, plot_label):
+        """
+        Save a region to plot_dir, as save() does.
+
+        Kept for callers from before save(). `plot` is not used: the region is
+        drawn again from plot_tables with the selected backend.
+        """
+        self.save(plot_label=plot_label)
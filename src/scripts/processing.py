@@ -3,31 +3,27 @@
 import datetime as dt
 
 import pandas as pd
-import siuba as s
 
 from config import DATE_FORMAT, NA_DATE
+from scripts.perf import traced
 
 # ---------------------------------------------------------------------------- #
 # CLASSES / FUNCTIONS #
 
 
-def verify_visit(date_input: dt.datetime) -> int:
-    """Return 1 if the date represents a real visit, 0 if it is the NA sentinel."""
-    return 0 if date_input == NA_DATE else 1
+def verify_visit(dates: pd.Series) -> pd.Series:
+    """Return 1 where the date is a real visit, 0 where it is the NA sentinel."""
+    return (dates != NA_DATE).astype(int)
 
 
 def parse_dates(
-    date: str | None,
+    dates: pd.Series,
     na_date: dt.datetime,
     date_format: str = DATE_FORMAT,
-) -> dt.datetime:
-    """Parse a date string into a datetime, returning na_date on failure."""
-    if isinstance(date, str):
-        try:
-            return dt.datetime.strptime(date, date_format)
-        except ValueError:
-            return na_date
-    return na_date
+) -> pd.Series:
+    """Parse date strings into datetimes, returning na_date where parsing fails."""
+    parsed = pd.to_datetime(dates, format=date_format, errors="coerce")
+    return parsed.fillna(na_date)
 
 
 def convert_visited_to_categorical(df):
@@ -38,20 +34,21 @@ def convert_visited_to_categorical(df):
 
 def process_data_visited(df):
     # Convert date strings to datetime
-    df.loc[:, "date"] = df["date"].apply(lambda x: parse_dates(x, na_date=NA_DATE))
+    dates = parse_dates(df["date"], na_date=NA_DATE)
+    df["date"] = dates
 
     # Verify state and county codes have leading zeros
     # State Codes
-    df.loc[:, "state_code"] = df["state_code"].apply(lambda x: x.zfill(2))
+    df.loc[:, "state_code"] = df["state_code"].str.zfill(2)
 
     # County Codes
-    df.loc[:, "county_code"] = df["county_code"].apply(lambda x: x.zfill(3))
+    df.loc[:, "county_code"] = df["county_code"].str.zfill(3)
 
     # Create GEOID
     df.loc[:, "geoid"] = df["state_code"] + df["county_code"]
 
     # Create boolean column for visited / not visited
-    df.loc[:, "visited"] = df["date"].apply(verify_visit)
+    df.loc[:, "visited"] = verify_visit(dates)
 
     return df
 
@@ -59,32 +56,22 @@ def process_data_visited(df):
 def create_state_visited(df_county):
     # Create table indicating which states I visited.
     df_state = (
-        df_county
-        >> s.group_by(s._.state_code)
-        >> s.mutate(
-            visited=s._.visited.max(),
+        df_county[["state", "state_code"]]
+        .assign(
+            visited=df_county.groupby("state_code")["visited"].transform("max"),
         )
-        >> s.ungroup()
-        >> s.distinct(s._.state, s._.state_code, s._.visited)
+        .drop_duplicates()
     )
 
     # Create table indicating the earliest date I visited a state.
-    df_state_date = (
-        df_county
-        >> s.filter(s._.visited == 1)
-        >> s.group_by(s._.state_code)
-        >> s.summarize(
-            date=s._.date.min(),
-        )
+    sr_state_date = (
+        df_county.loc[df_county["visited"] == 1].groupby("state_code")["date"].min()
     )
 
-    # Join date of state visit to visit record. NA's induced are states that
+    # Look up date of state visit by state code. NA's induced are states that
     # I have not visited.
-    df_state = (
-        df_state
-        >> s.left_join(s._, df_state_date, by="state_code")
-        >> s.rename(geoid=s._.state_code)
-    )
+    df_state["date"] = df_state["state_code"].map(sr_state_date)
+    df_state = df_state.rename(columns={"state_code": "geoid"}).reset_index(drop=True)
 
     # Fill NA dates with placeholder date.
     df_state.loc[:, "date"] = df_state["date"].fillna(NA_DATE)
@@ -92,6 +79,12 @@ def create_state_visited(df_county):
     return df_state
 
 
+def join_visits(gdf, df_visits):
+    """Left join visit columns onto a boundary layer, using geoid as the index."""
+    return gdf.join(df_visits.set_index("geoid"), on="geoid")
+
+
+@traced()
 def process_data(df_visited, gdf_county, gdf_state):
     # Process county visit data
     df_visited_county = process_data_visited(df_visited)
@@ -102,13 +95,8 @@ def process_data(df_visited, gdf_county, gdf_state):
     # Join visit data to shapefiles
     select_cols = ["geoid", "visited", "date"]
 
-    gdf_visited_county = gdf_county >> s.left_join(
-        s._, df_visited_county[select_cols], by="geoid"
-    )
-
-    gdf_visited_state = gdf_state >> s.left_join(
-        s._, df_visited_state[select_cols], by="geoid"
-    )
+    gdf_visited_county = join_visits(gdf_county, df_visited_county[select_cols])
+    gdf_visited_state = join_visits(gdf_state, df_visited_state[select_cols])
 
     # Convert visit column to categorical after the join so the dtype is preserved
     gdf_visited_county = convert_visited_to_categorical(gdf_visited_county)
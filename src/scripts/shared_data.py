@@ -0,0 +1,242 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import io
+import json
+import os
+import threading
+
+import numpy as np
+
+from config import PLOT_BACKEND, PLOT_PARAMS
+from scripts.adjacency import import_county_graph
+from scripts.data import (
+    VISIT_TABLE_PATH,
+    import_data_visit,
+    import_map_layers,
+    import_shapefiles,
+)
+from scripts.history import load_visit_history
+from scripts.map_layers import build_frontier_payload
+from scripts.map_layers import load_map_payload as read_map_payload
+from scripts.plotting import Plot, generate_plot_data
+from scripts.processing import process_data
+from scripts.table_index import VisitTableIndex
+from scripts.visit_log import VISIT_LOG_PATH
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Process-wide cache shared by every Streamlit page and session. Each entry is
+# stored as (key, value) and rebuilt when its key changes. Every name has its
+# own lock, so a slow build only holds up callers waiting on the same entry.
+_CACHE = {}
+_LOCKS = {}
+_LOCKS_GUARD = threading.Lock()
+
+
+def _stat_key(path):
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def visit_table_key():
+    """
+    Return a key that changes whenever the visit table or visit log is written.
+
+    Built from the files' inode, modification time and size, so checking it
+    on every rerun costs two stat calls rather than reading both files.
+    """
+    return _stat_key(VISIT_TABLE_PATH), _stat_key(VISIT_LOG_PATH)
+
+
+def _cached(name, key, build):
+    """Return the cached value for `name`, rebuilding it if `key` has changed."""
+    with _LOCKS_GUARD:
+        lock = _LOCKS.setdefault(name, threading.RLock())
+
+    with lock:
+        entry = _CACHE.get(name)
+        if entry is None or entry[0] != key:
+            entry = (key, build())
+            _CACHE[name] = entry
+
+        return entry[1]
+
+
+def _freeze(df):
+    """
+    Return a copy of a frame whose column arrays are read-only.
+
+    The copy is deep, so arrays shared with the frames it was built from, such
+    as the cached boundary layers, stay writeable.
+    """
+    frozen = df.copy()
+    for column in frozen.columns:
+        array = np.asarray(frozen[column].values)
+        array.flags.writeable = False
+        while isinstance(array.base, np.ndarray):
+            array = array.base
+            array.flags.writeable = False
+
+    return frozen
+
+
+def _view(df):
+    """
+    Return a shallow copy that shares data with a cached frame from _freeze.
+
+    Adding, dropping or reassigning columns on the view leaves the cached frame
+    untouched, and modifying values in place raises a ValueError.
+    """
+    return df.copy(deep=False)
+
+
+def _build_data():
+    # Boundary layers never change with the visit table, so they are read once
+    # per process and only the visit processing reruns on a CSV change.
+    gdf_county, gdf_state = _cached("boundaries", None, import_shapefiles)
+
+    df = import_data_visit()
+    counties, states = process_data(
+        df_visited=df,
+        gdf_county=gdf_county,
+        gdf_state=gdf_state,
+    )
+
+    return _freeze(df), _freeze(counties), _freeze(states)
+
+
+def load_data():
+    """Return the processed visit table and county and state layers."""
+    df, counties, states = _cached("data", visit_table_key(), _build_data)
+
+    return _view(df), _view(counties), _view(states)
+
+
+def load_history():
+    """Return the visit history, rebuilt when the visit table or log changes."""
+    return _cached("history", visit_table_key(), load_visit_history)
+
+
+def load_data_as_of(when):
+    """
+    Return the visit table as it stood at `when`, and the county and state
+    layers processed from it, as load_data does for the current table.
+
+    Only the history and the boundary layers are cached; each call reruns
+    process_data on the historical table.
+    """
+    gdf_county, gdf_state = _cached("boundaries", None, import_shapefiles)
+
+    df = load_history().as_of(when, blank=np.nan)
+    counties, states = process_data(
+        df_visited=df,
+        gdf_county=gdf_county,
+        gdf_state=gdf_state,
+    )
+
+    return df, counties, states
+
+
+def load_table_index():
+    """Return the visit table sorted and indexed for the Data Table page."""
+
+    def build():
+        df, _, _ = load_data()
+        return VisitTableIndex(df)
+
+    return _cached("table_index", visit_table_key(), build)
+
+
+def load_plot_data():
+    """
+    Return the region plot tables of the current visit table.
+
+    Each region is built the first time a page asks for it, then kept until
+    the visit table changes. Lookups return shallow copies, like _view.
+    """
+
+    def build():
+        _, counties, states = load_data()
+        return generate_plot_data(counties, states)
+
+    return _cached("plot", visit_table_key(), build)
+
+
+def load_plot_png(plot_label, dpi):
+    """
+    Return a region plot as PNG bytes, rendering it only on a cache miss.
+
+    One render is kept per region and DPI, keyed on the visit table and log
+    file stats and the plot backend, so reruns and downloads reuse the same
+    bytes.
+    """
+
+    def build():
+        plotter = Plot(
+            plot_tables=load_plot_data(),
+            plot_params=PLOT_PARAMS,
+            backend=PLOT_BACKEND,
+        )
+        buf = io.BytesIO()
+        plotter.render(plot_label, filename=buf, dpi=dpi, format="png")
+        return buf.getvalue()
+
+    return _cached(
+        f"plot_png__{plot_label}__{dpi}",
+        (visit_table_key(), PLOT_BACKEND),
+        build,
+    )
+
+
+def load_map_layers(level):
+    """Return the simplified county and state layers for a map detail level."""
+    return _cached(f"map_layers__{level}", None, lambda: import_map_layers(level))
+
+
+def load_map_payload(level):
+    """
+    Return the map layers of a detail level as parsed GeoJSON, keyed by layer.
+
+    The payload comes from the on-disk cache, or is built on a miss, and is
+    read and parsed once per process and visit table. The dicts are shared by
+    every session, so callers must not modify them.
+    """
+
+    def build():
+        _, counties, states = load_data()
+        county_geom, state_geom = load_map_layers(level)
+        payload = read_map_payload(level, counties, states, county_geom, state_geom)
+        return {layer: json.loads(text) for layer, text in payload.items()}
+
+    return _cached(f"map_payload__{level}", visit_table_key(), build)
+
+
+def load_county_graph():
+    """Return the county adjacency graph, read once per process."""
+    return _cached("county_graph", None, import_county_graph)
+
+
+def load_frontier(relation="border"):
+    """Return the geoids of the unvisited counties next to a visited one."""
+
+    def build():
+        _, counties, _ = load_data()
+        visited = counties["geoid"][counties["visited"] == 1]
+        return load_county_graph().frontier(visited, relation)
+
+    return _cached(f"frontier__{relation}", visit_table_key(), build)
+
+
+def load_frontier_payload(level):
+    """Return the frontier overlay GeoJSON for a map detail level."""
+
+    def build():
+        county_geom, _ = load_map_layers(level)
+        return build_frontier_payload(level, county_geom, load_frontier())
+
+    return _cached(f"frontier_payload__{level}", visit_table_key(), build)
@@ -0,0 +1,123 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import numpy as np
+import pandas as pd
+
+from config import NA_DATE
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Columns shown on the Data Table page, with their display names
+DISPLAY_COLUMNS = {
+    "state_name": "State",
+    "county_name": "County",
+    "geoid": "FIPS",
+    "date_str": "Date Visited",
+    "notes": "Notes",
+}
+
+DISPLAY_DATE_FORMAT = "%B %d, %Y"
+
+
+class VisitTableIndex:
+    """
+    The visit table in display order, with lookups for the Data Table filters.
+
+    Rows are sorted visited first, then most recent visit first, so visited
+    rows form one block at the top with years descending. The status and year
+    filters then select a contiguous range of rows. Each state keeps the
+    positions of its rows, so the state filter is a lookup rather than a scan.
+    Built once per visit table.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Processed visit table, as returned by load_data.
+    """
+
+    def __init__(self, df):
+        df = df.sort_values(["visited", "date"], ascending=[False, False])
+
+        self.n_visited = int((df["visited"] == 1).sum())
+
+        self.table = pd.DataFrame(
+            {
+                "state_name": pd.Categorical(df["state_name"]),
+                "county_name": df["county_name"].to_numpy(),
+                "geoid": df["geoid"].to_numpy(),
+                "date_str": np.where(
+                    df["date"] != NA_DATE,
+                    df["date"].dt.strftime(DISPLAY_DATE_FORMAT),
+                    "",
+                ),
+                "notes": df["notes"].to_numpy(),
+                "year": df["date"].dt.year.to_numpy(),
+            }
+        )
+
+        # Visit years of the visited block, negated so they ascend
+        self._neg_years = -self.table["year"].to_numpy()[: self.n_visited]
+        self.years = sorted(set(-self._neg_years))
+
+        states = self.table["state_name"].cat
+        codes = states.codes.to_numpy()
+        order = np.argsort(codes, kind="stable")
+        splits = np.searchsorted(codes[order], np.arange(1, len(states.categories)))
+        self.states = list(states.categories)
+        self._state_rows = dict(zip(self.states, np.split(order, splits)))
+
+    def __len__(self):
+        return len(self.table)
+
+    def _year_range(self, first, last):
+        """Row range of the visited rows with a visit year in [first, last]."""
+        return (
+            int(np.searchsorted(self._neg_years, -last, side="left")),
+            int(np.searchsorted(self._neg_years, -first, side="right")),
+        )
+
+    def rows(self, states=(), status="All", years=None):
+        """
+        Return the positions, in display order, of rows matching the filters.
+
+        Parameters
+        ----------
+        states : list of str, optional
+            State names to keep. Every state when empty.
+        status : {"All", "Visited", "Not visited"}, optional
+        years : tuple of int, optional
+            First and last visit year to keep. Only applied to "Visited".
+
+        Returns
+        -------
+        numpy.ndarray
+        """
+        start, stop = 0, len(self.table)
+        if status == "Visited":
+            stop = self.n_visited
+            if years is not None:
+                start, stop = self._year_range(*years)
+        elif status == "Not visited":
+            start = self.n_visited
+
+        if not states:
+            return np.arange(start, stop)
+
+        rows = np.sort(np.concatenate([self._state_rows[state] for state in states]))
+        return rows[np.searchsorted(rows, start) : np.searchsorted(rows, stop)]
+
+    def count_visited(self, rows):
+        """Return how many of the selected rows are visited counties."""
+        return int(np.searchsorted(rows, self.n_visited))
+
+    def page(self, rows, page, page_size):
+        """Return one page of the selected rows, with display column names."""
+        start = (page - 1) * page_size
+        rows = rows[start : start + page_size]
+
+        return (
+            self.table.iloc[rows][list(DISPLAY_COLUMNS)]
+            .rename(columns=DISPLAY_COLUMNS)
+            .reset_index(drop=True)
+        )
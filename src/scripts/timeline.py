@@ -0,0 +1,231 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+from pathlib import Path
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib import animation
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+from config import TIMELINE_DPI, TIMELINE_FPS, TIMELINE_HOLD_SECONDS
+from scripts.export import GifWriter
+from scripts.perf import traced
+from scripts.plotting import Plot
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+TIMELINE_FORMATS = ["gif", "mp4", "frames"]
+
+# Colors in the GIF palette, shared by every frame
+GIF_COLORS = 256
+
+
+def timeline_format(path):
+    """Return the output format implied by a path: its suffix, or "frames"."""
+    suffix = Path(path).suffix.lower().lstrip(".")
+    if not suffix:
+        return "frames"
+    if suffix not in TIMELINE_FORMATS:
+        raise ValueError(
+            f"Unknown timeline format '{suffix}'. Expected a .gif or .mp4 file, "
+            "or a directory for PNG frames."
+        )
+
+    return suffix
+
+
+def frame_dates(dates, freq=None):
+    """
+    Return the sorted dates at which the timeline advances.
+
+    Parameters
+    ----------
+    dates : pandas.Series
+        Visit dates of the visited counties.
+    freq : str, optional
+        pandas period frequency ("W", "M", "Y") to group visits by, one frame
+        per period. By default there is one frame per distinct visit date.
+
+    Returns
+    -------
+    pandas.DatetimeIndex
+        The last instant covered by each frame.
+    """
+    dates = pd.DatetimeIndex(dates)
+    if freq is None:
+        return dates.unique().sort_values()
+
+    periods = dates.to_period(freq).unique().sort_values()
+    return periods.end_time
+
+
+class Timeline:
+    """
+    Time-lapse of a region's counties filling in by visit date.
+
+    The region is drawn once with the matplotlib renderer. Each frame only
+    replaces the fill colors of the county and state collections and updates
+    the date label, so the geometry is converted to paths a single time and
+    frames cost one Agg draw each.
+
+    Parameters
+    ----------
+    plot_tables : dict
+        Output of generate_plot_data.
+    plot_params : dict
+    plot_label : str
+        Region to animate, e.g. "us_inset".
+    dpi : int, optional
+    freq : str, optional
+        Frame grouping, see frame_dates.
+    """
+
+    def __init__(
+        self, plot_tables, plot_params, plot_label, dpi=TIMELINE_DPI, freq=None
+    ):
+        self.plot_label = plot_label
+        self.dpi = dpi
+
+        plotter = Plot(
+            plot_tables=plot_tables,
+            plot_params=plot_params,
+            dpi=dpi,
+            backend="matplotlib",
+        )
+        self.fig = plotter.generate_figure(plot_label=plot_label)
+        self.fig.set_dpi(dpi)
+        FigureCanvasAgg(self.fig)
+
+        # generate_figure adds the county collection first, then the state one
+        ax = self.fig.axes[0]
+        self._layers = {}
+        for layer, collection in zip(["county", "state"], ax.collections):
+            gdf = plot_tables[layer][plot_label]
+            n_shapes = len(gdf)
+
+            self._layers[layer] = {
+                "collection": collection,
+                "date": gdf["date"].to_numpy(dtype="datetime64[ns]"),
+                "visited": gdf["visited"].astype(int).to_numpy() == 1,
+                "colors": (
+                    plotter.layer_facecolors(np.zeros(n_shapes), layer),
+                    plotter.layer_facecolors(np.ones(n_shapes), layer),
+                ),
+            }
+
+        counties = self._layers["county"]
+        self.dates = frame_dates(counties["date"][counties["visited"]], freq=freq)
+
+        self.label = ax.text(
+            0.015,
+            0.975,
+            "",
+            transform=ax.transAxes,
+            ha="left",
+            va="top",
+            fontsize=12,
+            zorder=4,
+            bbox={"facecolor": "#FFFFFF", "edgecolor": "none", "pad": 2},
+        )
+
+    def __len__(self):
+        return len(self.dates)
+
+    def update(self, date):
+        """Color the counties and states visited on or before `date`."""
+        date = np.datetime64(date, "ns")
+
+        n_visited = {}
+        for layer, data in self._layers.items():
+            visited = data["visited"] & (data["date"] <= date)
+            unvisited_colors, visited_colors = data["colors"]
+            data["collection"].set_facecolor(
+                np.where(visited[:, None], visited_colors, unvisited_colors)
+            )
+            n_visited[layer] = int(np.count_nonzero(visited))
+
+        self.label.set_text(
+            f"{pd.Timestamp(date):%b %d, %Y}   {n_visited['county']} counties"
+        )
+
+    def draw(self, date):
+        """
+        Draw the frame for `date` and return it as an RGBA array.
+
+        The array is a view of the canvas, overwritten by the next draw.
+        """
+        self.update(date)
+        self.fig.canvas.draw()
+        return np.asarray(self.fig.canvas.buffer_rgba())
+
+    def frames(self):
+        """Yield (date, RGBA array) for every frame, oldest first."""
+        for date in self.dates:
+            yield date, self.draw(date)
+
+    @traced(attrs=("fps",))
+    def save(self, path, fps=TIMELINE_FPS, hold=TIMELINE_HOLD_SECONDS):
+        """
+        Write the timeline as a GIF, an MP4, or a directory of PNG frames.
+
+        Parameters
+        ----------
+        path : path-like
+            A .gif or .mp4 file, or a directory (no suffix) for numbered PNG
+            frames. MP4 output needs ffmpeg on the PATH.
+        fps : int, optional
+        hold : float, optional
+            Seconds the last frame is shown before a GIF loops or an MP4
+            ends. Not used for frame directories.
+        """
+        path = Path(path)
+        format = timeline_format(path)
+
+        if not len(self.dates):
+            raise ValueError(f"No visits to animate in {self.plot_label}.")
+
+        if format == "mp4" and not animation.writers.is_available("ffmpeg"):
+            raise RuntimeError(
+                "Writing MP4 needs ffmpeg on the PATH. Write a .gif or a frame "
+                "directory instead."
+            )
+
+        if format == "frames":
+            path.mkdir(parents=True, exist_ok=True)
+            for number, (_, rgba) in enumerate(self.frames()):
+                Image.fromarray(rgba, "RGBA").save(path / f"frame_{number:04d}.png")
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        if format == "gif":
+            # The last frame has every visited color, so its palette covers
+            # every frame
+            palette = (
+                Image.fromarray(self.draw(self.dates[-1]), "RGBA")
+                .convert("RGB")
+                .quantize(GIF_COLORS, method=Image.Quantize.MEDIANCUT)
+            )
+            duration = round(1000 / fps)
+
+            with open(path, "wb") as f:
+                writer = GifWriter(f, palette)
+                for _, rgba in self.frames():
+                    writer.add_frame(rgba, duration)
+                writer.add_frame(rgba, round(hold * 1000))
+                writer.close()
+            return
+
+        writer = animation.FFMpegWriter(fps=fps)
+        with writer.saving(self.fig, path, dpi=self.dpi):
+            for date in self.dates:
+                self.update(date)
+                writer.grab_frame()
+            for _ in range(round(hold * fps)):
+                writer.grab_frame()
+
+    def close(self):
+        plt.close(self.fig)
@@ -0,0 +1,281 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+from pathlib import Path
+from xml.parsers import expat
+
+import numpy as np
+import pandas as pd
+import shapely
+
+from config import TRACK_CHUNK_SIZE, TRACK_TIMEZONE
+from scripts.data import import_data_visit_text, import_shapefiles
+from scripts.trips import apply_first_visits
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+TRACK_COLUMNS = ["lon", "lat", "time"]
+
+# Column names accepted in CSV tracks, mapped to TRACK_COLUMNS
+CSV_COLUMN_ALIASES = {
+    "lon": "lon",
+    "lng": "lon",
+    "long": "lon",
+    "longitude": "lon",
+    "lat": "lat",
+    "latitude": "lat",
+    "time": "time",
+    "timestamp": "time",
+    "datetime": "time",
+}
+
+GPX_POINT_TAGS = {"trkpt", "rtept", "wpt"}
+
+
+def _points_frame(lon, lat, time):
+    return pd.DataFrame(
+        {
+            "lon": np.asarray(lon, dtype=float),
+            "lat": np.asarray(lat, dtype=float),
+            "time": pd.to_datetime(time, utc=True, errors="coerce", format="ISO8601"),
+        }
+    )
+
+
+class _GPXPointHandler:
+    """Expat callbacks collecting the lon, lat and time of GPX points."""
+
+    def __init__(self):
+        self.lon, self.lat, self.time = [], [], []
+        self.in_point = False
+        self.text = None
+        self.local_names = {}
+
+    def local_name(self, name):
+        # Drop any namespace prefix, e.g. "gpx:trkpt"
+        if name not in self.local_names:
+            self.local_names[name] = name.rpartition(":")[2]
+        return self.local_names[name]
+
+    def start(self, name, attrs):
+        name = self.local_name(name)
+        if name in GPX_POINT_TAGS:
+            self.lon.append(attrs.get("lon"))
+            self.lat.append(attrs.get("lat"))
+            self.time.append(None)
+            self.in_point = True
+        elif name == "time" and self.in_point:
+            self.text = []
+
+    def characters(self, data):
+        if self.text is not None:
+            self.text.append(data)
+
+    def end(self, name):
+        name = self.local_name(name)
+        if name == "time" and self.text is not None:
+            self.time[-1] = "".join(self.text)
+            self.text = None
+        elif name in GPX_POINT_TAGS:
+            self.in_point = False
+
+    def flush(self):
+        """Return the completed points as a frame and keep any open point."""
+        n = len(self.lon) - self.in_point
+        df_points = _points_frame(self.lon[:n], self.lat[:n], self.time[:n])
+        self.lon, self.lat, self.time = self.lon[n:], self.lat[n:], self.time[n:]
+        return df_points
+
+
+def read_gpx_points(path, chunk_size=TRACK_CHUNK_SIZE, block_size=1 << 20):
+    """
+    Stream the points of a GPX file in chunks.
+
+    Track, route and waypoint points are collected with expat callbacks while
+    the file is fed in blocks, so no element tree is built and memory use is
+    bounded by `chunk_size` rather than the size of the file.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Columns `lon`, `lat` and `time` (UTC, NaT where missing).
+    """
+    handler = _GPXPointHandler()
+
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.StartElementHandler = handler.start
+    parser.EndElementHandler = handler.end
+    parser.CharacterDataHandler = handler.characters
+
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            parser.Parse(block, False)
+            if len(handler.lon) >= chunk_size:
+                yield handler.flush()
+        parser.Parse(b"", True)
+
+    if handler.lon:
+        yield handler.flush()
+
+
+def read_csv_points(path, chunk_size=TRACK_CHUNK_SIZE):
+    """Stream the points of a CSV track in chunks. See read_gpx_points."""
+    header = pd.read_csv(path, nrows=0).columns
+    columns = {
+        col: CSV_COLUMN_ALIASES[col.strip().lower()]
+        for col in header
+        if col.strip().lower() in CSV_COLUMN_ALIASES
+    }
+
+    missing = set(TRACK_COLUMNS) - set(columns.values())
+    if missing:
+        raise ValueError(f"Track {path} is missing columns: {sorted(missing)}")
+
+    for chunk in pd.read_csv(path, usecols=list(columns), chunksize=chunk_size):
+        chunk = chunk.rename(columns=columns)
+        yield _points_frame(chunk["lon"], chunk["lat"], chunk["time"])
+
+
+def read_track_points(path, chunk_size=TRACK_CHUNK_SIZE):
+    """Stream the points of a .gpx or .csv track in chunks."""
+    path = Path(path)
+    readers = {".gpx": read_gpx_points, ".csv": read_csv_points}
+
+    if path.suffix.lower() not in readers:
+        raise ValueError(
+            f"Unsupported track format '{path.suffix}'. Expected one of {list(readers)}."
+        )
+
+    return readers[path.suffix.lower()](path, chunk_size=chunk_size)
+
+
+class CountyLocator:
+    """Resolve longitude/latitude points to county geoids with an STRtree."""
+
+    def __init__(self, gdf_county):
+        gdf_county = gdf_county.to_crs("EPSG:4326")
+
+        self.geoids = gdf_county["geoid"].to_numpy()
+        self.geometries = gdf_county.geometry.to_numpy()
+
+        shapely.prepare(self.geometries)
+        self.tree = shapely.STRtree(self.geometries)
+
+    def __call__(self, lon, lat):
+        """
+        Return the geoid of the county containing each point.
+
+        Points outside every county (e.g. offshore) get None. A point on a
+        shared border is assigned to one of the counties it touches.
+        """
+        points = shapely.points(lon, lat)
+        point_idx, county_idx = self.tree.query(points, predicate="intersects")
+
+        # Keep the first match per point
+        point_idx, first = np.unique(point_idx, return_index=True)
+
+        geoids = np.full(len(points), None, dtype=object)
+        geoids[point_idx] = self.geoids[county_idx[first]]
+
+        return geoids
+
+
+def first_county_times(path, locator, chunk_size=TRACK_CHUNK_SIZE):
+    """
+    Return the first time a track enters each county.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Columns `geoid`, `first_seen` (UTC) and `points`, ordered by
+        `first_seen`. Points without a timestamp are ignored.
+    """
+    partials = []
+
+    for df_points in read_track_points(path, chunk_size=chunk_size):
+        df_points = df_points.dropna()
+        df_points["geoid"] = locator(df_points["lon"], df_points["lat"])
+
+        partials.append(
+            df_points.dropna(subset="geoid")
+            .groupby("geoid")["time"]
+            .agg(first_seen="min", points="size")
+        )
+
+    if not partials:
+        return pd.DataFrame(
+            {
+                "geoid": pd.Series(dtype=object),
+                "first_seen": pd.Series(dtype="datetime64[ns, UTC]"),
+                "points": pd.Series(dtype=int),
+            }
+        )
+
+    df_first = (
+        pd.concat(partials)
+        .groupby(level="geoid")
+        .agg({"first_seen": "min", "points": "sum"})
+        .reset_index()
+    )
+
+    return df_first.sort_values("first_seen", ignore_index=True)
+
+
+def ingest_tracks(
+    paths,
+    note=None,
+    timezone=TRACK_TIMEZONE,
+    chunk_size=TRACK_CHUNK_SIZE,
+    dry_run=False,
+):
+    """
+    Record first visits from one or more GPS tracks in one write.
+
+    Parameters
+    ----------
+    paths : list of path-like
+        GPX or CSV tracks. CSV tracks need longitude, latitude and time columns.
+    note : str, optional
+        Note recorded with each new visit. Defaults to the track file name.
+    timezone : str, optional
+        Timezone used to turn timestamps into visit dates.
+    chunk_size : int, optional
+        Track points read and resolved per batch.
+    dry_run : bool, optional
+        Report what would change without writing the table.
+
+    Returns
+    -------
+    dict
+        `counties`: first_county_times output per track; `added`: DataFrame
+        of new first visits.
+    """
+    gdf_county, _ = import_shapefiles()
+    locator = CountyLocator(gdf_county)
+
+    df = import_data_visit_text()
+    geoids = df["state_code"].str.zfill(2) + df["county_code"].str.zfill(3)
+    rows = pd.Series(df.index, index=geoids)
+
+    dct_counties, frames = {}, []
+    for path in map(Path, paths):
+        df_first = first_county_times(path, locator, chunk_size=chunk_size)
+        dct_counties[path.name] = df_first
+
+        frames.append(
+            pd.DataFrame(
+                {
+                    "row": df_first["geoid"].map(rows),
+                    "date": df_first["first_seen"].dt.tz_convert(timezone).dt.date,
+                    "note": note or path.stem,
+                }
+            ).dropna(subset="row")
+        )
+
+    df_visits = pd.concat(frames, ignore_index=True).astype({"row": int})
+
+    return {
+        "counties": dct_counties,
+        "added": apply_first_visits(df, df_visits, dry_run=dry_run),
+    }
@@ -0,0 +1,290 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import datetime as dt
+import hashlib
+import json
+import re
+import unicodedata
+
+import pandas as pd
+
+from paths import DATA_DIR
+from scripts.data import import_data_visit_text, record_visit_events
+from scripts.visit_log import make_events
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+TRIP_DIR = DATA_DIR / "trips"
+
+# Trip files already applied to the visit table, with the hash of their
+# contents when they were applied.
+LEDGER_PATH = TRIP_DIR / "applied.json"
+
+TRIP_FILE_GLOB = "????-??-??__*.md"
+
+# Words that may trail a county name in a trip file but not in the visit table.
+# Longer suffixes come first so "city and borough" wins over "borough".
+NAME_SUFFIXES = [
+    ("city", "and", "borough"),
+    ("census", "area"),
+    ("county",),
+    ("parish",),
+    ("borough",),
+    ("municipality",),
+    ("municipio",),
+]
+
+NAME_ABBREVIATIONS = {"saint": "st", "sainte": "ste"}
+
+RE_DAY = re.compile(r"^###\s+(\d{4}-\d{2}-\d{2})\s*$")
+RE_COUNTY = re.compile(r"^[*-]\s+(.+),\s*([A-Za-z]{2})\s*$")
+RE_NOTE = re.compile(r"^\*\*Note:\*\*\s*(.+)$")
+
+
+def normalize_words(name):
+    """
+    Split a county name into lowercase ASCII words for matching.
+
+    Diacritics and punctuation are dropped and "Saint"/"Sainte" are folded into
+    "St"/"Ste", so "Doña Ana", "Dona Ana", "St. Mary's" and "Saint Marys" all
+    normalize consistently.
+    """
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode()
+    text = text.lower().replace("'", "")
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+
+    return [NAME_ABBREVIATIONS.get(word, word) for word in words]
+
+
+def name_key(words):
+    # Joined without spaces so "DeKalb" and "De Kalb" share a key
+    return "".join(words)
+
+
+def build_name_index(df):
+    """
+    Index visit table rows by (state abbreviation, normalized county name).
+
+    Some states have a county and an independent city with the same name
+    (e.g. Richmond, VA). Both rows share a key and are kept sorted by county
+    code; independent cities always carry the higher code.
+    """
+    index = {}
+    codes = df["county_code"].astype(int)
+
+    for row, state, county_name in zip(df.index, df["state"], df["county_name"]):
+        key = (state, name_key(normalize_words(county_name)))
+        index.setdefault(key, []).append(row)
+
+    return {
+        key: sorted(rows, key=lambda row: codes[row]) for key, rows in index.items()
+    }
+
+
+def resolve_county(index, county_name, state):
+    """
+    Return the visit table row for a trip file entry, or None if unknown.
+
+    The name is looked up as written, then without a suffix like "County".
+    Only if both fail is a trailing "city" read as an independent city, so
+    "Charles City County" and "Carson City" keep the "City" in their names.
+    """
+    words = normalize_words(county_name)
+    state = state.upper()
+
+    rows = index.get((state, name_key(words)))
+    if rows is not None:
+        return rows[0]
+
+    for suffix in NAME_SUFFIXES:
+        if tuple(words[-len(suffix) :]) == suffix:
+            words = words[: -len(suffix)]
+            break
+
+    rows = index.get((state, name_key(words)))
+    if rows is not None:
+        return rows[0]
+
+    if words and words[-1] == "city":
+        rows = index.get((state, name_key(words[:-1])))
+        if rows is not None:
+            return rows[-1]
+
+    return None
+
+
+def parse_trip_file(path):
+    """
+    Parse a trip file in the format described in data/trips/README.md.
+
+    Returns
+    -------
+    dict
+        `note`: note to record with each new visit; `visits`: list of
+        (date, county name, state) tuples; `errors`: lines under
+        "## Counties" that could not be parsed.
+    """
+    section = None
+    day = None
+    summary, visits, errors = [], [], []
+    note = None
+
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+
+        if line.startswith("## "):
+            section = line[3:].strip().lower()
+            continue
+
+        if match := RE_NOTE.match(line):
+            note = match.group(1).strip()
+            continue
+
+        if section == "summary" and line.startswith(("- ", "* ")):
+            summary.append(line[2:].strip().rstrip("."))
+
+        elif section == "counties" and line:
+            if match := RE_DAY.match(line):
+                day = dt.date.fromisoformat(match.group(1))
+            elif (match := RE_COUNTY.match(line)) and day is not None:
+                visits.append((day, match.group(1).strip(), match.group(2)))
+            else:
+                errors.append(line)
+
+    if note is None:
+        note = " / ".join(summary)
+
+    return {"note": note, "visits": visits, "errors": errors}
+
+
+def format_visit_date(date):
+    """Format a date the way the visit table stores it, e.g. 4/24/26."""
+    return f"{date.month}/{date.day}/{date:%y}"
+
+
+def load_ledger():
+    if not LEDGER_PATH.exists():
+        return {}
+
+    with open(LEDGER_PATH, "r") as f:
+        return json.load(f)
+
+
+def save_ledger(ledger):
+    with open(LEDGER_PATH, "w") as f:
+        json.dump(ledger, f, indent=4, sort_keys=True)
+        f.write("\n")
+
+
+def apply_first_visits(df, df_visits, dry_run=False):
+    """
+    Record the earliest visit to each county that has no date yet.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Visit table from import_data_visit_text.
+    df_visits : pandas.DataFrame
+        One row per sighting, with the visit table `row`, the `date` (a
+        datetime.date) and the `note` to record. Ties on date keep the first
+        sighting in frame order.
+    dry_run : bool, optional
+        Work out the changes without writing the table.
+
+    Returns
+    -------
+    pandas.DataFrame
+        The new first visits, with the county's state, code and name.
+    """
+    df_added = (
+        df_visits.sort_values("date", kind="stable")
+        .drop_duplicates("row")
+        .set_index("row")
+    )
+    df_added = df_added[df["date"].reindex(df_added.index) == ""]
+
+    if not dry_run and not df_added.empty:
+        rows = df_added.index
+        dates = df_added["date"].map(format_visit_date)
+        notes = df["notes"][rows].where(df["notes"][rows] != "", df_added["note"])
+
+        # Only the new visits are written, as events appended to the log
+        record_visit_events(make_events(df, rows, "add", dates=dates, notes=notes))
+
+        df.loc[rows, "date"] = dates
+        df.loc[rows, "notes"] = notes
+
+    df_added = df.loc[df_added.index, ["state", "county_code", "county_name"]].join(
+        df_added
+    )
+
+    return df_added.reset_index(drop=True)
+
+
+def ingest_trips(force=False, dry_run=False):
+    """
+    Apply every new or changed trip file to the visit table in one write.
+
+    Each county gets the date of its first appearance across all pending trip
+    files, plus that trip's note. Counties that already have a date recorded
+    are left alone. A trip file is recorded in the ledger once all of its
+    counties resolve, so files with typos are retried on the next run.
+
+    Parameters
+    ----------
+    force : bool, optional
+        Re-read trip files already recorded in the ledger.
+    dry_run : bool, optional
+        Report what would change without writing the table or the ledger.
+
+    Returns
+    -------
+    dict
+        `applied`: trip files read; `added`: DataFrame of new first visits;
+        `unresolved`: {trip file: [unparsed or unknown entries]}.
+    """
+    ledger = load_ledger()
+
+    pending = {}
+    for path in sorted(TRIP_DIR.glob(TRIP_FILE_GLOB)):
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if force or ledger.get(path.name) != digest:
+            pending[path] = digest
+
+    df = import_data_visit_text()
+    index = build_name_index(df)
+
+    records, unresolved = [], {}
+    for path in pending:
+        trip = parse_trip_file(path)
+        problems = list(trip["errors"])
+
+        for day, county_name, state in trip["visits"]:
+            row = resolve_county(index, county_name, state)
+            if row is None:
+                problems.append(f"{county_name}, {state}")
+                continue
+            records.append((row, day, trip["note"], path.name))
+
+        if problems:
+            unresolved[path.name] = problems
+
+    df_visits = pd.DataFrame(records, columns=["row", "date", "note", "trip"])
+    df_added = apply_first_visits(df, df_visits, dry_run=dry_run)
+
+    if not dry_run:
+        ledger.update(
+            {
+                path.name: digest
+                for path, digest in pending.items()
+                if path.name not in unresolved
+            }
+        )
+        save_ledger(ledger)
+
+    return {
+        "applied": [path.name for path in pending],
+        "added": df_added,
+        "unresolved": unresolved,
+    }
@@ -0,0 +1,203 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import datetime as dt
+import io
+import json
+
+import pandas as pd
+
+from paths import DATA_DIR
+from scripts.misc import write_text_atomic
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+# Append-only log of visit changes. The visit table CSV is its compacted
+# snapshot, covering the log up to the byte offset kept in the state file.
+VISIT_LOG_PATH = DATA_DIR / "tables" / "visit_events.csv"
+VISIT_SNAPSHOT_PATH = DATA_DIR / "tables" / "visit_snapshot.json"
+
+EVENT_COLUMNS = ["recorded_at", "action", "state_code", "county_code", "date", "notes"]
+
+# add: first visit to a county with no date; correct: change the date or notes
+# of a recorded visit; remove: clear a recorded visit
+EVENT_ACTIONS = ["add", "correct", "remove"]
+
+
+def county_keys(df):
+    """Return the zero-padded state + county code of each row."""
+    return df["state_code"].str.zfill(2) + df["county_code"].str.zfill(3)
+
+
+def load_snapshot_state():
+    """Return the log offset the visit table CSV already includes."""
+    if not VISIT_SNAPSHOT_PATH.exists():
+        return {"log_bytes": 0}
+
+    with open(VISIT_SNAPSHOT_PATH, "r") as f:
+        return json.load(f)
+
+
+def save_snapshot_state(state):
+    text = json.dumps(state, indent=4, sort_keys=True)
+    write_text_atomic(VISIT_SNAPSHOT_PATH, text + "\n")
+
+
+def read_events(start=0, path=VISIT_LOG_PATH):
+    """
+    Read the events logged from byte `start` of the log onwards.
+
+    Only the tail after `start` is read and parsed, so replaying the events
+    newer than a snapshot does not depend on the length of the log.
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, int)
+        The events, every field as text, and the byte offset of the log's end.
+    """
+    if not path.exists():
+        return pd.DataFrame(columns=EVENT_COLUMNS, dtype=str), 0
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read()
+
+    end = start + len(data)
+    if not data.strip():
+        return pd.DataFrame(columns=EVENT_COLUMNS, dtype=str), end
+
+    df_events = pd.read_csv(
+        io.BytesIO(data),
+        dtype=str,
+        keep_default_na=False,
+        header=0 if start == 0 else None,
+        names=None if start == 0 else EVENT_COLUMNS,
+    )
+
+    return df_events, end
+
+
+def pending_events():
+    """Return the events not yet compacted into the visit table, and the log end."""
+    return read_events(load_snapshot_state()["log_bytes"])
+
+
+def append_events(df_events, path=VISIT_LOG_PATH):
+    """Append events to the log. Only the new lines are written."""
+    write_header = not path.exists() or path.stat().st_size == 0
+
+    with open(path, "a", newline="") as f:
+        df_events[EVENT_COLUMNS].to_csv(
+            f, header=write_header, index=False, lineterminator="\n"
+        )
+
+
+def make_events(df, rows, action, dates=None, notes=None, recorded_at=None):
+    """
+    Build the events for a change to some rows of the visit table.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Visit table from import_data_visit_text, with pending events applied.
+    rows : array-like
+        Index labels of the rows to change.
+    action : {"add", "correct", "remove"}
+    dates : array-like of str, optional
+        New visit dates in the table's format, e.g. 4/24/26. Not used by
+        "remove".
+    notes : array-like of str, optional
+        New notes. Defaults to each row's current notes; "remove" clears them.
+    recorded_at : datetime.datetime, optional
+        Time stamped on the events. Defaults to now, in UTC.
+
+    Raises
+    ------
+    ValueError
+        For an unknown action, or if a county is not in the state the action
+        expects: "add" needs a county with no date, "correct" and "remove" one
+        with a date.
+    """
+    if action not in EVENT_ACTIONS:
+        raise ValueError(f"Unknown action '{action}'. Expected one of {EVENT_ACTIONS}.")
+
+    df_rows = df.loc[rows]
+
+    has_date = df_rows["date"] != ""
+    wrong_state = has_date if action == "add" else ~has_date
+    if wrong_state.any():
+        expected = "no visit date" if action == "add" else "a visit date"
+        df_wrong = df_rows[wrong_state]
+        counties = "; ".join(df_wrong["county_name"] + ", " + df_wrong["state"])
+        raise ValueError(f"'{action}' needs counties with {expected}: {counties}")
+
+    if action == "remove":
+        dates = notes = ""
+    elif notes is None:
+        notes = df_rows["notes"]
+
+    recorded_at = recorded_at or dt.datetime.now(dt.UTC)
+
+    # Built on the rows' index, so Series of dates or notes indexed by row
+    # line up with their county
+    return pd.DataFrame(
+        {
+            "recorded_at": recorded_at.isoformat(timespec="seconds"),
+            "action": action,
+            "state_code": df_rows["state_code"],
+            "county_code": df_rows["county_code"],
+            "date": dates,
+            "notes": notes,
+        },
+        index=df_rows.index,
+    ).reset_index(drop=True)
+
+
+def apply_events(df, df_events, blank=""):
+    """
+    Replay events on top of a visit table.
+
+    Every event sets a county's date and notes outright, so only the latest
+    event per county matters and the replay is one vectorized assignment.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Visit table with state_code, county_code, date and notes.
+    df_events : pandas.DataFrame
+        Events in log order.
+    blank : optional
+        Value the table uses for a missing date or note: "" for the text
+        layout, NaN for the layout read by import_data_visit.
+
+    Returns
+    -------
+    pandas.DataFrame
+        A copy of the table with the events applied.
+
+    Raises
+    ------
+    KeyError
+        If an event refers to a county that is not in the table.
+    """
+    if df_events.empty:
+        return df
+
+    df_latest = df_events.assign(key=county_keys(df_events)).drop_duplicates(
+        "key", keep="last"
+    )
+
+    rows = pd.Index(county_keys(df)).get_indexer(df_latest["key"])
+    if (rows < 0).any():
+        raise KeyError(
+            f"Events for unknown counties: {list(df_latest['key'][rows < 0])}"
+        )
+
+    df = df.copy()
+    for column in ["date", "notes"]:
+        values = df_latest[column]
+        df.iloc[rows, df.columns.get_loc(column)] = values.mask(
+            values == "", blank
+        ).to_numpy()
+
+    return df
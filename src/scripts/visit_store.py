@@ -0,0 +1,280 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import numpy as np
+import pandas as pd
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+WORD_BITS = 64
+
+
+class VisitStore:
+    """
+    Visited counties for many travelers, held as one bitset per traveler.
+
+    Counties are given a fixed ordering, sorted by geoid, and traveler `t`
+    has visited county `i` when bit `i` of row `t` is set. Rows are packed
+    into 64-bit words, so 10,000 travelers over ~3,200 counties take about
+    4 MB. Sorting by geoid also keeps each state's counties in one contiguous
+    bit range.
+
+    Parameters
+    ----------
+    counties : pandas.DataFrame
+        One row per county with `geoid`, `state` and `state_name`, such as the
+        processed visit table from load_data.
+    """
+
+    def __init__(self, counties):
+        self.counties = (
+            counties[["geoid", "state", "state_name"]]
+            .sort_values("geoid")
+            .reset_index(drop=True)
+        )
+        self.geoids = self.counties["geoid"].to_numpy()
+        self._county_index = pd.Index(self.geoids)
+
+        n_counties = len(self.geoids)
+        self.n_words = -(-n_counties // WORD_BITS)
+
+        # States and the first county position of each
+        state_codes = self.counties["geoid"].str[:2].to_numpy()
+        self._state_starts = np.flatnonzero(
+            np.r_[True, state_codes[1:] != state_codes[:-1]]
+        )
+        self.states = self.counties.loc[
+            self._state_starts, ["state", "state_name"]
+        ].reset_index(drop=True)
+        self.states["total"] = np.diff(np.r_[self._state_starts, n_counties])
+
+        # Bit mask selecting each state's counties
+        in_state = np.zeros((len(self.states), self.n_words * WORD_BITS), dtype=bool)
+        for state, (start, total) in enumerate(
+            zip(self._state_starts, self.states["total"])
+        ):
+            in_state[state, start : start + total] = True
+        self._state_masks = np.packbits(in_state, axis=1, bitorder="little").view(
+            np.uint64
+        )
+
+        self.travelers = pd.Index([], dtype=object)
+        self._bits = np.zeros((0, self.n_words), dtype=np.uint64)
+
+    def __len__(self):
+        return len(self.travelers)
+
+    @classmethod
+    def from_visit_table(cls, df, traveler):
+        """Build a single-traveler store from the processed visit table."""
+        store = cls(df)
+        store.add_visits(
+            pd.DataFrame(
+                {"traveler": traveler, "geoid": df.loc[df["visited"] == 1, "geoid"]}
+            )
+        )
+        return store
+
+    @classmethod
+    def from_frame(cls, df_visits, counties):
+        """Build a store from a long table of (traveler, geoid) visits."""
+        store = cls(counties)
+        store.add_visits(df_visits)
+        return store
+
+    def _rows(self, travelers):
+        """Row numbers of travelers, or every row if travelers is None."""
+        if travelers is None:
+            return np.arange(len(self.travelers))
+
+        rows = self.travelers.get_indexer(pd.Index(travelers))
+        if (rows < 0).any():
+            missing = list(pd.Index(travelers)[rows < 0])
+            raise KeyError(f"Unknown travelers: {missing}")
+
+        return rows
+
+    def add_visits(self, df_visits):
+        """
+        Mark counties as visited, adding travelers not in the store yet.
+
+        Parameters
+        ----------
+        df_visits : pandas.DataFrame
+            One row per visit with `traveler` and `geoid`. Repeat visits are
+            allowed and have no further effect.
+
+        Raises
+        ------
+        KeyError
+            If a geoid is not one of the store's counties.
+        """
+        positions = self._county_index.get_indexer(df_visits["geoid"])
+        if (positions < 0).any():
+            unknown = sorted(set(df_visits["geoid"][positions < 0]))
+            raise KeyError(f"Unknown geoids: {unknown}")
+
+        new = pd.Index(df_visits["traveler"].unique()).difference(self.travelers)
+        if len(new):
+            self.travelers = self.travelers.append(new)
+            self._bits = np.vstack(
+                [self._bits, np.zeros((len(new), self.n_words), dtype=np.uint64)]
+            )
+
+        rows = self.travelers.get_indexer(df_visits["traveler"])
+        bytes_ = self._bits.view(np.uint8)
+        np.bitwise_or.at(
+            bytes_,
+            (rows, positions >> 3),
+            (1 << (positions & 7)).astype(np.uint8),
+        )
+
+    def visited(self, traveler):
+        """Return the geoids a traveler has visited."""
+        return self._geoids(self._bits[self._rows([traveler])[0]])
+
+    def _geoids(self, words):
+        bits = np.unpackbits(
+            words.view(np.uint8), bitorder="little", count=len(self.geoids)
+        )
+        return self.geoids[bits.astype(bool)]
+
+    def union(self, travelers=None):
+        """Return the geoids anyone in the group has visited."""
+        rows = self._rows(travelers)
+        return self._geoids(np.bitwise_or.reduce(self._bits[rows], axis=0))
+
+    def intersection(self, travelers=None):
+        """Return the geoids everyone in the group has visited."""
+        rows = self._rows(travelers)
+        if not len(rows):
+            return self.geoids[:0]
+
+        return self._geoids(np.bitwise_and.reduce(self._bits[rows], axis=0))
+
+    def counts_by_traveler(self, travelers=None):
+        """Return the number of counties each traveler has visited."""
+        rows = self._rows(travelers)
+        counts = np.bitwise_count(self._bits[rows]).sum(axis=1, dtype=np.int64)
+
+        return pd.Series(counts, index=self.travelers[rows], name="visited")
+
+    def counts_by_state(self, travelers=None):
+        """
+        Return the number of counties each traveler has visited per state.
+
+        Returns
+        -------
+        pandas.DataFrame
+            One row per traveler and one column per state abbreviation.
+        """
+        rows = self._rows(travelers)
+        bits = self._bits[rows]
+
+        counts = np.empty((len(rows), len(self.states)), dtype=np.int64)
+        for state, mask in enumerate(self._state_masks):
+            counts[:, state] = np.bitwise_count(bits & mask).sum(axis=1, dtype=np.int64)
+
+        return pd.DataFrame(
+            counts, index=self.travelers[rows], columns=self.states["state"]
+        )
+
+    def state_progress(self, travelers=None):
+        """
+        Per-state visited/total/pct for a traveler or a group's combined visits.
+
+        Matches the layout of build_state_progress in app.py, including its
+        sort order.
+        """
+        rows = self._rows(travelers)
+        words = np.bitwise_or.reduce(self._bits[rows], axis=0)[None, :]
+
+        df_progress = self.states[["state_name"]].assign(
+            visited=np.bitwise_count(words & self._state_masks).sum(
+                axis=1, dtype=np.int64
+            ),
+            total=self.states["total"],
+        )
+        df_progress["pct"] = (df_progress["visited"] / df_progress["total"]) * 100
+        df_progress = df_progress.sort_values("state_name").reset_index(drop=True)
+
+        return df_progress.sort_values("pct", ascending=False).reset_index(drop=True)
+
+    def leaderboard(self, n=10, state=None):
+        """
+        Return the travelers with the most counties visited.
+
+        Parameters
+        ----------
+        n : int, optional
+            Number of travelers to return.
+        state : str, optional
+            State abbreviation to rank by instead of all counties.
+
+        Returns
+        -------
+        pandas.DataFrame
+            `rank`, `traveler`, `visited` and `pct` of the counties in scope.
+            Ties share a rank and are listed by traveler.
+        """
+        if state is None:
+            counts = self.counts_by_traveler().to_numpy()
+            total = len(self.geoids)
+        else:
+            matches = np.flatnonzero(self.states["state"] == state)
+            if not len(matches):
+                raise KeyError(f"Unknown state: {state}")
+            mask = self._state_masks[matches[0]]
+            counts = np.bitwise_count(self._bits & mask).sum(axis=1, dtype=np.int64)
+            total = int(self.states["total"][matches[0]])
+
+        # Partition out the top n before sorting, so ranking stays cheap for
+        # large groups
+        n = min(n, len(counts))
+        if n == 0:
+            return pd.DataFrame(columns=["rank", "traveler", "visited", "pct"])
+
+        threshold = np.partition(counts, len(counts) - n)[len(counts) - n]
+        top = np.flatnonzero(counts >= threshold)
+        names = self.travelers[top].astype(str).to_numpy()
+        order = np.lexsort((names, -counts[top]))[:n]
+        top = top[order]
+
+        # Competition ranking: one more than the number of travelers ahead
+        ranks = len(counts) - np.searchsorted(np.sort(counts), counts[top], "right") + 1
+
+        return pd.DataFrame(
+            {
+                "rank": ranks,
+                "traveler": self.travelers[top],
+                "visited": counts[top],
+                "pct": counts[top] / total * 100,
+            }
+        )
+
+    def save(self, path):
+        """Write the store to a compressed .npz file."""
+        np.savez_compressed(
+            path,
+            bits=self._bits,
+            travelers=np.asarray(self.travelers, dtype=str),
+            geoids=self.geoids.astype(str),
+        )
+
+    @classmethod
+    def load(cls, path, counties):
+        """
+        Read a store written by save.
+
+        The county ordering is rebuilt from `counties` and must match the one
+        the store was saved with.
+        """
+        store = cls(counties)
+
+        with np.load(path) as saved:
+            if not np.array_equal(saved["geoids"], store.geoids.astype(str)):
+                raise ValueError(f"{path} was saved with a different set of counties.")
+            store._bits = saved["bits"]
+            store.travelers = pd.Index(saved["travelers"], dtype=object)
+
+        return store
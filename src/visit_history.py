@@ -0,0 +1,93 @@
+# ---------------------------------------------------------------------------- #
+# IMPORT #
+import argparse
+import datetime as dt
+from pathlib import Path
+
+from config import PLOT_BACKEND, PLOT_DPI, PLOT_PARAMS, PLOT_REGIONS
+from scripts.plotting import Plot, generate_plot_data
+from scripts.shared_data import load_data_as_of, load_history
+
+# ---------------------------------------------------------------------------- #
+# CLASSES / FUNCTIONS #
+
+
+def parse_when(value):
+    """Read a date, which covers the whole day, or a date and time."""
+    try:
+        return dt.date.fromisoformat(value)
+    except ValueError:
+        return dt.datetime.fromisoformat(value)
+
+
+def when_slug(when):
+    """Format a date or time for a file name: 2024-01-01 or 2024-01-01T1530."""
+    if isinstance(when, dt.datetime):
+        return f"{when:%Y-%m-%dT%H%M}"
+
+    return f"{when:%Y-%m-%d}"
+
+
+def plot_as_of(when, plot_label, output, dpi=PLOT_DPI):
+    """
+    Render one region's static plot from the visit table as of `when`.
+
+    Saved like generate_plots saves plots, so large PNGs are written in strips.
+    """
+    _, gdf_county, gdf_state = load_data_as_of(when)
+    dct_plot = generate_plot_data(gdf_county, gdf_state)
+
+    plotter = Plot(
+        plot_tables=dct_plot, plot_params=PLOT_PARAMS, dpi=dpi, backend=PLOT_BACKEND
+    )
+    plotter.save(plot_label, path=output)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Query the visit table as it stood at earlier times."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("versions", help="List the stored versions of the table.")
+
+    command = commands.add_parser(
+        "diff", help="List the visits that changed between two times."
+    )
+    command.add_argument(
+        "start", type=parse_when, help="Earlier date or time, e.g. 2024-01-01."
+    )
+    command.add_argument("end", type=parse_when, help="Later date or time.")
+
+    command = commands.add_parser(
+        "plot", help="Render a region's static plot as of a date or time."
+    )
+    command.add_argument("when", type=parse_when, help="Date or time, e.g. 2024-01-01.")
+    command.add_argument(
+        "--region",
+        choices=list(PLOT_REGIONS),
+        default="us_inset",
+        help="Region to plot (default: us_inset).",
+    )
+    command.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Image file, format from its suffix (default: <region>_<when>.png).",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    if args.command == "versions":
+        print(load_history().versions.to_string())
+    elif args.command == "diff":
+        df_diff = load_history().diff(args.start, args.end)
+        print(df_diff.to_string(index=False) if len(df_diff) else "No changes")
+    else:
+        output = args.output or Path(f"{args.region}_{when_slug(args.when)}.png")
+        plot_as_of(args.when, args.region, output)
+        print(f"Wrote {output}")